@@ -1,5 +1,6 @@
 from __future__ import annotations
 from pathlib import Path
+import io
 import pygame
 
 # adapte si ton dossier audio est ailleurs
@@ -20,6 +21,25 @@ def _resolve_audio(name: str) -> str:
         full = ogg if ogg.exists() else mp3
     return str(full)
 
+def init_mixer() -> None:
+    """Ouvre le périphérique audio (une seule fois ; play_bgm l'appelle au besoin)."""
+    if not pygame.mixer.get_init():
+        pygame.mixer.init(frequency=44100, size=-16, channels=2, buffer=512)
+
+# Fichiers lus à l'avance (thread du ScenePreloader) : chemin -> octets
+_PREFETCHED: dict[str, bytes] = {}
+_STREAM: io.BytesIO | None = None   # garde en vie le flux en cours de lecture
+
+def prefetch_bgm(name: str) -> bool:
+    """Lit le fichier en mémoire (sans toucher au mixer) pour le prochain play_bgm(name)."""
+    path = _resolve_audio(name)
+    if path not in _PREFETCHED:
+        try:
+            _PREFETCHED[path] = Path(path).read_bytes()
+        except OSError:
+            return False
+    return True
+
 def play_bgm(name: str, volume: float = 0.7, fade_ms: int = 300) -> None:
     """
     Joue une musique en BOUCLE (-1) et remplace l’actuelle s’il y en a une.
@@ -27,11 +47,16 @@ def play_bgm(name: str, volume: float = 0.7, fade_ms: int = 300) -> None:
     - volume: 0.0..1.0
     - fade_ms: fondu d’entrée (ms)
     """
-    if not pygame.mixer.get_init():
-        pygame.mixer.init(frequency=44100, size=-16, channels=2, buffer=512)
+    global _STREAM
+    init_mixer()
 
     path = _resolve_audio(name)
     pygame.mixer.music.stop()
-    pygame.mixer.music.load(path)
+    data = _PREFETCHED.pop(path, None)
+    if data is not None:
+        _STREAM = io.BytesIO(data)
+        pygame.mixer.music.load(_STREAM, Path(path).suffix.lstrip("."))
+    else:
+        pygame.mixer.music.load(path)
     pygame.mixer.music.set_volume(max(0.0, min(1.0, float(volume))))
     pygame.mixer.music.play(loops=-1, fade_ms=max(0, int(fade_ms)))
\ No newline at end of file
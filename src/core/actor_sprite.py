@@ -2,15 +2,20 @@ from __future__ import annotations
 from pathlib import Path
 import pygame
 
-def _load(path: Path) -> pygame.Surface:
-    return pygame.image.load(str(path)).convert_alpha()
+from core.sprite_atlas import load_sprite
+from core.sprite_sheet import get_sheet
 
-def _scale_to_height(img: pygame.Surface, target_h: int) -> pygame.Surface:
-    w, h = img.get_size()
-    if h == 0:
-        return img
-    new_w = max(1, int(round(w * (target_h / h))))
-    return pygame.transform.scale(img, (new_w, target_h))
+# Source files of the walkers (relative to ASSETS_DIR), for the scene preloader
+TONY_FRAME_FILES = (
+    "general/walk_facing_back_1.png", "general/walk_facing_back_2.png",
+    "general/walk_upfront_1.png", "general/walk_upfront_2.png",
+    "general/walk_to_his_right_1.png", "general/walk_to_his_right_2.png",
+)
+CAR_FRAME_FILES = ("general/car_front.png", "general/car_back.png", "general/car_side.png")
+
+def _frame(path: Path, target_h: int, flip_x: bool = False) -> pygame.Surface:
+    """Frame scaled to target_h (optionally mirrored): a subsurface of the sprite atlas."""
+    return load_sprite(path, height=target_h, flip_x=flip_x)
 
 class FourDirWalker:
     """
@@ -62,14 +67,14 @@ def create_tony_animator(general_asset_dir: Path, target_height: int = 56) -> Fo
       - left  : use horizontally flipped 'right' frames
     We scale all frames to the same *height* so mismatched source sizes "just work".
     """
-    up1    = _scale_to_height(_load(general_asset_dir / "walk_facing_back_1.png"), target_height)
-    up2    = _scale_to_height(_load(general_asset_dir / "walk_facing_back_2.png"), target_height)
-    down1  = _scale_to_height(_load(general_asset_dir / "walk_upfront_1.png"),    target_height)
-    down2  = _scale_to_height(_load(general_asset_dir / "walk_upfront_2.png"),    target_height)
-    right1 = _scale_to_height(_load(general_asset_dir / "walk_to_his_right_1.png"), target_height)
-    right2 = _scale_to_height(_load(general_asset_dir / "walk_to_his_right_2.png"), target_height)
-    left1  = pygame.transform.flip(right1, True, False)
-    left2  = pygame.transform.flip(right2, True, False)
+    up1    = _frame(general_asset_dir / "walk_facing_back_1.png", target_height)
+    up2    = _frame(general_asset_dir / "walk_facing_back_2.png", target_height)
+    down1  = _frame(general_asset_dir / "walk_upfront_1.png", target_height)
+    down2  = _frame(general_asset_dir / "walk_upfront_2.png", target_height)
+    right1 = _frame(general_asset_dir / "walk_to_his_right_1.png", target_height)
+    right2 = _frame(general_asset_dir / "walk_to_his_right_2.png", target_height)
+    left1  = _frame(general_asset_dir / "walk_to_his_right_1.png", target_height, flip_x=True)
+    left2  = _frame(general_asset_dir / "walk_to_his_right_2.png", target_height, flip_x=True)
 
     frames = {
         "up":    [up1, up2],
@@ -79,47 +84,34 @@ def create_tony_animator(general_asset_dir: Path, target_height: int = 56) -> Fo
     }
     return FourDirWalker(frames, frame_ms=140)
 
-# --- Grand-mère & Voiture de police (mêmes conventions que Tony) ---
+# --- Sheet-based characters (grand-mère, police...) ---
 
-def create_grandma_animator(general_asset_dir: Path, target_height: int = 54) -> FourDirWalker:
+def create_sheet_animator(sheet_name: str, target_height: int) -> FourDirWalker:
     """
-    Grand-mère 4 directions, 2 frames/direction.
-    Fichiers:
-      - up    : granny_walk_facing_back_1.png,  granny_walk_facing_back_2.png
-      - down  : granny_walk_upfront_1.png,      granny_walk_upfront_2.png
-      - right : granny_walk_to_his_right_1.png, granny_walk_to_his_right_2.png
-      - left  : flip horizontal des frames right (comme Tony)
+    4-dir walker from a sprite sheet (assets/general/sprite_alll/sheets.json): the
+    up/down/left/right clips, scaled to target_height. One decode per sheet.
     """
-    up1    = _scale_to_height(_load(general_asset_dir / "granny_walk_facing_back_1.png"), target_height)
-    up2    = _scale_to_height(_load(general_asset_dir / "granny_walk_facing_back_2.png"), target_height)
-    down1  = _scale_to_height(_load(general_asset_dir / "granny_walk_upfront_1.png"),    target_height)
-    down2  = _scale_to_height(_load(general_asset_dir / "granny_walk_upfront_2.png"),    target_height)
-    right1 = _scale_to_height(_load(general_asset_dir / "granny_walk_to_his_right_1.png"), target_height)
-    right2 = _scale_to_height(_load(general_asset_dir / "granny_walk_to_his_right_2.png"), target_height)
-    left1  = pygame.transform.flip(right1, True, False)
-    left2  = pygame.transform.flip(right2, True, False)
+    sheet = get_sheet(sheet_name)
+    frames = {d: list(sheet.scaled_clip(d, target_height)) for d in ("up", "down", "left", "right")}
+    return FourDirWalker(frames, frame_ms=sheet.spec.frame_ms)
 
-    frames = {"up":[up1,up2], "down":[down1,down2], "right":[right1,right2], "left":[left1,left2]}
-    return FourDirWalker(frames, frame_ms=140)  # cadence identique à Tony
+
+def create_grandma_animator(general_asset_dir: Path, target_height: int = 54) -> FourDirWalker:
+    """
+    Grand-mère 4 directions, 2 frames/direction, depuis granny_all.png.png
+    (sheet "granny"; left = flip horizontal des frames right, comme Tony).
+    general_asset_dir est gardé pour la compatibilité des appels.
+    """
+    return create_sheet_animator("granny", target_height)  # cadence identique à Tony
 
 
 def create_police_animator(general_asset_dir: Path, target_height: int = 56) -> FourDirWalker:
     """
-    Voiture de police (gauche/droite pour l’instant).
-    - right : police_side.png (dupliquée pour 2 frames)
-    - left  : flip de right
-    - up/down : placeholders = right (jamais utilisés si L/R seulement)
+    Voiture de police depuis polica_all.png (sheet "police"):
+    - right : vue de côté ; left : flip de right
+    - up / down : vues arrière / avant (comme create_car_animator)
     """
-    side = _scale_to_height(_load(general_asset_dir / "police_side.png"), target_height)
-    right1 = side
-    right2 = side
-    left1  = pygame.transform.flip(right1, True, False)
-    left2  = pygame.transform.flip(right2, True, False)
-    frames = {
-        "up":[right1,right2], "down":[right1,right2],
-        "right":[right1,right2], "left":[left1,left2]
-    }
-    return FourDirWalker(frames, frame_ms=140)
+    return create_sheet_animator("police", target_height)
 
 def create_car_animator(general_asset_dir: Path, target_height: int = 56) -> FourDirWalker:
     """
@@ -130,20 +122,20 @@ def create_car_animator(general_asset_dir: Path, target_height: int = 56) -> Fou
       - right: flipped(car_side) (so it faces right)
     """
     # Down uses FRONT
-    down1 = _scale_to_height(_load(general_asset_dir / "car_front.png"), target_height)
+    down1 = _frame(general_asset_dir / "car_front.png", target_height)
     down2 = down1  # duplicate for simple 2-frame loop
 
     # Up uses BACK
-    up1 = _scale_to_height(_load(general_asset_dir / "car_back.png"), target_height)
+    up1 = _frame(general_asset_dir / "car_back.png", target_height)
     up2 = up1
 
     # Side asset faces LEFT by default
-    left1 = _scale_to_height(_load(general_asset_dir / "car_side.png"), target_height)
+    left1 = _frame(general_asset_dir / "car_side.png", target_height)
     left2 = left1
 
     # RIGHT is a flipped LEFT
-    right1 = pygame.transform.flip(left1, True, False)
-    right2 = pygame.transform.flip(left2, True, False)
+    right1 = _frame(general_asset_dir / "car_side.png", target_height, flip_x=True)
+    right2 = right1
 
     frames = {
         "up":    [up1, up2],
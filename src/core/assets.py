@@ -0,0 +1,352 @@
+from __future__ import annotations
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+import pygame
+
+from core.config import ASSETS_DIR, ASSET_CACHE_BUDGET_BYTES, BAKED_ASSETS_DIR
+
+# ======================================================
+# Shared image cache
+#
+# Every room used to decode its own copy of the same PNGs on construction (Tony's
+# walk frames alone were loaded by four scenes, on every replay). AssetManager
+# decodes each file once per process and keeps the converted surface, plus every
+# scaled / flipped variant asked for, keyed by (path, size, flip, convert mode).
+# Entries are evicted least-recently-used once the byte budget is exceeded.
+#
+# Variants listed in assets/bake_manifest.json can be baked offline
+# (python src/game/bake_assets.py): their final pixels are stored raw in
+# .cache/baked and loaded with frombuffer instead of decoding + scaling the
+# source PNG, as long as the source file's hash still matches.
+#
+# core.preload splits a load in two for the scene preloader: the file IO and PNG
+# decode run on a worker thread (prefetch / decode), the display-format conversion
+# on the main thread (adopt).
+#
+# Relative paths are resolved from ASSETS_DIR ("general/plane.png"), so nothing
+# depends on the working directory. Returned surfaces are shared: blit them, copy
+# them before drawing onto them.
+# ======================================================
+
+PathLike = Union[str, Path]
+Key = Tuple[str, Optional[Tuple[int, int]], Tuple[bool, bool], Optional[str], bool]
+
+CONVERT_MODES = ("alpha", "opaque", None)
+BAKE_VERSION = 1
+
+
+def resolve_asset(path: PathLike) -> str:
+    """Absolute, normalized path; relative paths are taken from ASSETS_DIR."""
+    p = Path(path)
+    if not p.is_absolute():
+        p = ASSETS_DIR / p
+    return os.path.normpath(str(p))
+
+
+def asset_name(fpath: str) -> str:
+    """Stable name of a resolved path: relative to ASSETS_DIR when inside it."""
+    try:
+        return Path(fpath).relative_to(ASSETS_DIR).as_posix()
+    except ValueError:
+        return Path(fpath).as_posix()
+
+
+def variant_name(key: Key) -> str:
+    """Stable text form of a cache key (baked index / manifest)."""
+    fpath, size, flip, convert, smooth = key
+    size_s = f"{size[0]}x{size[1]}" if size else "src"
+    return f"{asset_name(fpath)}|{size_s}|flip={int(flip[0])}{int(flip[1])}|{convert}|smooth={int(smooth)}"
+
+
+def file_sha1(fpath: str) -> str:
+    with open(fpath, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def _surface_bytes(surf: pygame.Surface) -> int:
+    return surf.get_width() * surf.get_height() * surf.get_bytesize()
+
+
+def _convert(surf: pygame.Surface, convert: Optional[str]) -> pygame.Surface:
+    if convert == "alpha":
+        return surf.convert_alpha()
+    if convert == "opaque":
+        return surf.convert()
+    return surf
+
+
+# ---------- Baked variants ----------
+class BakedAssets:
+    """
+    Read side of .cache/baked/index.json:
+      sources : asset name -> {"sha1", "size"}      (size of the decoded source)
+      entries : variant name -> {"file", "size", "format"}
+      atlas   : {"sources", "pages": [{"file", "size"}], "sprites": variant name -> [page, x, y, w, h]}
+    A variant is used only while its source's sha1 still matches; hashes are
+    computed once per source per process.
+    """
+
+    def __init__(self, root: Path = BAKED_ASSETS_DIR):
+        self.root = Path(root)
+        self._index: Optional[Dict[str, Any]] = None
+        self._fresh: Dict[str, Optional[Dict[str, Any]]] = {}
+        self._raw: Dict[str, bytes] = {}          # file -> bytes read ahead by prefetch()
+        self._atlas_loaded = False
+
+    @property
+    def index(self) -> Dict[str, Any]:
+        if self._index is None:
+            try:
+                index = json.loads((self.root / "index.json").read_text(encoding="utf-8"))
+                if index.get("version") != BAKE_VERSION:
+                    index = {}
+            except Exception:
+                index = {}
+            self._index = index
+        return self._index
+
+    def source(self, fpath: str) -> Optional[Dict[str, Any]]:
+        """Index record of the source file, or None if missing / out of date."""
+        if fpath not in self._fresh:
+            rec = self.index.get("sources", {}).get(asset_name(fpath))
+            try:
+                if rec is not None and file_sha1(fpath) != rec.get("sha1"):
+                    rec = None
+            except OSError:
+                rec = None
+            self._fresh[fpath] = rec
+        return self._fresh[fpath]
+
+    def source_size(self, fpath: str) -> Optional[Tuple[int, int]]:
+        rec = self.source(fpath)
+        return tuple(rec["size"]) if rec else None
+
+    def load(self, key: Key) -> Optional[pygame.Surface]:
+        entry = self.index.get("entries", {}).get(variant_name(key))
+        if entry is None or self.source(key[0]) is None:
+            return None
+        try:
+            data = self._read(entry["file"])
+            surf = pygame.image.frombuffer(data, tuple(entry["size"]), entry["format"])
+        except Exception:
+            return None
+        return _convert(surf, key[3])
+
+    def atlas_pages(self) -> List[pygame.Surface]:
+        """Sprite atlas pages of the bake; [] if absent or if any packed source changed."""
+        self._atlas_loaded = True
+        atlas = self.index.get("atlas")
+        if not atlas or any(self.source(resolve_asset(n)) is None for n in atlas.get("sources", ())):
+            return []
+        try:
+            pages = []
+            for page in atlas["pages"]:
+                data = self._read(page["file"])
+                surf = pygame.image.frombuffer(data, tuple(page["size"]), "RGBA")
+                pages.append(surf.convert_alpha() if pygame.display.get_surface() is not None else surf)
+        except Exception:
+            return []
+        return pages
+
+    def prefetch(self, fpath: str) -> int:
+        """
+        Worker-thread side: hash the source and read the raw files of its baked
+        variants ahead of load(). Returns the number of files read.
+        """
+        if self.source(fpath) is None:
+            return 0
+        prefix = asset_name(fpath) + "|"
+        files = [e["file"] for n, e in self.index.get("entries", {}).items() if n.startswith(prefix)]
+        return sum(self._read_ahead(f) for f in files)
+
+    def prefetch_atlas(self) -> int:
+        """Worker-thread side of atlas_pages(): hash the packed sources, read the pages."""
+        atlas = self.index.get("atlas")
+        if self._atlas_loaded or not atlas:
+            return 0
+        if any(self.source(resolve_asset(n)) is None for n in atlas.get("sources", ())):
+            return 0
+        return sum(self._read_ahead(p["file"]) for p in atlas["pages"])
+
+    def reload(self):
+        self._index = None
+        self._fresh.clear()
+        self._raw.clear()
+        self._atlas_loaded = False
+
+    def _read_ahead(self, fname: str) -> int:
+        if fname in self._raw:
+            return 0
+        try:
+            self._raw[fname] = (self.root / fname).read_bytes()
+        except OSError:
+            return 0
+        return 1
+
+    def _read(self, fname: str) -> bytes:
+        data = self._raw.pop(fname, None)
+        return data if data is not None else (self.root / fname).read_bytes()
+
+
+# ---------- Cache ----------
+class AssetManager:
+    def __init__(self, budget_bytes: int = ASSET_CACHE_BUDGET_BYTES, baked: Optional[BakedAssets] = None):
+        self.budget_bytes = int(budget_bytes)
+        self.baked = baked
+        self._entries: "OrderedDict[Key, pygame.Surface]" = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.decodes = 0
+        self.baked_loads = 0
+        self.evictions = 0
+
+    def image(self, path: PathLike, **opts) -> pygame.Surface:
+        """
+        Decoded image, optionally resized (exact `size`, or `height` / `width` keeping
+        the aspect ratio, or a `factor`) then flipped (flip_x / flip_y).
+        convert: "alpha" (convert_alpha), "opaque" (convert) or None (as decoded).
+        smooth uses smoothscale. Raises like pygame.image.load if the file is missing.
+        """
+        return self._get(self.key_for(path, **opts))
+
+    def key_for(self, path: PathLike, *,
+                size: Optional[Tuple[int, int]] = None,
+                height: Optional[int] = None,
+                width: Optional[int] = None,
+                factor: Optional[float] = None,
+                flip_x: bool = False, flip_y: bool = False,
+                convert: Optional[str] = "alpha",
+                smooth: bool = False) -> Key:
+        """Normalized cache key of image(path, **opts); relative sizes become pixels."""
+        if convert not in CONVERT_MODES:
+            raise ValueError(f"convert must be one of {CONVERT_MODES}, got {convert!r}")
+        if pygame.display.get_surface() is None:
+            convert = None      # nothing to convert to yet
+        fpath = resolve_asset(path)
+        if size is None and (height is not None or width is not None or factor is not None):
+            size = self._target_size(self.source_size(fpath, convert), height, width, factor)
+        if size is not None:
+            size = (max(1, int(size[0])), max(1, int(size[1])))
+        return fpath, size, (bool(flip_x), bool(flip_y)), convert, bool(smooth) and size is not None
+
+    def source_size(self, path: PathLike, convert: Optional[str] = "alpha") -> Tuple[int, int]:
+        """Size of the image on disk (from the bake index when possible, else decoded)."""
+        fpath = resolve_asset(path)
+        size = self.baked.source_size(fpath) if self.baked is not None else None
+        if size is None:
+            if pygame.display.get_surface() is None:
+                convert = None
+            size = self._get((fpath, None, (False, False), convert, False)).get_size()
+        return size
+
+    def decode(self, path: PathLike, convert: Optional[str] = "alpha") -> Optional[Tuple[Key, pygame.Surface]]:
+        """
+        Worker-thread half of a source load: (source key, decoded surface), not yet
+        converted. None when there is nothing to do: already cached, or fresh in the
+        bake (its variants load raw; see BakedAssets.prefetch).
+        """
+        if pygame.display.get_surface() is None:
+            convert = None
+        fpath = resolve_asset(path)
+        key = (fpath, None, (False, False), convert, False)
+        if key in self._entries:
+            return None
+        if self.baked is not None and self.baked.source(fpath) is not None:
+            return None
+        return key, pygame.image.load(fpath)
+
+    def adopt(self, key: Key, surf: pygame.Surface):
+        """Main-thread half of decode(): convert the surface and cache it under key."""
+        if key in self._entries:
+            return
+        self.decodes += 1
+        surf = _convert(surf, key[3])
+        self._entries[key] = surf
+        self.bytes += _surface_bytes(surf)
+        self._evict()
+
+    def discard(self, key: Key):
+        """Drop one entry (e.g. once a copy of it lives in the sprite atlas)."""
+        surf = self._entries.pop(key, None)
+        if surf is not None:
+            self.bytes -= _surface_bytes(surf)
+
+    def clear(self):
+        self._entries.clear()
+        self.bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "budget_bytes": self.budget_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "decodes": self.decodes,
+            "baked_loads": self.baked_loads,
+            "evictions": self.evictions,
+            "hit_rate": (self.hits / lookups) if lookups else 0.0,
+        }
+
+    # ---------- internals ----------
+    @staticmethod
+    def _target_size(src: Tuple[int, int], height, width, factor) -> Tuple[int, int]:
+        w, h = src
+        if factor is not None:
+            return int(w * factor), int(h * factor)
+        if height is not None:
+            return (int(round(w * (height / h))) if h else w), int(height)
+        return int(width), (int(round(h * (width / w))) if w else h)
+
+    def _get(self, key: Key) -> pygame.Surface:
+        surf = self._entries.get(key)
+        if surf is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return surf
+
+        self.misses += 1
+        surf = self.baked.load(key) if self.baked is not None else None
+        if surf is not None:
+            self.baked_loads += 1
+        else:
+            surf = self._build(key)
+        self._entries[key] = surf
+        self.bytes += _surface_bytes(surf)
+        self._evict()
+        return surf
+
+    def _build(self, key: Key) -> pygame.Surface:
+        fpath, size, flip, convert, smooth = key
+        if flip != (False, False):
+            # Flip the (cached) unflipped variant, as the scenes always did: scale, then flip
+            return pygame.transform.flip(self._get((fpath, size, (False, False), convert, smooth)), *flip)
+        if size is not None:
+            base = self._get((fpath, None, (False, False), convert, False))
+            scale = pygame.transform.smoothscale if smooth else pygame.transform.scale
+            return scale(base, size)
+
+        surf = pygame.image.load(fpath)
+        self.decodes += 1
+        return _convert(surf, convert)
+
+    def _evict(self):
+        # Always keep the newest entry, even if it alone exceeds the budget
+        while self.bytes > self.budget_bytes and len(self._entries) > 1:
+            _, old = self._entries.popitem(last=False)
+            self.bytes -= _surface_bytes(old)
+            self.evictions += 1
+
+
+ASSETS = AssetManager(baked=BakedAssets())
+
+
+def load_image(path: PathLike, **opts) -> pygame.Surface:
+    """ASSETS.image(path, **opts): shared, cached surface (don't draw onto it)."""
+    return ASSETS.image(path, **opts)
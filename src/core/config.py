@@ -3,8 +3,8 @@ from pathlib import Path
 
 # --- Gameplay defaults ---
 INITIAL_TRUST        = 50   # was 0 — start skeptical but not hostile
-INITIAL_POLICE_GAP   = 0
-FOLLOW_THRESHOLD     = 55   # crossover point stays the same
+INITIAL_POLICE_GAP   = 5
+FOLLOW_THRESHOLD     = 60   # trust at which Tony follows half the time
 
 # New: how "soft" the decision is around the threshold
 FOLLOW_SIGMOID_K     = 0.35   # higher = sharper curve; 0.10–0.18 feels good
@@ -18,7 +18,8 @@ FPS    = 60
 TILE   = 16
 
 
-SCENE_INTRO_BLACK_MS = 2000  
+SCENE_INTRO_BLACK_MS = 2000      # black pause before a scene: longest wait for its preload
+SCENE_INTRO_MIN_BLACK_MS = 500   # shortest pause, even when the preload is already done
 
 # --- Assets ---
 PROJECT_ROOT       = Path(__file__).resolve().parents[2]  # <-- go up to repo root
@@ -26,6 +27,16 @@ ASSETS_DIR         = PROJECT_ROOT / "assets"
 FONTS_DIR          = ASSETS_DIR / "fonts"
 GENERAL_ASSET_DIR  = ASSETS_DIR / "general"
 BANK_ASSET_DIR     = ASSETS_DIR / "bank"
+BAKE_MANIFEST_PATH = ASSETS_DIR / "bake_manifest.json"  # sprite sizes baked offline
+SPRITE_SHEETS_PATH = GENERAL_ASSET_DIR / "sprite_alll" / "sheets.json"  # sheet frame / clip metadata
+
+# --- Caches (generated at runtime, safe to delete) ---
+CACHE_DIR          = PROJECT_ROOT / ".cache"
+TEXT_CACHE_BUDGET_BYTES = 16 * 1024 * 1024   # rendered text surfaces kept in memory
+ASSET_CACHE_BUDGET_BYTES = 96 * 1024 * 1024  # decoded / scaled images kept in memory
+BAKED_ASSETS_DIR   = CACHE_DIR / "baked"      # output of src/game/bake_assets.py
+PROFILE_DIR        = CACHE_DIR / "profile"    # per-scene frame timings (F3 profiler), written on exit
+PROFILE_FRAMES     = 3600                     # frames kept per scene and phase (1 min at 60 FPS)
 
 # --- UI ---
 FONT_PATH          = FONTS_DIR / "PressStart2P-Regular.ttf"
@@ -34,17 +45,13 @@ EDGE_IMG_PATH      = GENERAL_ASSET_DIR / "edge.png"
 
 FONT_SIZE          = 32
 LINE_HEIGHT_FACTOR = 1.6
+TYPEWRITER_CPS     = 45     # dialogue reveal speed (chars/sec); 0 = whole page at once
 PADDING_LEFT       = 20
 PADDING_RIGHT      = 40
 PADDING_TOP        = 20
 PADDING_BOTTOM     = 20
 BOX_FILL_COLOR     = (34, 34, 34)
 
-# --- Gameplay defaults ---
-
-INITIAL_POLICE_GAP  = 5
-FOLLOW_THRESHOLD    = 60  # follow when trust >= 60
-
 # --- Misc ---
 RNG_SEED = 42
 
@@ -0,0 +1,165 @@
+from __future__ import annotations
+from typing import Dict, Optional, Tuple
+import pygame
+
+# ======================================================
+# Glyph atlas text engine
+#
+# PressStart2P is a fixed-width pixel font: every glyph (accents and typographic
+# quotes included) has the same advance. Glyphs are rasterized lazily, once per
+# (font, color), into a single atlas surface; strings are drawn with one blits()
+# call of atlas sub-rects straight onto the destination, and measured with
+# len(text) * advance instead of FreeType.
+#
+# Proportional fonts (the SysFont fallback) still work: advances come from
+# font.metrics per glyph, and measuring falls back to font.size.
+# ======================================================
+
+ATLAS_COLUMNS = 32    # glyph cells per atlas row
+ELLIPSIS = "…"
+
+
+class FontMetrics:
+    """Color-independent measurements of one font."""
+
+    def __init__(self, font: pygame.font.Font):
+        self.font = font
+        self.height = font.get_height()
+        self._advances: Dict[str, int] = {}
+        sample = "iMW.é’ "
+        adv = {self.advance_of(ch) for ch in sample}
+        self.monospace = len(adv) == 1
+        self.advance = adv.pop() if self.monospace else 0
+
+    def advance_of(self, ch: str) -> int:
+        a = self._advances.get(ch)
+        if a is None:
+            m = self.font.metrics(ch)
+            a = m[0][4] if m and m[0] else self.font.size(ch)[0]
+            self._advances[ch] = a
+        return a
+
+    def width(self, text: str) -> int:
+        if self.monospace:
+            return len(text) * self.advance
+        return self.font.size(text)[0]
+
+    def fit_count(self, text: str, max_width: int) -> int:
+        """Longest prefix length of `text` that fits in max_width."""
+        if self.monospace:
+            return max(0, min(len(text), max_width // self.advance))
+        lo, hi = 0, len(text)
+        while lo < hi:
+            mid = (lo + hi + 1) // 2
+            if self.font.size(text[:mid])[0] <= max_width:
+                lo = mid
+            else:
+                hi = mid - 1
+        return lo
+
+    def truncate(self, text: str, max_width: int, ellipsis: str = ELLIPSIS) -> str:
+        """text, or its longest prefix + ellipsis that fits (just the ellipsis at worst)."""
+        if self.width(text) <= max_width:
+            return text
+        n = self.fit_count(text, max_width - self.width(ellipsis))
+        return text[:n] + ellipsis
+
+
+class GlyphAtlas:
+    """All glyphs of one font in one color, packed in a grid of equal cells."""
+
+    def __init__(self, font: pygame.font.Font, color, antialias: bool = True):
+        self.font = font
+        self.color = tuple(pygame.Color(color))
+        self.antialias = antialias
+        self.metrics = get_metrics(font)
+        self.cell_w = max(1, self.metrics.advance or font.size("W")[0])
+        self.cell_h = max(1, self.metrics.height)
+        self.surface = pygame.Surface((self.cell_w * ATLAS_COLUMNS, self.cell_h), pygame.SRCALPHA)
+        self._slots: Dict[str, Tuple[pygame.Rect, int]] = {}   # char -> (area, advance)
+
+    def _add(self, ch: str) -> Tuple[pygame.Rect, int]:
+        glyph = self.font.render(ch, self.antialias, self.color)
+        gw = glyph.get_width()
+        if gw > self.cell_w:   # proportional fallback font: widen every cell once
+            self._regrid(gw)
+        i = len(self._slots)
+        row, col = divmod(i, ATLAS_COLUMNS)
+        if (row + 1) * self.cell_h > self.surface.get_height():
+            grown = pygame.Surface((self.surface.get_width(), self.surface.get_height() * 2), pygame.SRCALPHA)
+            grown.blit(self.surface, (0, 0))
+            self.surface = grown
+        pos = (col * self.cell_w, row * self.cell_h)
+        self.surface.blit(glyph, pos)
+        slot = (pygame.Rect(pos, (gw, glyph.get_height())), self.metrics.advance_of(ch))
+        self._slots[ch] = slot
+        return slot
+
+    def _regrid(self, cell_w: int):
+        chars = list(self._slots)
+        self.cell_w = cell_w
+        self.surface = pygame.Surface((self.cell_w * ATLAS_COLUMNS, self.cell_h), pygame.SRCALPHA)
+        self._slots.clear()
+        for ch in chars:
+            self._add(ch)
+
+    def _slot(self, ch: str) -> Tuple[pygame.Rect, int]:
+        slot = self._slots.get(ch)
+        return slot if slot is not None else self._add(ch)
+
+    def width(self, text: str) -> int:
+        return self.metrics.width(text)
+
+    def draw(self, dest: pygame.Surface, text: str, pos, count: Optional[int] = None) -> int:
+        """
+        Blit `text` (or only its first `count` glyphs) at pos (top-left).
+        Returns the x just after the last drawn glyph.
+        """
+        x, y = int(pos[0]), int(pos[1])
+        if count is not None:
+            text = text[:max(0, count)]
+        seq = []
+        for ch in text:
+            area, adv = self._slot(ch)
+            if ch != " ":
+                seq.append((self.surface, (x, y), area))
+            x += adv
+        if seq:
+            dest.blits(seq, doreturn=False)
+        return x
+
+    def draw_glyph(self, dest: pygame.Surface, ch: str, pos) -> int:
+        """Single glyph (for per-glyph effects); returns its advance."""
+        area, adv = self._slot(ch)
+        dest.blit(self.surface, pos, area)
+        return adv
+
+    def render(self, text: str) -> pygame.Surface:
+        """Stand-alone surface, like font.render()."""
+        surf = pygame.Surface((max(1, self.width(text)), self.cell_h), pygame.SRCALPHA)
+        self.draw(surf, text, (0, 0))
+        return surf
+
+
+# ---------------- Registries ----------------
+_METRICS: Dict[pygame.font.Font, FontMetrics] = {}
+_ATLASES: Dict[Tuple[pygame.font.Font, Tuple[int, ...], bool], GlyphAtlas] = {}
+
+
+def get_metrics(font: pygame.font.Font) -> FontMetrics:
+    m = _METRICS.get(font)
+    if m is None:
+        m = _METRICS[font] = FontMetrics(font)
+    return m
+
+
+def get_atlas(font: pygame.font.Font, color, antialias: bool = True) -> GlyphAtlas:
+    key = (font, tuple(pygame.Color(color)), bool(antialias))
+    atlas = _ATLASES.get(key)
+    if atlas is None:
+        atlas = _ATLASES[key] = GlyphAtlas(font, color, antialias)
+    return atlas
+
+
+def text_width(font: pygame.font.Font, text: str) -> int:
+    return get_metrics(font).width(text)
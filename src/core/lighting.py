@@ -0,0 +1,183 @@
+from __future__ import annotations
+from dataclasses import dataclass
+import math
+import numpy as np
+import pygame
+
+# ======================================================
+# Shared lighting: vectorized darkness/light maps (NumPy + surfarray)
+#
+# A LightMap owns a darkness overlay (black, uniform alpha) and punches light
+# into it. Every light only evaluates the pixels inside its own bounding box,
+# so adding a second flashlight or a window glow costs its area, not a full
+# screen. The map can be computed at 1/2 or 1/4 resolution and upscaled.
+# ======================================================
+
+def _smoothstep(a: np.ndarray) -> np.ndarray:
+    a = np.clip(a, 0.0, 1.0)
+    return a * a * (3.0 - 2.0 * a)
+
+
+@dataclass(frozen=True)
+class ConeLight:
+    """Flashlight cone: fully lit inside the inner cone, soft falloff to the outer edge."""
+    origin: tuple[float, float]
+    angle_deg: float
+    fov_deg: float
+    length: float
+    soft: bool = True
+    inner_fov_frac: float = 0.7
+    inner_len_frac: float = 0.85
+    strength: float = 1.0
+
+    def bounds(self):
+        ox, oy = self.origin
+        r = self.length
+        return (ox - r, oy - r, ox + r, oy + r)
+
+    def intensity(self, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        dx = xs - self.origin[0]
+        dy = ys - self.origin[1]
+        dist = np.sqrt(dx * dx + dy * dy)
+        dang = np.degrees(np.arctan2(dy, dx)) - self.angle_deg
+        dang = np.abs((dang + 180.0) % 360.0 - 180.0)
+
+        half = self.fov_deg * 0.5
+        if not self.soft:
+            lit = (dang <= half) & (dist <= self.length)
+            return lit.astype(np.float32) * self.strength
+
+        inner_half = half * self.inner_fov_frac
+        inner_len = self.length * self.inner_len_frac
+        a_ang = _smoothstep((half - dang) / max(1e-6, half - inner_half))
+        a_len = _smoothstep((self.length - dist) / max(1e-6, self.length - inner_len))
+        return a_ang * a_len * self.strength
+
+
+@dataclass(frozen=True)
+class RadialLight:
+    """Round glow (lamp, window): fully lit up to inner_frac * radius, soft to radius."""
+    origin: tuple[float, float]
+    radius: float
+    inner_frac: float = 0.3
+    strength: float = 1.0
+
+    def bounds(self):
+        ox, oy = self.origin
+        r = self.radius
+        return (ox - r, oy - r, ox + r, oy + r)
+
+    def intensity(self, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        dx = xs - self.origin[0]
+        dy = ys - self.origin[1]
+        dist = np.sqrt(dx * dx + dy * dy)
+        span = max(1e-6, self.radius * (1.0 - self.inner_frac))
+        return _smoothstep((self.radius - dist) / span) * self.strength
+
+
+def _spill(dx: np.ndarray, dy: np.ndarray, falloff_px: float, height: int) -> np.ndarray:
+    """
+    Police spill shape at (dx from the left edge, dy from the band's middle row):
+    gaussian falloff along X (sigma = falloff_px) times a wide gaussian across the band.
+    """
+    gx = np.exp(-(dx / max(1e-3, float(falloff_px))) ** 2)
+    gy = np.exp(-(dy / max(1e-3, height * 0.6)) ** 2)
+    return gx * gy
+
+
+def spill_profile(width: int, height: int, falloff_px: float) -> np.ndarray:
+    """_spill over a width x height band, indexed [x, y] like surfarray."""
+    xs = np.arange(width, dtype=np.float32)[:, None]
+    ys = np.arange(height, dtype=np.float32)[None, :] - (height - 1) * 0.5
+    return _spill(xs, ys, falloff_px, height).astype(np.float32)
+
+
+@dataclass(frozen=True)
+class SpillLight:
+    """Police light spilling in from the left edge of a horizontal band."""
+    rect: tuple[int, int, int, int]   # x, y, w, h (screen px)
+    falloff_px: float = 24.0
+    strength: float = 1.0
+
+    def bounds(self):
+        x, y, w, h = self.rect
+        return (x, y, x + w, y + h)
+
+    def intensity(self, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        x, y, w, h = self.rect
+        return _spill(xs - x, ys - (y + (h - 1) * 0.5), self.falloff_px, h) * self.strength
+
+
+class LightMap:
+    """
+    Darkness overlay with lights cut out of it.
+      - size   : output size in screen pixels
+      - alpha  : darkness alpha where nothing is lit (0..255)
+      - scale  : 1 (full res), 2 (half) or 4 (quarter); the map is upscaled with smoothscale
+    render() reuses the same surfaces every call; blit its result over the scene.
+    """
+    def __init__(self, size: tuple[int, int], alpha: int, scale: int = 1):
+        self.size = (int(size[0]), int(size[1]))
+        self.alpha = int(alpha)
+        self.scale = max(1, int(scale))
+
+        w, h = self.size
+        sw = max(1, math.ceil(w / self.scale))
+        sh = max(1, math.ceil(h / self.scale))
+        self._small = pygame.Surface((sw, sh), pygame.SRCALPHA)
+        self._small.fill((0, 0, 0, self.alpha))
+        self._out = self._small if self.scale == 1 else pygame.Surface(self.size, pygame.SRCALPHA)
+
+        # Pixel-center coordinates in screen space, shaped for [x, y] broadcasting
+        self._xs = ((np.arange(sw, dtype=np.float32) + 0.5) * self.scale - 0.5)[:, None]
+        self._ys = ((np.arange(sh, dtype=np.float32) + 0.5) * self.scale - 0.5)[None, :]
+        self._light = np.zeros((sw, sh), dtype=np.float32)
+
+    def _slice(self, bounds):
+        x0, y0, x1, y1 = bounds
+        sw, sh = self._light.shape
+        s = self.scale
+        ix0 = max(0, int(math.floor(x0 / s)))
+        iy0 = max(0, int(math.floor(y0 / s)))
+        ix1 = min(sw, int(math.ceil(x1 / s)) + 1)
+        iy1 = min(sh, int(math.ceil(y1 / s)) + 1)
+        if ix0 >= ix1 or iy0 >= iy1:
+            return None
+        return slice(ix0, ix1), slice(iy0, iy1)
+
+    def light_amount(self, lights) -> np.ndarray:
+        """Accumulated light (0..1) per low-res pixel, indexed [x, y]."""
+        light = self._light
+        light.fill(0.0)
+        for src in lights:
+            sl = self._slice(src.bounds())
+            if sl is None:
+                continue
+            sx, sy = sl
+            light[sx, sy] += src.intensity(self._xs[sx], self._ys[:, sy])
+        np.clip(light, 0.0, 1.0, out=light)
+        return light
+
+    def render(self, lights) -> pygame.Surface:
+        light = self.light_amount(lights)
+        alpha = (self.alpha * (1.0 - light)).astype(np.uint8)
+        pa = pygame.surfarray.pixels_alpha(self._small)
+        pa[...] = alpha
+        del pa  # unlock the surface before blitting/scaling
+
+        if self.scale == 1:
+            return self._small
+        pygame.transform.smoothscale(self._small, self.size, self._out)
+        return self._out
+
+
+def make_light_patch(alpha: int, light_factory, radius: float, scale: int = 1) -> pygame.Surface:
+    """
+    Local darkness patch (2*radius+1 square) with one light centered in it, for lights
+    whose shape never changes (e.g. a fixed set of facing angles). MIN-blit it over a
+    uniform darkness layer to get the same result as a full-screen LightMap.
+    light_factory(origin) must return the light placed at the given patch-local origin.
+    """
+    half = int(math.ceil(radius)) + 2
+    lm = LightMap((half * 2 + 1, half * 2 + 1), alpha, scale=scale)
+    return lm.render([light_factory((half, half))]).copy()
@@ -0,0 +1,116 @@
+from __future__ import annotations
+from collections import OrderedDict
+from typing import Tuple
+import pygame
+
+# ======================================================
+# 9-slice panels
+#
+# A source image is cut into a 3x3 grid by four margins: the corners are drawn as-is,
+# the edges are tiled (or stretched) along the panel sides and the center fills the
+# inside. Composing a panel is done once per size; each NineSlice keeps its own
+# small LRU of composed surfaces, so drawing a panel every frame is a single blit.
+# ======================================================
+
+DEFAULT_CACHE_SIZE = 8
+
+
+def _is_opaque(surf: pygame.Surface) -> bool:
+    if not surf.get_flags() & pygame.SRCALPHA:
+        return True
+    w, h = surf.get_size()
+    return pygame.mask.from_surface(surf, 254).count() == w * h
+
+
+def _fill_tiled(dest: pygame.Surface, piece: pygame.Surface, rect: pygame.Rect):
+    """Tile `piece` over `rect` of dest, clipping the last row/column."""
+    pw, ph = piece.get_size()
+    if pw <= 0 or ph <= 0 or rect.w <= 0 or rect.h <= 0:
+        return
+    # One tiled strip, then the strip repeated down: O(w/pw + h/ph) blits
+    strip = pygame.Surface((rect.w, ph), piece.get_flags() & pygame.SRCALPHA, piece)
+    strip.blits([(piece, (x, 0)) for x in range(0, rect.w, pw)], doreturn=False)
+    dest.blits([(strip, (rect.x, y), pygame.Rect(0, 0, rect.w, min(ph, rect.bottom - y)))
+                for y in range(rect.y, rect.bottom, ph)], doreturn=False)
+
+
+class NineSlice:
+    def __init__(self, source: pygame.Surface, left: int, top: int, right: int, bottom: int,
+                 stretch: bool = False, cache_size: int = DEFAULT_CACHE_SIZE):
+        sw, sh = source.get_size()
+        if left + right > sw or top + bottom > sh:
+            raise ValueError(f"9-slice margins {left, top, right, bottom} don't fit a {sw}x{sh} image")
+        self.source = source
+        self.margins = (left, top, right, bottom)
+        self.stretch = stretch
+        self.cache_size = max(1, cache_size)
+        self.opaque = _is_opaque(source)
+        self._cache: "OrderedDict[Tuple[int, int], pygame.Surface]" = OrderedDict()
+
+        cw, ch = sw - left - right, sh - top - bottom
+        sub = source.subsurface
+        self.tl = sub((0, 0, left, top))
+        self.tr = sub((sw - right, 0, right, top))
+        self.bl = sub((0, sh - bottom, left, bottom))
+        self.br = sub((sw - right, sh - bottom, right, bottom))
+        self.top = sub((left, 0, cw, top))
+        self.bottom = sub((left, sh - bottom, cw, bottom))
+        self.left = sub((0, top, left, ch))
+        self.right = sub((sw - right, top, right, ch))
+        self.center = sub((left, top, cw, ch))
+
+    @property
+    def min_size(self) -> Tuple[int, int]:
+        l, t, r, b = self.margins
+        return l + r, t + b
+
+    def render(self, w: int, h: int) -> pygame.Surface:
+        """Composed panel of size (w, h); cached. Don't draw onto the result."""
+        key = (int(w), int(h))
+        surf = self._cache.get(key)
+        if surf is not None:
+            self._cache.move_to_end(key)
+            return surf
+        surf = self._compose(*key)
+        self._cache[key] = surf
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return surf
+
+    def draw(self, surface: pygame.Surface, rect):
+        rect = pygame.Rect(rect)
+        mw, mh = self.min_size
+        if rect.w < mw or rect.h < mh:
+            return
+        surface.blit(self.render(rect.w, rect.h), rect.topleft)
+
+    def clear_cache(self):
+        self._cache.clear()
+
+    def _compose(self, w: int, h: int) -> pygame.Surface:
+        l, t, r, b = self.margins
+        surf = pygame.Surface((w, h), pygame.SRCALPHA)
+        inner = pygame.Rect(l, t, w - l - r, h - t - b)
+
+        pieces = (
+            (self.center, inner),
+            (self.top, pygame.Rect(l, 0, inner.w, t)),
+            (self.bottom, pygame.Rect(l, h - b, inner.w, b)),
+            (self.left, pygame.Rect(0, t, l, inner.h)),
+            (self.right, pygame.Rect(w - r, t, r, inner.h)),
+        )
+        for piece, area in pieces:
+            if self.stretch:
+                if area.w > 0 and area.h > 0 and piece.get_width() and piece.get_height():
+                    surf.blit(pygame.transform.scale(piece, area.size), area.topleft)
+            else:
+                _fill_tiled(surf, piece, area)
+
+        surf.blit(self.tl, (0, 0))
+        surf.blit(self.tr, (w - r, 0))
+        surf.blit(self.bl, (0, h - b))
+        surf.blit(self.br, (w - r, h - b))
+
+        if pygame.display.get_surface() is not None:
+            surf = surf.convert() if self.opaque else surf.convert_alpha()
+        return surf
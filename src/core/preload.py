@@ -0,0 +1,143 @@
+from __future__ import annotations
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, Optional, Tuple, Union
+import threading
+import time
+import pygame
+
+from core.assets import ASSETS, AssetManager, Key, PathLike, resolve_asset
+from core.sprite_sheet import sheet_specs
+from core.speakers import resolve_speaker
+from audio.bgm import prefetch_bgm
+
+# ======================================================
+# Scene preloader
+#
+# Room factories load their images, map and music synchronously before the first
+# frame. The campaign starts a ScenePreloader for the next entry as soon as the
+# current scene's dialogue is over: a worker thread decodes the room's PNGs, reads
+# the baked raw files / sprite atlas pages and the music file, and runs the room's
+# warm hook (cached maps, light masks). No display access happens there; finish() converts the decoded surfaces to the
+# display format on the main thread and hands them to the shared asset cache,
+# where the room factory finds them.
+#
+# Anything not ready by finish() is simply loaded by the room as before.
+# ======================================================
+
+
+@dataclass(frozen=True)
+class Preload:
+    """What a room loads on construction (paths relative to ASSETS_DIR)."""
+    images: Tuple[PathLike, ...] = ()                   # sources, convert_alpha
+    opaque: Tuple[PathLike, ...] = ()                   # sources, convert
+    sheets: Tuple[str, ...] = ()                        # sprite sheets (core.sprite_sheet)
+    warm: Optional[Callable[[int, int], Any]] = None    # extra work (win_w, win_h); no display access
+
+
+def scene_portraits(scene_def: Optional[Dict[str, Any]]) -> Tuple[str, ...]:
+    """Bustshot files of the speakers of a scene definition."""
+    out = []
+    for node in (scene_def or {}).get("nodes", {}).values():
+        sp = resolve_speaker(node.get("speaker"))
+        if sp is not None and str(sp.portrait) not in out:
+            out.append(str(sp.portrait))
+    return tuple(out)
+
+
+class ScenePreloader:
+    def __init__(self, assets: AssetManager = ASSETS):
+        self.assets = assets
+        self._thread: Optional[threading.Thread] = None
+        self._decoded: Deque[Tuple[Key, pygame.Surface]] = deque()
+        self._cancel = threading.Event()
+        self._done = threading.Event()
+        self._done.set()
+        self.stats: Dict[str, Any] = {}
+
+    def start(self, preload: Union[Preload, Callable[[], Optional[Preload]], None],
+              scene_def: Optional[Dict[str, Any]] = None,
+              bgm: Optional[str] = None, win_size: Tuple[int, int] = (0, 0)):
+        """
+        Start loading on a worker thread (cancels a preload still running).
+        `preload` may be a function returning it, called on the worker (e.g. to
+        import the room module there).
+        """
+        self.cancel()
+        self._decoded.clear()
+        self._cancel.clear()
+        self._done.clear()
+        self.stats = {"images": 0, "decoded": 0, "raw_files": 0, "warm": False,
+                      "bgm": False, "errors": 0, "worker_ms": 0.0}
+        self._thread = threading.Thread(target=self._work, name="scene-preload", daemon=True,
+                                        args=(preload, scene_portraits(scene_def), bgm, win_size))
+        self._thread.start()
+
+    @property
+    def ready(self) -> bool:
+        return self._done.is_set()
+
+    def finish(self) -> Dict[str, Any]:
+        """
+        Main thread: convert and cache what the worker decoded so far, then stop it
+        (without waiting; the rest is loaded on demand). Returns the stats.
+        """
+        self._cancel.set()
+        while self._decoded:
+            key, surf = self._decoded.popleft()
+            self.assets.adopt(key, surf)
+        return self.stats
+
+    def cancel(self):
+        self._cancel.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self._decoded.clear()
+
+    # ---------- worker ----------
+    def _work(self, preload, portraits: Tuple[str, ...], bgm: Optional[str], win_size: Tuple[int, int]):
+        t0 = time.perf_counter()
+        stats = self.stats
+        try:
+            if callable(preload):
+                try:
+                    preload = preload()
+                except Exception:
+                    stats["errors"] += 1     # e.g. room import error: raised again when run
+                    preload = None
+            preload = preload or Preload()
+            images = [(p, "alpha") for p in preload.images + portraits]
+            images += [(p, "opaque") for p in preload.opaque]
+            specs = sheet_specs()
+            images += [(specs[n].image, "opaque") for n in preload.sheets if n in specs]
+            stats["images"] = len(images)
+            warm = preload.warm
+
+            if bgm:
+                stats["bgm"] = prefetch_bgm(bgm)
+            baked = self.assets.baked
+            if baked is not None:
+                stats["raw_files"] += baked.prefetch_atlas()
+            if warm is not None and not self._cancel.is_set():
+                try:
+                    warm(*win_size)
+                    stats["warm"] = True
+                except Exception:
+                    stats["errors"] += 1
+            for path, convert in images:
+                if self._cancel.is_set():
+                    break
+                if baked is not None:
+                    stats["raw_files"] += baked.prefetch(resolve_asset(path))
+                try:
+                    decoded = self.assets.decode(path, convert)
+                except Exception:
+                    stats["errors"] += 1     # missing file: the room handles it as before
+                    continue
+                if decoded is not None:
+                    self._decoded.append(decoded)
+                    stats["decoded"] += 1
+        finally:
+            stats["worker_ms"] = (time.perf_counter() - t0) * 1000.0
+            self._done.set()
@@ -0,0 +1,242 @@
+from __future__ import annotations
+from array import array
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+import atexit
+import math
+import time
+import pygame
+
+from core.config import FONT_PATH, PROFILE_DIR, PROFILE_FRAMES
+
+# ======================================================
+# Frame profiler
+#
+# F3 (or --profile on the command line) turns it on: each frame of run_scene and
+# of the start screen is split into phases (events, room update, room draw,
+# bustshot, dialogue / choices, HUD, display flip), timed with perf_counter and
+# kept per scene in fixed-size ring buffers. The overlay shows a stacked graph of
+# the last frames and p50 / p95 / p99 per phase; on exit every scene that was
+# recorded is written to PROFILE_DIR/<scene>.csv (one row per frame).
+#
+# Loop side:   PROFILER.begin_frame() ... PROFILER.mark("update") ... end_frame()
+# The time spent drawing the overlay itself is not counted in any phase.
+# ======================================================
+
+PROFILE_KEY = pygame.K_F3
+PHASES: Tuple[str, ...] = ("events", "update", "draw", "bustshot", "dialogue", "hud", "flip")
+PHASE_COLORS = {
+    "events": (120, 120, 255), "update": (90, 200, 90), "draw": (230, 80, 80),
+    "bustshot": (230, 160, 60), "dialogue": (220, 220, 90), "hud": (180, 110, 220),
+    "flip": (110, 200, 220),
+}
+
+
+# ---------- Ring buffer ----------
+class RingBuffer:
+    """Last `size` float samples, preallocated (no allocation per push)."""
+
+    def __init__(self, size: int = PROFILE_FRAMES):
+        self.size = int(size)
+        self._data = array("d", bytes(8 * self.size))
+        self._next = 0
+        self.count = 0
+
+    def push(self, value: float):
+        self._data[self._next] = value
+        self._next = (self._next + 1) % self.size
+        if self.count < self.size:
+            self.count += 1
+
+    def values(self) -> List[float]:
+        """Samples, oldest first."""
+        if self.count < self.size:
+            return self._data[:self.count].tolist()
+        return self._data[self._next:].tolist() + self._data[:self._next].tolist()
+
+    def last(self) -> float:
+        return self._data[self._next - 1] if self.count else 0.0
+
+
+def percentiles(values: Sequence[float], qs: Sequence[float] = (50, 95, 99)) -> Tuple[float, ...]:
+    """Nearest-rank percentiles (0.0 for no samples)."""
+    if not values:
+        return tuple(0.0 for _ in qs)
+    ordered = sorted(values)
+    n = len(ordered)
+    return tuple(ordered[min(n - 1, max(0, math.ceil(q / 100.0 * n) - 1))] for q in qs)
+
+
+class SceneProfile:
+    """Ring buffers (ms) of one scene: one per phase, plus the frame total."""
+
+    def __init__(self, name: str, size: int = PROFILE_FRAMES):
+        self.name = name
+        self.phases: Dict[str, RingBuffer] = {p: RingBuffer(size) for p in PHASES}
+        self.total = RingBuffer(size)
+        self.frames = 0
+
+    def summary(self) -> Dict[str, Tuple[float, float, float]]:
+        """phase -> (p50, p95, p99) in ms, "total" included."""
+        out = {p: percentiles(buf.values()) for p, buf in self.phases.items()}
+        out["total"] = percentiles(self.total.values())
+        return out
+
+    def write_csv(self, path: Path):
+        columns = [self.phases[p].values() for p in PHASES] + [self.total.values()]
+        first = self.frames - self.total.count
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            f.write(",".join(("frame",) + PHASES + ("total",)) + "\n")
+            for i, row in enumerate(zip(*columns)):
+                f.write(f"{first + i}," + ",".join(f"{v:.4f}" for v in row) + "\n")
+
+
+# ---------- Profiler ----------
+class FrameProfiler:
+    GRAPH_W, GRAPH_H = 240, 80
+    GRAPH_MS = 33.3               # graph height in ms (two 60 FPS frames)
+    REFRESH_FRAMES = 30           # percentile table refresh (sorting every frame would show up)
+    MARGIN = 10
+
+    def __init__(self, size: int = PROFILE_FRAMES, out_dir: Path = PROFILE_DIR):
+        self.size = size
+        self.out_dir = Path(out_dir)
+        self.enabled = False
+        self.scenes: Dict[str, SceneProfile] = {}
+        self.current: Optional[SceneProfile] = None
+        self._frame: Dict[str, float] = {}
+        self._last = 0.0
+        self._in_frame = False
+        self._exit_hooked = False
+        # overlay
+        self._font: Optional[pygame.font.Font] = None
+        self._graph: Optional[pygame.Surface] = None
+        self._table: Optional[pygame.Surface] = None
+        self._table_age = 0
+
+    # ---------- control ----------
+    def enable(self, on: bool = True):
+        self.enabled = on
+        if on and not self._exit_hooked:
+            atexit.register(self.dump_csv)
+            self._exit_hooked = True
+
+    def toggle(self):
+        self.enable(not self.enabled)
+
+    def handle_event(self, event) -> bool:
+        """True if the event was the profiler key (consumed)."""
+        if event.type == pygame.KEYDOWN and event.key == PROFILE_KEY:
+            self.toggle()
+            return True
+        return False
+
+    def begin_scene(self, name: str):
+        """Following frames are recorded under `name` (kept across visits)."""
+        profile = self.scenes.get(name)
+        if profile is None:
+            profile = self.scenes[name] = SceneProfile(name, self.size)
+        self.current = profile
+        self._graph = None
+        self._table_age = self.REFRESH_FRAMES
+
+    # ---------- per frame ----------
+    def begin_frame(self):
+        self._in_frame = self.enabled and self.current is not None
+        if self._in_frame:
+            self._frame.clear()
+            self._last = time.perf_counter()
+
+    def mark(self, phase: str):
+        """End `phase` (time since the previous mark / begin_frame)."""
+        if self._in_frame:
+            now = time.perf_counter()
+            self._frame[phase] = self._frame.get(phase, 0.0) + (now - self._last) * 1000.0
+            self._last = now
+
+    def end_frame(self):
+        if not self._in_frame:
+            return
+        self._in_frame = False
+        profile = self.current
+        total = 0.0
+        for phase, buf in profile.phases.items():
+            ms = self._frame.get(phase, 0.0)
+            buf.push(ms)
+            total += ms
+        profile.total.push(total)
+        profile.frames += 1
+        if self._graph is not None:
+            self._graph_column()
+
+    # ---------- overlay ----------
+    def draw(self, screen: pygame.Surface):
+        """Graph + percentiles in the top-right corner (excluded from the timings)."""
+        if not self.enabled or self.current is None:
+            return
+        t0 = time.perf_counter()
+        if self._font is None:
+            self._font = pygame.font.Font(FONT_PATH, 8)
+        if self._graph is None:
+            self._graph = pygame.Surface((self.GRAPH_W, self.GRAPH_H))
+            self._graph.fill((0, 0, 0))
+        self._table_age += 1
+        if self._table is None or self._table_age >= self.REFRESH_FRAMES:
+            self._table = self._render_table()
+            self._table_age = 0
+
+        x = screen.get_width() - self.GRAPH_W - self.MARGIN
+        y = self.MARGIN + 30          # below the HUD line
+        screen.blit(self._graph, (x, y))
+        budget_y = y + self.GRAPH_H - int(self.GRAPH_H * (1000.0 / 60) / self.GRAPH_MS)
+        pygame.draw.line(screen, (255, 255, 255), (x, budget_y), (x + self.GRAPH_W - 1, budget_y))
+        screen.blit(self._table, (x, y + self.GRAPH_H + 4))
+        if self._in_frame:
+            self._last += time.perf_counter() - t0
+
+    def _graph_column(self):
+        """Scroll the graph one pixel left and draw the newest frame as a stacked bar."""
+        g = self._graph
+        g.scroll(-1, 0)
+        col = self.GRAPH_W - 1
+        g.fill((0, 0, 0), (col, 0, 1, self.GRAPH_H))
+        bottom = self.GRAPH_H
+        scale = self.GRAPH_H / self.GRAPH_MS
+        for phase, buf in self.current.phases.items():
+            h = buf.last() * scale
+            top = max(0.0, bottom - h)
+            if bottom - top >= 1:
+                g.fill(PHASE_COLORS[phase], (col, int(top), 1, int(bottom) - int(top)))
+            bottom = top
+            if bottom <= 0:
+                break
+
+    def _render_table(self) -> pygame.Surface:
+        profile = self.current
+        rows = [(f"{profile.name} ({profile.total.count} fr)", (255, 255, 255))]
+        rows.append(("phase      p50   p95   p99", (200, 200, 200)))
+        for phase, (p50, p95, p99) in profile.summary().items():
+            rows.append((f"{phase:<8} {p50:5.2f} {p95:5.2f} {p99:5.2f}", PHASE_COLORS.get(phase, (255, 255, 255))))
+        line_h = self._font.get_linesize() + 2
+        table = pygame.Surface((self.GRAPH_W, line_h * len(rows) + 4))
+        table.fill((0, 0, 0))
+        for i, (text, color) in enumerate(rows):
+            table.blit(self._font.render(text, False, color), (4, 2 + i * line_h))
+        return table
+
+    # ---------- export ----------
+    def dump_csv(self, out_dir: Optional[Path] = None) -> List[Path]:
+        """Write <scene>.csv for every scene with recorded frames; returns the paths."""
+        out_dir = Path(out_dir or self.out_dir)
+        written = []
+        for name, profile in self.scenes.items():
+            if not profile.total.count:
+                continue
+            out_dir.mkdir(parents=True, exist_ok=True)
+            path = out_dir / f"{name}.csv"
+            profile.write_csv(path)
+            written.append(path)
+        return written
+
+
+PROFILER = FrameProfiler()
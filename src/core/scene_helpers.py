@@ -1,6 +1,14 @@
 from scenes.scene_airport_dialogue import SCENE_AIRPORT_CAUGHT, SCENE_AIRPORT_ESCAPED
 
+# Ending rule: caught if Tony lost faith or the police closed in
+CAUGHT_TRUST_BELOW = 10
+CAUGHT_GAP_BELOW = 6
+
+def is_caught(trust, police_gap):
+    """Ending rule; works on plain ints and on NumPy arrays."""
+    return (trust < CAUGHT_TRUST_BELOW) | (police_gap < CAUGHT_GAP_BELOW)
+
 def select_airport_scene(gvars):
-    caught = (gvars.trust < 10) or (gvars.police_gap < 6)
+    caught = bool(is_caught(gvars.trust, gvars.police_gap))
     gvars.flags["ending"] = "caught" if caught else "escaped"
     return SCENE_AIRPORT_CAUGHT if caught else SCENE_AIRPORT_ESCAPED
\ No newline at end of file
@@ -0,0 +1,87 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+import pygame
+
+from core.config import GENERAL_ASSET_DIR, ASSETS_DIR
+from core.assets import ASSETS, load_image
+
+# ======================================================
+# Speaker registry
+#
+# Maps the speaker names used in the dialogue scripts (and their aliases) to a
+# portrait. Portraits are loaded the first time their speaker talks and kept for
+# the whole session; scaled copies are cached per target height, so a bustshot on
+# screen is a single blit. Speakers that never talk cost nothing.
+# ======================================================
+
+@dataclass(frozen=True)
+class Speaker:
+    key: str
+    portrait: Path
+    flip_x: bool = True     # portraits face right on disk; bustshots face left
+
+
+SPEAKERS: Dict[str, Speaker] = {
+    "tony":     Speaker("tony",     GENERAL_ASSET_DIR / "tony_bustshot.png"),
+    "lucas":    Speaker("lucas",    GENERAL_ASSET_DIR / "lucas_bustshot.png"),
+    "martha":   Speaker("martha",   GENERAL_ASSET_DIR / "granny_bustshot.png"),
+    "stranger": Speaker("stranger", GENERAL_ASSET_DIR / "stranger_bustshot.png"),
+    "harold":   Speaker("harold",   ASSETS_DIR / "airport" / "harold.png"),
+}
+
+ALIASES: Dict[str, str] = {
+    "lukas": "lucas",
+    "john": "stranger",
+    "granny": "martha",
+}
+
+# Names that only need to start with the key ("Harold (mari de Martha)")
+PREFIXES: Tuple[str, ...] = ("harold",)
+
+
+def resolve_speaker(name: Optional[str]) -> Optional[Speaker]:
+    if not name:
+        return None
+    key = name.strip().lower()
+    key = ALIASES.get(key, key)
+    sp = SPEAKERS.get(key)
+    if sp is None:
+        for prefix in PREFIXES:
+            if key.startswith(prefix):
+                return SPEAKERS.get(ALIASES.get(prefix, prefix))
+    return sp
+
+
+class PortraitCache:
+    def __init__(self):
+        self._scaled: Dict[Tuple[str, int, float], Optional[pygame.Surface]] = {}
+
+    def scaled(self, name: Optional[str], max_h: int, scale: float) -> Optional[pygame.Surface]:
+        """
+        Portrait scaled to `scale` x min(original height, max_h) (max_h = space above the
+        dialogue box), cached per (speaker, max_h, scale).
+        """
+        sp = resolve_speaker(name)
+        if sp is None or max_h <= 0:
+            return None
+        key = (sp.key, int(max_h), float(scale))
+        if key not in self._scaled:
+            try:
+                ow, oh = ASSETS.source_size(sp.portrait)
+                base_h = min(oh, max_h)
+                target_h = max(1, int(round(base_h * scale)))
+                target_w = max(1, int(round(ow * (target_h / oh))))
+                # Goes through the asset cache, so baked bustshots skip decode + smoothscale
+                self._scaled[key] = load_image(sp.portrait, size=(target_w, target_h),
+                                               flip_x=sp.flip_x, smooth=True)
+            except Exception:
+                self._scaled[key] = None
+        return self._scaled[key]
+
+    def clear(self):
+        self._scaled.clear()
+
+
+PORTRAITS = PortraitCache()
@@ -0,0 +1,193 @@
+from __future__ import annotations
+from typing import Any, Dict, List, Optional, Tuple, Union
+import pygame
+
+from core.assets import ASSETS, AssetManager, Key, PathLike, variant_name
+
+# ======================================================
+# Sprite atlas
+#
+# Character and vehicle frames (walk cycles, cars, police, the plane) are small and
+# numerous. They are packed with a shelf packer into a few large pages; callers
+# get subsurfaces of those pages, and locate() gives the (page, rect) pair for
+# batched blits. When the bake (src/game/bake_assets.py) has packed the manifest's
+# "atlas" sources, whole pages are loaded raw at once instead of one file per frame;
+# anything else is packed at runtime into pages of the same size. Surfaces that
+# don't come from a single file (sprite-sheet frames) are packed by name: add/find.
+#
+# Subsurfaces share the page pixels: blit them, copy them before drawing onto them.
+# ======================================================
+
+ATLAS_PAGE_SIZE = 1024
+ATLAS_PADDING = 1     # transparent gutter between sprites
+
+
+# ---------- Packing ----------
+class ShelfPacker:
+    """
+    Shelf (row) packing: sprites go left→right on the current shelf; a new shelf is
+    opened below when a sprite doesn't fit, and a new page when no shelf fits.
+    Packing tallest-first (as the bake does) keeps shelves tight.
+    """
+
+    def __init__(self, page_w: int = ATLAS_PAGE_SIZE, page_h: int = ATLAS_PAGE_SIZE,
+                 padding: int = ATLAS_PADDING):
+        self.page_w, self.page_h = page_w, page_h
+        self.padding = padding
+        self.pages: List[List[List[int]]] = []    # per page: shelves [y, height, next_x]
+        self.used_h: List[int] = []
+
+    def insert(self, w: int, h: int) -> Tuple[int, int, int]:
+        """Place a w x h sprite; returns (page, x, y). Oversized sprites get a page of their own."""
+        pw, ph = w + self.padding, h + self.padding
+        for page, shelves in enumerate(self.pages):
+            for shelf in shelves:
+                y, sh, nx = shelf
+                if ph <= sh and nx + pw <= self.page_w:
+                    shelf[2] = nx + pw
+                    return page, nx, y
+            top = self.used_h[page]
+            if top + ph <= self.page_h and pw <= self.page_w:
+                shelves.append([top, ph, pw])
+                self.used_h[page] = top + ph
+                return page, 0, top
+        self.pages.append([[0, ph, pw]])
+        self.used_h.append(ph)
+        return len(self.pages) - 1, 0, 0
+
+    def page_size(self, page: int) -> Tuple[int, int]:
+        """Size a page needs: full width, used height (oversized sprites may exceed)."""
+        widest = max((s[2] for s in self.pages[page]), default=0)
+        return max(self.page_w, widest), max(1, self.used_h[page])
+
+
+# ---------- Atlas ----------
+class SpriteAtlas:
+    def __init__(self, assets: AssetManager = ASSETS,
+                 page_size: int = ATLAS_PAGE_SIZE, padding: int = ATLAS_PADDING):
+        self.assets = assets
+        self.page_size = page_size
+        self.padding = padding
+        self.pages: List[pygame.Surface] = []
+        self._slots: Dict[Union[Key, str], Tuple[int, pygame.Rect]] = {}
+        self._subs: Dict[Union[Key, str], pygame.Surface] = {}
+        self._packer = ShelfPacker(page_size, page_size, padding)
+        self._runtime_pages: List[int] = []       # packer page -> self.pages index
+        self._baked: Dict[str, Tuple[int, pygame.Rect]] = {}
+        self._baked_loaded = False
+
+    def sprite(self, path: PathLike, **opts) -> pygame.Surface:
+        """Same options as load_image(); returns a subsurface of an atlas page."""
+        key = self.assets.key_for(path, **opts)
+        sub = self._subs.get(key)
+        return sub if sub is not None else self._sub(key, self._locate(key))
+
+    def find(self, name: str) -> Optional[pygame.Surface]:
+        """Named sprite (see add) if already packed or baked, else None."""
+        sub = self._subs.get(name)
+        if sub is not None:
+            return sub
+        slot = self._slots.get(name)
+        if slot is None:
+            if not self._baked_loaded:
+                self._load_baked()
+            slot = self._baked.get(name)
+            if slot is None:
+                return None
+            self._slots[name] = slot
+        return self._sub(name, slot)
+
+    def add(self, name: str, surf: pygame.Surface) -> pygame.Surface:
+        """Pack a surface built elsewhere (e.g. a sprite-sheet frame) under a unique name."""
+        sub = self.find(name)
+        if sub is None:
+            slot = self._slots[name] = self._place(surf)
+            sub = self._sub(name, slot)
+        return sub
+
+    def locate(self, path: PathLike, **opts) -> Tuple[pygame.Surface, pygame.Rect]:
+        """(page surface, area) of a sprite, for screen.blits((page, pos, area), ...)."""
+        page, rect = self._locate(self.assets.key_for(path, **opts))
+        return self.pages[page], rect
+
+    def clear(self):
+        self.pages.clear()
+        self._slots.clear()
+        self._subs.clear()
+        self._packer = ShelfPacker(self.page_size, self.page_size, self.padding)
+        self._runtime_pages.clear()
+        self._baked.clear()
+        self._baked_loaded = False
+
+    def stats(self) -> Dict[str, Any]:
+        page_px = sum(p.get_width() * p.get_height() for p in self.pages)
+        sprite_px = sum(r.w * r.h for _, r in self._slots.values())
+        return {
+            "pages": len(self.pages),
+            "sprites": len(self._slots),
+            "bytes": sum(p.get_width() * p.get_height() * p.get_bytesize() for p in self.pages),
+            "fill": (sprite_px / page_px) if page_px else 0.0,
+        }
+
+    # ---------- internals ----------
+    def _sub(self, key: Union[Key, str], slot: Tuple[int, pygame.Rect]) -> pygame.Surface:
+        sub = self._subs[key] = self.pages[slot[0]].subsurface(slot[1])
+        return sub
+
+    def _locate(self, key: Key) -> Tuple[int, pygame.Rect]:
+        slot = self._slots.get(key)
+        if slot is None:
+            if not self._baked_loaded:
+                self._load_baked()
+            slot = self._baked.get(variant_name(key)) or self._pack(key)
+            self._slots[key] = slot
+        return slot
+
+    def _load_baked(self):
+        """Pages packed by the bake, used only if all their sources are still fresh."""
+        self._baked_loaded = True
+        baked = self.assets.baked
+        pages = baked.atlas_pages() if baked is not None else []
+        if not pages:
+            return
+        first = len(self.pages)
+        self.pages.extend(pages)
+        for name, (page, x, y, w, h) in baked.index["atlas"]["sprites"].items():
+            self._baked[name] = (first + page, pygame.Rect(x, y, w, h))
+
+    def _pack(self, key: Key) -> Tuple[int, pygame.Rect]:
+        slot = self._place(self.assets.image(key[0], **_opts_of(key)))
+        self.assets.discard(key)        # the packed copy is the one kept
+        return slot
+
+    def _place(self, surf: pygame.Surface) -> Tuple[int, pygame.Rect]:
+        w, h = surf.get_size()
+        ppage, x, y = self._packer.insert(w, h)
+        while ppage >= len(self._runtime_pages):
+            self._runtime_pages.append(len(self.pages))
+            self.pages.append(_new_page((max(self.page_size, w), max(self.page_size, h))))
+        page = self._runtime_pages[ppage]
+        # MAX onto the cleared page copies the pixels exactly (no alpha blending)
+        self.pages[page].blit(surf, (x, y), special_flags=pygame.BLEND_RGBA_MAX)
+        return page, pygame.Rect(x, y, w, h)
+
+
+def _opts_of(key: Key) -> Dict[str, Any]:
+    _, size, flip, convert, smooth = key
+    return {"size": size, "flip_x": flip[0], "flip_y": flip[1], "convert": convert, "smooth": smooth}
+
+
+def _new_page(size: Tuple[int, int]) -> pygame.Surface:
+    page = pygame.Surface(size, pygame.SRCALPHA, 32)
+    if pygame.display.get_surface() is not None:
+        page = page.convert_alpha()
+    page.fill((0, 0, 0, 0))
+    return page
+
+
+SPRITES = SpriteAtlas()
+
+
+def load_sprite(path: PathLike, **opts) -> pygame.Surface:
+    """SPRITES.sprite(path, **opts): atlas subsurface (don't draw onto it)."""
+    return SPRITES.sprite(path, **opts)
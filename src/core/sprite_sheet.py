@@ -0,0 +1,180 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import json
+import pygame
+
+from core.config import SPRITE_SHEETS_PATH
+from core.assets import ASSETS
+from core.sprite_atlas import SPRITES
+
+# ======================================================
+# Sprite sheets
+#
+# A character's frames come from one sheet image (one decode) described in
+# assets/general/sprite_alll/sheets.json: per clip ("down", "up", "right", "idle",
+# ...) a list of frame rects, or grid cells when the sheet declares a grid, and
+# {"mirror": clip} for flipped clips. The sheets have an opaque background: it is
+# keyed out where it touches each frame's border (so dark pixels inside the art
+# stay opaque). Cut frames are kept per sheet; scaled frames go to the sprite atlas,
+# where the bake can pre-pack them (manifest "sheets": heights per sheet).
+#
+# Adding frames or clips is a metadata change; no factory code needed.
+# ======================================================
+
+
+@dataclass(frozen=True)
+class SheetSpec:
+    name: str
+    image: str                                  # relative to ASSETS_DIR
+    clips: Dict[str, Any]                       # clip -> [frame, ...] | {"mirror": clip}
+    grid: Optional[Tuple[int, int]] = None      # (cols, rows): frames given as [col, row]
+    key: Optional[Tuple[int, int, int]] = None  # background color (default: top-left pixel)
+    tolerance: int = 5                          # per channel, exclusive
+    frame_ms: int = 140
+
+
+_SPECS: Optional[Dict[str, SheetSpec]] = None
+
+
+def load_sheet_specs(path: Path = SPRITE_SHEETS_PATH) -> Dict[str, SheetSpec]:
+    data = json.loads(Path(path).read_text(encoding="utf-8"))
+    specs = {}
+    for name, d in data.get("sheets", {}).items():
+        specs[name] = SheetSpec(
+            name=name,
+            image=d["image"],
+            clips=d["clips"],
+            grid=tuple(d["grid"]) if d.get("grid") else None,
+            key=tuple(d["key"]) if d.get("key") else None,
+            tolerance=int(d.get("tolerance", 5)),
+            frame_ms=int(d.get("frame_ms", 140)),
+        )
+    return specs
+
+
+def sheet_specs() -> Dict[str, SheetSpec]:
+    global _SPECS
+    if _SPECS is None:
+        _SPECS = load_sheet_specs()
+    return _SPECS
+
+
+# ---------- Sheet ----------
+class SpriteSheet:
+    def __init__(self, spec: SheetSpec):
+        self.spec = spec
+        self._frames: Dict[str, List[pygame.Surface]] = {}
+        self._scaled: Dict[Tuple[str, int], List[pygame.Surface]] = {}
+
+    @property
+    def surface(self) -> pygame.Surface:
+        return ASSETS.image(self.spec.image, convert="opaque")
+
+    @property
+    def clip_names(self) -> List[str]:
+        return list(self.spec.clips)
+
+    def frame_rect(self, frame: Sequence[int]) -> pygame.Rect:
+        if len(frame) == 4:
+            return pygame.Rect(frame)
+        if self.spec.grid is None:
+            raise ValueError(f"sheet {self.spec.name!r}: cell {list(frame)} given but no grid declared")
+        cols, rows = self.spec.grid
+        sw, sh = self.surface.get_size()
+        cw, ch = sw // cols, sh // rows
+        col, row = frame
+        return pygame.Rect(col * cw, row * ch, cw, ch)
+
+    def clip(self, name: str) -> List[pygame.Surface]:
+        """Full-size keyed frames of a clip (cut once)."""
+        frames = self._frames.get(name)
+        if frames is None:
+            spec = self.spec.clips.get(name)
+            if spec is None:
+                raise KeyError(f"sheet {self.spec.name!r} has no clip {name!r}")
+            if isinstance(spec, dict):
+                frames = [pygame.transform.flip(f, True, False) for f in self.clip(spec["mirror"])]
+            else:
+                frames = [self._cut(self.frame_rect(f)) for f in spec]
+            self._frames[name] = frames
+        return frames
+
+    def clip_length(self, name: str) -> int:
+        spec = self.spec.clips[name]
+        return self.clip_length(spec["mirror"]) if isinstance(spec, dict) else len(spec)
+
+    def render_clip(self, name: str, height: int) -> List[pygame.Surface]:
+        """
+        Frames scaled (nearest) to `height`. Mirrored clips flip the scaled frames,
+        like the walker factories always did.
+        """
+        spec = self.spec.clips.get(name)
+        if isinstance(spec, dict):
+            return [pygame.transform.flip(f, True, False) for f in self.render_clip(spec["mirror"], height)]
+        return [_scale_to_height(f, height) for f in self.clip(name)]
+
+    def scaled_clip(self, name: str, height: int) -> List[pygame.Surface]:
+        """render_clip() as sprite atlas subsurfaces; baked frames skip the sheet decode."""
+        key = (name, int(height))
+        frames = self._scaled.get(key)
+        if frames is None:
+            names = [frame_name(self.spec.name, name, i, height) for i in range(self.clip_length(name))]
+            frames = [SPRITES.find(n) for n in names]
+            if any(f is None for f in frames):
+                frames = [SPRITES.add(n, f) for n, f in zip(names, self.render_clip(name, height))]
+            self._scaled[key] = frames
+        return frames
+
+    def _cut(self, rect: pygame.Rect) -> pygame.Surface:
+        sheet = self.surface
+        frame = pygame.Surface(rect.size, pygame.SRCALPHA, 32)
+        frame.blit(sheet, (0, 0), rect)
+        key = self.spec.key or tuple(sheet.get_at((0, 0)))[:3]
+        _key_out_border(frame, key, self.spec.tolerance)
+        if pygame.display.get_surface() is not None:
+            frame = frame.convert_alpha()
+        return frame
+
+
+def frame_name(sheet: str, clip: str, index: int, height: int) -> str:
+    """Atlas name of a scaled sheet frame (shared with the bake)."""
+    return f"sheet:{sheet}:{clip}:{index}@{int(height)}"
+
+
+def _key_out_border(frame: pygame.Surface, color, tolerance: int):
+    """Make transparent the background-colored regions connected to the frame border."""
+    t = max(1, int(tolerance))
+    near = pygame.mask.from_threshold(frame, (*color[:3], 255), (t, t, t, 255))
+    w, h = frame.get_size()
+    bg = pygame.mask.Mask((w, h))
+    border = [(x, y) for x in range(w) for y in (0, h - 1)] + [(x, y) for y in range(h) for x in (0, w - 1)]
+    for pos in border:
+        if near.get_at(pos) and not bg.get_at(pos):
+            bg.draw(near.connected_component(pos), (0, 0))
+    # MULT by white keeps the colors; alpha becomes 0 on the background, 255 elsewhere
+    alpha = bg.to_surface(setcolor=(255, 255, 255, 0), unsetcolor=(255, 255, 255, 255))
+    frame.blit(alpha, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
+
+
+def _scale_to_height(img: pygame.Surface, target_h: int) -> pygame.Surface:
+    w, h = img.get_size()
+    if h == 0:
+        return img
+    new_w = max(1, int(round(w * (target_h / h))))
+    return pygame.transform.scale(img, (new_w, target_h))
+
+
+# ---------- Registry ----------
+_SHEETS: Dict[str, SpriteSheet] = {}
+
+
+def get_sheet(name: str) -> SpriteSheet:
+    sheet = _SHEETS.get(name)
+    if sheet is None:
+        specs = sheet_specs()
+        if name not in specs:
+            raise KeyError(f"unknown sprite sheet {name!r} (known: {', '.join(specs)})")
+        sheet = _SHEETS[name] = SpriteSheet(specs[name])
+    return sheet
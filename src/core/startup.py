@@ -0,0 +1,47 @@
+from __future__ import annotations
+from typing import Dict, List, Optional, Tuple
+import time
+
+# ======================================================
+# Startup report
+#
+# Time-to-menu broken down by boot phase (imports, pygame.init, mixer, fonts, first
+# frame...). Each mark() closes the phase that started at the previous mark, so the
+# phases add up to the total.
+#
+#   python src/game/play_campaign.py --startup-report
+# ======================================================
+
+
+class StartupReport:
+    def __init__(self, t0: Optional[float] = None, echo: bool = False):
+        self.t0 = time.perf_counter() if t0 is None else t0
+        self.echo = echo
+        self._last = self.t0
+        self.phases: List[Tuple[str, float]] = []
+
+    def mark(self, phase: str) -> float:
+        """End `phase` now; returns its duration in ms."""
+        now = time.perf_counter()
+        ms = (now - self._last) * 1000.0
+        self.phases.append((phase, ms))
+        self._last = now
+        return ms
+
+    @property
+    def total_ms(self) -> float:
+        return (self._last - self.t0) * 1000.0
+
+    def as_dict(self) -> Dict[str, float]:
+        return {**{name: round(ms, 2) for name, ms in self.phases}, "total": round(self.total_ms, 2)}
+
+    def done(self):
+        """Boot is over (first frame shown): print the report if asked to."""
+        if self.echo:
+            print(self.format(), flush=True)
+
+    def format(self) -> str:
+        width = max([len(n) for n, _ in self.phases] + [5])
+        lines = [f"  {name:<{width}} {ms:8.1f} ms" for name, ms in self.phases]
+        lines.append(f"  {'total':<{width}} {self.total_ms:8.1f} ms")
+        return "startup:\n" + "\n".join(lines)
@@ -0,0 +1,84 @@
+from __future__ import annotations
+from collections import OrderedDict
+from typing import Any, Dict, Tuple
+import pygame
+
+from core.config import TEXT_CACHE_BUDGET_BYTES
+
+# ======================================================
+# Shared rendered-text cache
+#
+# font.render() is by far the most expensive call while a dialogue sits on screen,
+# and the same strings are rendered every frame (current page, choices, HUD, menu).
+# render_text() has the same signature as Font.render and returns a cached surface
+# keyed by (font, text, color, antialias). Entries are evicted least-recently-used
+# once the pixel budget is exceeded.
+#
+# Returned surfaces are shared: blit them, never draw onto them.
+# ======================================================
+
+Key = Tuple[pygame.font.Font, str, Tuple[int, ...], bool]
+
+
+def _color_key(color) -> Tuple[int, ...]:
+    return tuple(pygame.Color(color))
+
+
+class TextCache:
+    def __init__(self, budget_bytes: int = TEXT_CACHE_BUDGET_BYTES):
+        self.budget_bytes = int(budget_bytes)
+        self._entries: "OrderedDict[Key, pygame.Surface]" = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def render(self, font: pygame.font.Font, text: str, antialias: bool, color) -> pygame.Surface:
+        key = (font, text, _color_key(color), bool(antialias))
+        surf = self._entries.get(key)
+        if surf is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return surf
+
+        self.misses += 1
+        surf = font.render(text, antialias, color)
+        self._entries[key] = surf
+        self.bytes += _surface_bytes(surf)
+        self._evict()
+        return surf
+
+    def _evict(self):
+        # Always keep the newest entry, even if it alone exceeds the budget
+        while self.bytes > self.budget_bytes and len(self._entries) > 1:
+            _, old = self._entries.popitem(last=False)
+            self.bytes -= _surface_bytes(old)
+            self.evictions += 1
+
+    def clear(self):
+        self._entries.clear()
+        self.bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "budget_bytes": self.budget_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": (self.hits / lookups) if lookups else 0.0,
+        }
+
+
+def _surface_bytes(surf: pygame.Surface) -> int:
+    return surf.get_width() * surf.get_height() * surf.get_bytesize()
+
+
+TEXT_CACHE = TextCache()
+
+
+def render_text(font: pygame.font.Font, text: str, antialias: bool, color) -> pygame.Surface:
+    """Drop-in for font.render(text, antialias, color) going through the shared cache."""
+    return TEXT_CACHE.render(font, text, antialias, color)
@@ -0,0 +1,220 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Optional, Tuple
+import pygame
+
+from core.config import RIGHT_MARGIN, BUSTSHOT_SCALE, FONT_PATH
+from core.glyph_atlas import get_atlas, get_metrics
+from core.text_cache import render_text
+from core.speakers import PORTRAITS, PortraitCache
+
+# ======================================================
+# Retained UI widgets for run_scene
+#
+# Each widget keeps its layout and composed surfaces and only recomputes them
+# when its inputs change (options / selection, speaker / box top, trust / gap).
+# The per-frame path is blits only.
+# ======================================================
+
+# ---------- Choice menu ----------
+@dataclass(frozen=True)
+class ChoiceLayout:
+    labels: Tuple[str, ...]                 # truncated labels (without the "> " marker)
+    positions: Tuple[Tuple[int, int], ...]  # top-left of each option, screen coords
+    rect: pygame.Rect                       # area covered by the menu
+    rows: int
+
+    @property
+    def vertical(self) -> bool:
+        """One option per row: navigate with UP/DOWN instead of LEFT/RIGHT."""
+        return self.rows == len(self.labels)
+
+
+class ChoiceMenu:
+    """Inline choices packed left→right in the dialogue box, bottom-aligned."""
+    GAP_X = 20
+    ROW_GAP = 6
+    COLOR_SELECTED = (255, 255, 255)
+    COLOR_IDLE = (190, 190, 190)
+
+    def __init__(self, dialog):
+        self.dialog = dialog
+        self.options: Tuple[str, ...] = ()
+        self.selected = 0
+        self._layout: Optional[ChoiceLayout] = None
+        self._layout_key = None
+        self._blits: list = []
+        self._blits_key = None
+
+    def set_options(self, options, selected: int = 0):
+        self.options = tuple(options)
+        self.selected = max(0, min(selected, len(self.options) - 1))
+
+    @property
+    def layout(self) -> ChoiceLayout:
+        d = self.dialog
+        key = (self.options, tuple(d.box_rect), d.font)
+        if key != self._layout_key:
+            self._layout = self._compute_layout()
+            self._layout_key = key
+        return self._layout
+
+    def _compute_layout(self) -> ChoiceLayout:
+        d = self.dialog
+        metrics = get_metrics(d.font)
+        inner_left = d.box_rect.left + d.padding_left
+        inner_right = d.box_rect.right - d.padding_right
+        inner_w = max(1, inner_right - inner_left)
+
+        # Truncate so marker + label fits, then pack rows with the "> " marker width
+        # (same as the "  " idle marker for the pixel font)
+        labels = tuple(metrics.truncate(raw, inner_w - metrics.width("> ")) for raw in self.options)
+        rows: list[list[int]] = [[]]
+        offsets = []
+        cur_w = 0
+        for i, label in enumerate(labels):
+            w = metrics.width("> " + label)
+            if cur_w and cur_w + self.GAP_X + w > inner_w:
+                rows.append([])
+                cur_w = 0
+            offsets.append(cur_w + (self.GAP_X if cur_w else 0))
+            cur_w = offsets[-1] + w
+            rows[-1].append(i)
+
+        line_h = d.font.get_height()
+        total_h = len(rows) * line_h + (len(rows) - 1) * self.ROW_GAP
+        top = d.box_rect.bottom - d.padding_bottom - total_h
+
+        positions = [None] * len(labels)
+        for r, row in enumerate(rows):
+            for i in row:
+                positions[i] = (inner_left + offsets[i], top + r * (line_h + self.ROW_GAP))
+        return ChoiceLayout(labels, tuple(positions), pygame.Rect(inner_left, top, inner_w, max(0, total_h)),
+                            len(rows) if labels else 0)
+
+    def handle_key(self, key: int) -> bool:
+        """Move the selection with arrows / WASD. Returns True if it changed."""
+        n = len(self.options)
+        if n == 0:
+            return False
+        before = self.selected
+        if self.layout.vertical:
+            # one option per line → use UP/DOWN (W/S also works)
+            if key in (pygame.K_UP, pygame.K_w):
+                self.selected = max(0, self.selected - 1)
+            elif key in (pygame.K_DOWN, pygame.K_s):
+                self.selected = min(n - 1, self.selected + 1)
+        else:
+            # compact inline menu → use LEFT/RIGHT (A/D also works)
+            if key in (pygame.K_LEFT, pygame.K_a):
+                self.selected = max(0, self.selected - 1)
+            elif key in (pygame.K_RIGHT, pygame.K_d):
+                self.selected = min(n - 1, self.selected + 1)
+        return self.selected != before
+
+    def _compose(self, layout: ChoiceLayout) -> list:
+        """One tight text surface per option, in the current selection state."""
+        font = self.dialog.font
+        blits = []
+        for i, (label, pos) in enumerate(zip(layout.labels, layout.positions)):
+            sel = i == self.selected
+            atlas = get_atlas(font, self.COLOR_SELECTED if sel else self.COLOR_IDLE)
+            blits.append((atlas.render(("> " if sel else "  ") + label), pos))
+        return blits
+
+    def draw(self, screen: pygame.Surface):
+        layout = self.layout
+        key = (self._layout_key, self.selected)
+        if key != self._blits_key:
+            self._blits = self._compose(layout)
+            self._blits_key = key
+        screen.blits(self._blits, doreturn=False)
+
+
+# ---------- Bustshot ----------
+class BustshotWidget:
+    """
+    Portrait of the current speaker, bottom-right above the dialogue box.
+    Portraits come from the speaker registry (loaded on first use, scaled copies
+    cached per box top), so drawing is a single blit.
+    """
+    def __init__(self, portraits: PortraitCache = PORTRAITS,
+                 right_margin: int = RIGHT_MARGIN, scale: float = BUSTSHOT_SCALE):
+        self.portraits = portraits
+        self.right_margin = right_margin
+        self.scale = scale
+        self.speaker: Optional[str] = None
+        self._key = None
+        self._surface: Optional[pygame.Surface] = None
+        self._pos = (0, 0)
+
+    def set_speaker(self, speaker: Optional[str]):
+        self.speaker = speaker or None
+
+    def draw(self, screen: pygame.Surface, dialog_top: int):
+        key = (self.speaker, dialog_top, screen.get_width())
+        if key != self._key:
+            self._surface = self.portraits.scaled(self.speaker, dialog_top, self.scale)
+            if self._surface is not None:
+                r = self._surface.get_rect()
+                r.bottom = dialog_top
+                r.right = screen.get_width() - self.right_margin
+                self._pos = r.topleft
+            self._key = key
+        if self._surface is not None:
+            screen.blit(self._surface, self._pos)
+
+
+# ---------- Central HUD (Trust / PoliceGap) ----------
+_HUD_FONT: pygame.font.Font | None = None
+
+def get_hud_font() -> pygame.font.Font:
+    global _HUD_FONT
+    if _HUD_FONT is None:
+        try:
+            _HUD_FONT = pygame.font.Font(str(FONT_PATH), 22)
+        except Exception:
+            _HUD_FONT = pygame.font.SysFont("monospace", 18)
+    return _HUD_FONT
+
+
+def trust_color(v):
+    # Trust : <=40 rouge ; 40<=v<50 orange ; >=50 vert
+    if v <= 40:
+        return (200, 0, 0)      # rouge
+    elif v <= 50:
+        return (230, 160, 0)    # orange
+    else:
+        return (0, 200, 0)      # vert
+
+
+def police_gap_color(v):
+    # PoliceGap : <=3 rouge ; 3<v<5 orange ; >5 vert
+    if v <= 3:
+        return (200, 0, 0)      # rouge
+    elif v <= 5:
+        return (230, 160, 0)    # orange
+    else:
+        return (0, 200, 0)      # vert
+
+
+class HudWidget:
+    """Trust / PoliceGap labels, re-rendered only when the values change."""
+    TRUST_POS = (12, 8)
+    POLICE_POS = (300, 8)   # position demandée
+
+    def __init__(self):
+        self._key = None
+        self._trust: Optional[pygame.Surface] = None
+        self._police: Optional[pygame.Surface] = None
+
+    def draw(self, screen: pygame.Surface, gvars):
+        key = (gvars.trust, gvars.police_gap)
+        if key != self._key:
+            font = get_hud_font()
+            self._trust = render_text(font, f"Trust: {gvars.trust}", True, trust_color(gvars.trust))
+            self._police = render_text(font, f"PoliceGap: {gvars.police_gap}", True,
+                                       police_gap_color(gvars.police_gap))
+            self._key = key
+        screen.blit(self._trust, self.TRUST_POS)
+        screen.blit(self._police, self.POLICE_POS)
@@ -1,6 +1,9 @@
 import os
 from pathlib import Path
 import pygame
+from core.glyph_atlas import get_atlas, get_metrics
+from core.nine_slice import NineSlice
+from core.assets import ASSETS
 
 TILE = 16
 
@@ -8,9 +11,7 @@ def _to_str(p) -> str:
     return str(p) if isinstance(p, (Path,)) else p
 
 def load_image(path):
-    path = _to_str(path)
-    img = pygame.image.load(path).convert_alpha()
-    return img
+    return ASSETS.image(_to_str(path))
 
 class TiledBoxRenderer:
     def __init__(self, corner_img_path, edge_img_path, tile_size: int = TILE):
@@ -32,38 +33,46 @@ class TiledBoxRenderer:
         self.edge_bottom = pygame.transform.rotate(self.edge, -180)
         self.edge_left   = pygame.transform.rotate(self.edge, -270)
 
+        # One 9-slice per fill color; each caches its composed boxes per size
+        self._slices: dict[tuple, NineSlice] = {}
+
+    def nine_slice(self, fill_color=(34, 34, 34)) -> NineSlice:
+        """3x3-tile source (corners, edges, filled center) as a reusable 9-slice."""
+        key = tuple(pygame.Color(fill_color))
+        sl = self._slices.get(key)
+        if sl is None:
+            t = self.tile
+            src = pygame.Surface((3 * t, 3 * t), pygame.SRCALPHA)
+            src.fill(fill_color, pygame.Rect(t, t, t, t))
+            src.blit(self.corner_tl, (0, 0))
+            src.blit(self.corner_tr, (2 * t, 0))
+            src.blit(self.corner_bl, (0, 2 * t))
+            src.blit(self.corner_br, (2 * t, 2 * t))
+            src.blit(self.edge_top, (t, 0))
+            src.blit(self.edge_bottom, (t, 2 * t))
+            src.blit(self.edge_left, (0, t))
+            src.blit(self.edge_right, (2 * t, t))
+            sl = self._slices[key] = NineSlice(src, t, t, t, t)
+        return sl
+
+    def compose(self, w: int, h: int, fill_color=(34, 34, 34)) -> pygame.Surface:
+        """The whole bordered box as one cached surface."""
+        return self.nine_slice(fill_color).render(w, h)
+
     def draw(self, surface: pygame.Surface, rect: pygame.Rect, fill_color=(34, 34, 34)):
         x, y, w, h = rect
         t = self.tile
         if w < t * 2 or h < t * 2:
             return
-
-        # Fill interior (inside borders)
-        inner = pygame.Rect(x + t, y + t, w - 2 * t, h - 2 * t)
-        pygame.draw.rect(surface, fill_color, inner)
-
-        # Corners
-        surface.blit(self.corner_tl, (x, y))
-        surface.blit(self.corner_tr, (x + w - t, y))
-        surface.blit(self.corner_bl, (x, y + h - t))
-        surface.blit(self.corner_br, (x + w - t, y + h - t))
-
-        # Edges horizontal
-        for ix in range(x + t, x + w - t, t):
-            surface.blit(self.edge_top, (ix, y))
-            surface.blit(self.edge_bottom, (ix, y + h - t))
-
-        # Edges vertical
-        for iy in range(y + t, y + h - t, t):
-            surface.blit(self.edge_left, (x, iy))
-            surface.blit(self.edge_right, (x + w - t, iy))
+        surface.blit(self.compose(w, h, fill_color), (x, y))
 
 def wrap_text(text: str, font: pygame.font.Font, max_width: int):
+    measure = get_metrics(font).width   # len * advance for the pixel font
     words = text.split()
     lines, line = [], ""
     for w in words:
         cand = w if not line else f"{line} {w}"
-        if font.size(cand)[0] <= max_width:
+        if measure(cand) <= max_width:
             line = cand
         else:
             if line:
@@ -79,6 +88,9 @@ class DialogueBox:
       - computing the box rect from font/line-height + paddings (3 lines/page)
       - wrapping & paginating text (3 lines/page)
       - drawing the tile-built box and current lines
+      - optional typewriter reveal (typewriter_cps > 0): update(dt_ms) reveals glyphs,
+        skip_reveal() shows the rest of the page; only newly revealed glyphs are drawn,
+        into a persistent page surface
     """
     def __init__(
         self,
@@ -94,7 +106,8 @@ class DialogueBox:
         corner_img_path,
         edge_img_path,
         tile: int = TILE,
-        fill_color=(34, 34, 34)
+        fill_color=(34, 34, 34),
+        typewriter_cps: float = 0.0
     ):
         self.tile = tile
         self.fill_color = fill_color
@@ -119,6 +132,13 @@ class DialogueBox:
         self._lines = []
         self.i_top = 0 
 
+        # Typewriter state (0 cps = whole page at once)
+        self.typewriter_cps = float(typewriter_cps)
+        self._revealed = 0.0        # glyphs revealed on the current page
+        self._drawn = 0             # glyphs already drawn into _page
+        self._page: pygame.Surface | None = None
+        self._page_color = None
+
         self.box_rect = pygame.Rect(0, 0, 0, 0)
         self.text_left = 0
         self.text_right = 0
@@ -146,6 +166,10 @@ class DialogueBox:
         self.text_top   = self.box_rect.top + self.tile + self.padding_top
         self.text_width = max(0, self.text_right - self.text_left)
 
+        page_h = self.lines_per_page * self.font_h + (self.lines_per_page - 1) * self.line_gap
+        self._page = pygame.Surface((max(1, self.text_width), max(1, page_h)), pygame.SRCALPHA)
+        self._reset_page()
+
         # If we already had text, rewrap to the new width
         if self._lines:
             joined = " ".join(self._lines)
@@ -155,25 +179,68 @@ class DialogueBox:
     def set_text(self, text: str):
         self._lines = wrap_text(text, self.font, self.text_width)
         self.i_top = 0
+        self._reset_page()
 
     def advance(self) -> bool:
         """Advance to next page (3 lines). Returns True if we reached the end and should close."""
         if (self.i_top + self.lines_per_page) >= len(self._lines):
             return True  # done
         self.i_top += self.lines_per_page
+        self._reset_page()
         return False
 
+    # ---------- Typewriter ----------
+    def _page_lines(self):
+        return self._lines[self.i_top:self.i_top + self.lines_per_page]
+
+    def _page_glyphs(self) -> int:
+        return sum(len(line) for line in self._page_lines())
+
+    def _reset_page(self):
+        self._revealed = 0.0 if self.typewriter_cps > 0 else float("inf")
+        self._drawn = 0
+        if self._page is not None:
+            self._page.fill((0, 0, 0, 0))
+
+    def update(self, dt_ms: int):
+        if self.typewriter_cps > 0 and self.is_revealing():
+            self._revealed += self.typewriter_cps * dt_ms / 1000.0
+
+    def is_revealing(self) -> bool:
+        return self._revealed < self._page_glyphs()
+
+    def skip_reveal(self):
+        self._revealed = float("inf")
+
+    def _draw_new_glyphs(self, color):
+        """Draw glyphs [_drawn, revealed) of the current page into the page surface."""
+        if color != self._page_color:
+            self._page_color = color
+            self._page.fill((0, 0, 0, 0))
+            self._drawn = 0
+        total = self._page_glyphs()
+        target = total if self._revealed >= total else int(self._revealed)
+        if target <= self._drawn:
+            return
+
+        atlas = get_atlas(self.font, color)
+        measure = atlas.metrics.width
+        start = 0   # index of the first glyph of the line within the page
+        y = 0
+        for line in self._page_lines():
+            end = start + len(line)
+            if end > self._drawn and start < target:
+                a = max(self._drawn, start) - start
+                b = min(target, end) - start
+                atlas.draw(self._page, line[a:b], (measure(line[:a]), y))
+            if end >= target:
+                break
+            start = end
+            y += self.font_h + self.line_gap
+        self._drawn = target
+
     def draw(self, surface: pygame.Surface, color=(255, 255, 255)):
         """Draw the box and up to 3 current lines."""
         self.renderer.draw(surface, self.box_rect, fill_color=self.fill_color)
-
-        y = self.text_top
-        for i in range(self.lines_per_page):
-            idx = self.i_top + i
-            if 0 <= idx < len(self._lines):
-                surf = self.font.render(self._lines[idx], True, color)
-                surface.blit(surf, (self.text_left, y))
-                if i < self.lines_per_page - 1:
-                    y += self.font_h + self.line_gap
-            else:
-                break
+        self._draw_new_glyphs(tuple(color))
+        surface.blit(self._page, (self.text_left, self.text_top))
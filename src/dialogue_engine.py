@@ -1,11 +1,16 @@
 from __future__ import annotations
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Mapping, Optional, Tuple
 import random, math
 from core.config import (
     FOLLOW_THRESHOLD,
     FOLLOW_SIGMOID_K, FOLLOW_PROB_FLOOR, FOLLOW_PROB_CEIL
 )
+from dialogue_graph import (
+    DialogueGraph, Node, compile_scene, two_way_index, three_way_index, NO_SELECTION, KIND_BY_TYPE,
+    LINE, CHOICE, BRANCH_CORRECT, BRANCH_3WAY, DECISION_FOLLOW, DECISION_FOLLOW_3WAY,
+    EFFECTS, GOTO, WAIT_SCENE, END,
+)
 
 # ---------------- Game variables ----------------
 @dataclass
@@ -23,13 +28,16 @@ class GameVars:
 # ---------------- Runner ----------------
 class DialogueRunner:
     """
+    Runs a scene compiled by dialogue_graph.compile_scene (validated once, cached).
+
     Supported node types:
       - line: {type,speaker,text,next}
       - choice: {type,prompt,options:[{id,label,lines?,correct?}],choice_speaker?,next}
       - branch_choice_correct: {type, if_correct, if_wrong}
       - branch_choice_3way: {type, if_correct, if_wrong, if_neutral}
-      - decision_follow: {type, if_follow_and_correct, if_follow_and_wrong}
-      - decision_follow_3way: {type, if_follow_and_correct, if_follow_and_wrong, if_ignore_and_correct, if_ignore_and_wrong}
+      - decision_follow: {type, if_follow_and_correct, if_follow_and_wrong, if_ignore_and_correct, if_ignore_and_wrong}
+      - decision_follow_3way: {type, if_follow_correct, if_follow_wrong, if_follow_neutral,
+                               if_ignore_correct, if_ignore_wrong, if_ignore_neutral}
       - effects: {type,effects,next}
       - goto: {type,next}
       - wait_scene: {type,event,next}
@@ -38,21 +46,41 @@ class DialogueRunner:
 
     def __init__(self, scene: Dict[str, Any], gvars: GameVars, rng_seed: Optional[int] = None):
         self.scene = scene
-        self.nodes: Dict[str, Dict[str, Any]] = scene["nodes"]
-        self.current_id: str = scene["start"]
+        self.graph: DialogueGraph = compile_scene(scene)
+        self.nodes = self.graph.nodes
+        self.current: int = self.graph.start
         self.gvars = gvars
-        self.selected: Optional[Dict[str, Any]] = None  # last choice option dict
+        self.selected: Optional[Mapping[str, Any]] = None  # last choice option (read-only)
+        self._selected_tag: int = NO_SELECTION
         self._buffer: List[Tuple[str, str]] = []        # (speaker, text)
-        self._pending_choice: Optional[Dict[str, Any]] = None
+        self._pending_choice: Optional[Node] = None
         self.finished = False
         self.random = random.Random(rng_seed)
 
         # wait_scene state
         self._waiting_event: Optional[str] = None
-        self._waiting_next: Optional[str] = None
+        self._waiting_next: Optional[int] = None
+
+        # Handler table, indexed by node kind
+        handlers = [None] * len(KIND_BY_TYPE)
+        handlers[LINE] = self._on_line
+        handlers[CHOICE] = self._on_choice
+        handlers[BRANCH_CORRECT] = self._on_branch_correct
+        handlers[BRANCH_3WAY] = self._on_branch_3way
+        handlers[DECISION_FOLLOW] = self._on_decision_follow
+        handlers[DECISION_FOLLOW_3WAY] = self._on_decision_follow_3way
+        handlers[EFFECTS] = self._on_effects
+        handlers[GOTO] = self._on_goto
+        handlers[WAIT_SCENE] = self._on_wait_scene
+        handlers[END] = self._on_end
+        self._handlers = tuple(handlers)
 
         self._advance_until_prompt()
 
+    @property
+    def current_id(self) -> str:
+        return self.nodes[self.current].id
+
     # ---------- Public API ----------
     def is_waiting_for_choice(self) -> bool:
         return self._pending_choice is not None
@@ -69,8 +97,8 @@ class DialogueRunner:
     def notify_event_done(self, event_name: str):
         if self._waiting_event == event_name:
             self._waiting_event = None
-            if self._waiting_next:
-                self.current_id = self._waiting_next
+            if self._waiting_next is not None:
+                self.current = self._waiting_next
                 self._waiting_next = None
             self._advance_until_prompt()
 
@@ -78,24 +106,16 @@ class DialogueRunner:
         """Returns current prompt or None (including while waiting for a scene event)."""
         if self.finished:
             return None
+        if not self._buffer and self._pending_choice is None:
+            self._advance_until_prompt()
         if self._buffer:
             speaker, text = self._buffer[0]
             return {"type": "lines", "speaker": speaker, "text": text}
-        if self._pending_choice:
-            return {
-                "type": "choice",
-                "prompt": self._pending_choice.get("prompt", ""),
-                "options": [opt.get("label", opt.get("text", "")) for opt in self._pending_choice["options"]],
-            }
-        self._advance_until_prompt()
-        if self._buffer:
-            speaker, text = self._buffer[0]
-            return {"type": "lines", "speaker": speaker, "text": text}
-        if self._pending_choice:
+        if self._pending_choice is not None:
             return {
                 "type": "choice",
-                "prompt": self._pending_choice.get("prompt", ""),
-                "options": [opt.get("label", opt.get("text", "")) for opt in self._pending_choice["options"]],
+                "prompt": self._pending_choice.prompt,
+                "options": [opt.label for opt in self._pending_choice.options],
             }
         return None
 
@@ -107,120 +127,82 @@ class DialogueRunner:
 
     def submit_choice(self, index: int):
         """User confirmed a choice (called by the UI). Only here we enqueue option 'lines'."""
-        if not self._pending_choice:
-            return
         node = self._pending_choice
-        options = node["options"]
+        if node is None:
+            return
+        options = node.options
         index = max(0, min(index, len(options) - 1))
-        self.selected = options[index]
-
-        post_lines = self.selected.get("lines")
-        if post_lines:
-            speaker = node.get("choice_speaker", "Acolyte")
-            if isinstance(post_lines, str):
-                self._buffer.append((speaker, post_lines))
-            else:
-                for line in post_lines:
-                    self._buffer.append((speaker, line))
-
-        next_id = node.get("next")
+        option = options[index]
+        self.selected = option.raw
+        self._selected_tag = option.tag
+
+        for line in option.lines:
+            self._buffer.append((node.choice_speaker, line))
+
         self._pending_choice = None
-        if next_id:
-            self.current_id = next_id
+        self.current = node.succ[0]
         self._advance_until_prompt()
 
     # ---------- Internals ----------
-    def _push_lines(self, speaker: str, text: Any):
-        if isinstance(text, str):
-            self._buffer.append((speaker, text))
-        else:
-            for t in text:
-                self._buffer.append((speaker, t))
-
     def _advance_until_prompt(self):
-        while not self.finished and not self._buffer and not self._pending_choice and not self._waiting_event:
-            node = self.nodes[self.current_id]
-            ntype = node["type"]
-
-            if ntype == "line":
-                self._push_lines(node.get("speaker",""), node["text"])
-                self.current_id = node.get("next", self.current_id)
-
-            elif ntype == "choice":
-                self._pending_choice = node
-                break
-
-            elif ntype == "branch_choice_correct":
-                is_correct = bool(self.selected and self.selected.get("correct", False))
-                self.current_id = node["if_correct"] if is_correct else node["if_wrong"]
-
-            elif ntype == "decision_follow":
-                advice_ok = bool(self.selected and self.selected.get("correct", False))
-                follows = self._tony_follows(self.gvars.trust)
-                if follows and advice_ok:
-                    self.current_id = node["if_follow_and_correct"]
-                elif follows and not advice_ok:
-                    self.current_id = node["if_follow_and_wrong"]
-                elif (not follows) and advice_ok:
-                    self.current_id = node["if_ignore_and_correct"]
-                else:
-                    self.current_id = node["if_ignore_and_wrong"]
-
-            elif ntype == "effects":
-                self.gvars.apply_effects(node.get("effects", {}))
-                self.current_id = node.get("next", self.current_id)
-
-            elif ntype == "goto":
-                self.current_id = node["next"]
-
-            elif ntype == "wait_scene":
-                self._waiting_event = node["event"]
-                self._waiting_next = node["next"]
-                break
-
-            elif ntype == "end":
-                self.finished = True
-                break
-
-            elif ntype == "branch_choice_3way":
-                # self.selected["correct"] peut être True / False / "neutral"
-                tag = (self.selected or {}).get("correct", False)
-                if tag is True:
-                    self.current_id = node["if_correct"]
-                elif tag == "neutral":
-                    self.current_id = node["if_neutral"]
-                else:
-                    self.current_id = node["if_wrong"]
-
-            elif ntype == "decision_follow_3way":
-                # follow/ignore selon la confiance, puis branche 3 voies
-                tag = (self.selected or {}).get("correct", False)  # True / False / "neutral"
-                follows = self._tony_follows(self.gvars.trust)
-
-                if follows:
-                    if tag is True:
-                        self.current_id = node["if_follow_correct"]
-                    elif tag == "neutral":
-                        self.current_id = node["if_follow_neutral"]
-                    else:
-                        self.current_id = node["if_follow_wrong"]
-                else:
-                    if tag is True:
-                        self.current_id = node["if_ignore_correct"]
-                    elif tag == "neutral":
-                        self.current_id = node["if_ignore_neutral"]
-                    else:
-                        self.current_id = node["if_ignore_wrong"]
-
-            else:
-                raise ValueError(f"Unsupported node type: {ntype}")
+        nodes = self.nodes
+        handlers = self._handlers
+        while not self.finished and not self._buffer and self._pending_choice is None and self._waiting_event is None:
+            node = nodes[self.current]
+            handlers[node.kind](node)
+
+    def _on_line(self, node: Node):
+        for text in node.lines:
+            self._buffer.append((node.speaker, text))
+        self.current = node.succ[0]
+
+    def _on_choice(self, node: Node):
+        self._pending_choice = node
+
+    def _on_branch_correct(self, node: Node):
+        self.current = node.succ[two_way_index(self._selected_tag)]
+
+    def _on_branch_3way(self, node: Node):
+        # option "correct" may be True / False / "neutral"
+        self.current = node.succ[three_way_index(self._selected_tag)]
+
+    def _on_decision_follow(self, node: Node):
+        follows = self._tony_follows(self.gvars.trust)
+        self.current = node.succ[(0 if follows else 2) + two_way_index(self._selected_tag)]
+
+    def _on_decision_follow_3way(self, node: Node):
+        # follow/ignore from trust, then a 3-way branch on the advice
+        follows = self._tony_follows(self.gvars.trust)
+        self.current = node.succ[(0 if follows else 3) + three_way_index(self._selected_tag)]
+
+    def _on_effects(self, node: Node):
+        self.gvars.apply_effects(dict(node.effects))
+        self.current = node.succ[0]
+
+    def _on_goto(self, node: Node):
+        self.current = node.succ[0]
+
+    def _on_wait_scene(self, node: Node):
+        self._waiting_event = node.event
+        self._waiting_next = node.succ[0]
+
+    def _on_end(self, node: Node):
+        self.finished = True
 
     def _tony_follows(self, trust: int) -> bool:
         """
         Soft decision: probability to follow grows with trust, centered at FOLLOW_THRESHOLD.
         Uses a clamped logistic so there’s always a small chance to do the opposite.
         """
-        x = trust - FOLLOW_THRESHOLD
-        p = 1.0 / (1.0 + math.exp(-FOLLOW_SIGMOID_K * x))         # 0..1 around 0.5 at threshold
-        p = FOLLOW_PROB_FLOOR + (FOLLOW_PROB_CEIL - FOLLOW_PROB_FLOOR) * p  # clamp tails
-        return self.random.random() < p
\ No newline at end of file
+        return self.random.random() < follow_probability(trust)
+
+
+def follow_probability(trust: float,
+                       threshold: float = FOLLOW_THRESHOLD,
+                       k: float = FOLLOW_SIGMOID_K,
+                       floor: float = FOLLOW_PROB_FLOOR,
+                       ceil: float = FOLLOW_PROB_CEIL) -> float:
+    """Probability that Tony follows the advice at a given trust (clamped logistic)."""
+    x = trust - threshold
+    p = 1.0 / (1.0 + math.exp(-k * x))         # 0..1 around 0.5 at threshold
+    return floor + (ceil - floor) * p          # clamp tails
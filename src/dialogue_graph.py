@@ -0,0 +1,255 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+# ======================================================
+# Compiled dialogue graph
+#
+# compile_scene() turns a raw scene dict ({"id", "start", "nodes": {...}}) into an
+# immutable graph: integer node indices, slotted node records with resolved
+# successor indices, and an integer node kind the runner dispatches on.
+# Everything the runtime used to discover mid-playthrough (unknown types, missing
+# or dangling targets, loops that never reach a prompt) is rejected here instead.
+# ======================================================
+
+class DialogueGraphError(ValueError):
+    """Raised when a scene dict can't be compiled into a valid graph."""
+
+
+# Node kinds (index into the runner's handler table)
+LINE, CHOICE, BRANCH_CORRECT, BRANCH_3WAY, DECISION_FOLLOW, DECISION_FOLLOW_3WAY, \
+    EFFECTS, GOTO, WAIT_SCENE, END = range(10)
+
+KIND_BY_TYPE = {
+    "line": LINE,
+    "choice": CHOICE,
+    "branch_choice_correct": BRANCH_CORRECT,
+    "branch_choice_3way": BRANCH_3WAY,
+    "decision_follow": DECISION_FOLLOW,
+    "decision_follow_3way": DECISION_FOLLOW_3WAY,
+    "effects": EFFECTS,
+    "goto": GOTO,
+    "wait_scene": WAIT_SCENE,
+    "end": END,
+}
+
+# Successor keys per kind, in the order stored in Node.succ
+SUCCESSOR_KEYS = {
+    LINE:                 ("next",),
+    CHOICE:               ("next",),
+    BRANCH_CORRECT:       ("if_correct", "if_wrong"),
+    BRANCH_3WAY:          ("if_correct", "if_wrong", "if_neutral"),
+    DECISION_FOLLOW:      ("if_follow_and_correct", "if_follow_and_wrong",
+                           "if_ignore_and_correct", "if_ignore_and_wrong"),
+    DECISION_FOLLOW_3WAY: ("if_follow_correct", "if_follow_wrong", "if_follow_neutral",
+                           "if_ignore_correct", "if_ignore_wrong", "if_ignore_neutral"),
+    EFFECTS:              ("next",),
+    GOTO:                 ("next",),
+    WAIT_SCENE:           ("next",),
+    END:                  (),
+}
+
+# Kinds that never stop the runner: a cycle made only of these would spin forever
+SILENT_KINDS = frozenset({BRANCH_CORRECT, BRANCH_3WAY, DECISION_FOLLOW, DECISION_FOLLOW_3WAY, EFFECTS, GOTO})
+
+# Option "correct" tags, normalized
+TAG_CORRECT, TAG_WRONG, TAG_NEUTRAL, TAG_TRUTHY = range(4)
+NO_SELECTION = TAG_WRONG   # no option chosen yet behaves like a wrong answer
+
+
+def tag_code(value: Any) -> int:
+    """True / falsy / "neutral" / any other truthy value (kept apart: 2-way and 3-way read them differently)."""
+    if value is True:
+        return TAG_CORRECT
+    if value == "neutral":
+        return TAG_NEUTRAL
+    return TAG_TRUTHY if value else TAG_WRONG
+
+
+def two_way_index(tag: int) -> int:
+    """0 = correct, 1 = wrong, for branch_choice_correct / decision_follow (truthiness)."""
+    return 1 if tag == TAG_WRONG else 0
+
+
+def three_way_index(tag: int) -> int:
+    """0 = correct, 1 = wrong, 2 = neutral, for the *_3way nodes (only `True` counts as correct)."""
+    if tag == TAG_CORRECT:
+        return 0
+    return 2 if tag == TAG_NEUTRAL else 1
+
+
+@dataclass(frozen=True, slots=True)
+class Option:
+    label: str
+    tag: int
+    lines: Tuple[str, ...]
+    raw: Mapping[str, Any]                      # read-only copy of the option dict
+
+
+@dataclass(frozen=True, slots=True)
+class Node:
+    index: int
+    id: str
+    kind: int
+    succ: Tuple[int, ...]                       # resolved successors, see SUCCESSOR_KEYS
+    speaker: str = ""
+    lines: Tuple[str, ...] = ()                 # line text(s)
+    prompt: str = ""
+    options: Tuple[Option, ...] = ()
+    choice_speaker: str = "Acolyte"
+    effects: Tuple[Tuple[str, int], ...] = ()
+    event: str = ""
+
+
+@dataclass(frozen=True, slots=True)
+class DialogueGraph:
+    scene_id: str
+    start: int
+    nodes: Tuple[Node, ...]
+    index_of: Mapping[str, int]
+
+    def node(self, node_id: str) -> Node:
+        return self.nodes[self.index_of[node_id]]
+
+
+def _as_lines(text: Any) -> Tuple[str, ...]:
+    if text is None:
+        return ()
+    if isinstance(text, str):
+        return (text,)
+    return tuple(text)
+
+
+def _find_silent_cycle(nodes: List[Node]) -> Optional[List[str]]:
+    """Iterative DFS over silent nodes only; returns the node ids of one cycle, if any."""
+    WHITE, GREY, BLACK = 0, 1, 2
+    color = [WHITE] * len(nodes)
+    for root in range(len(nodes)):
+        if color[root] != WHITE or nodes[root].kind not in SILENT_KINDS:
+            continue
+        stack = [(root, iter(nodes[root].succ))]
+        path = [root]
+        color[root] = GREY
+        while stack:
+            i, it = stack[-1]
+            nxt = next(it, None)
+            if nxt is None:
+                color[i] = BLACK
+                stack.pop()
+                path.pop()
+                continue
+            if nodes[nxt].kind not in SILENT_KINDS:
+                continue
+            if color[nxt] == GREY:
+                return [nodes[j].id for j in path[path.index(nxt):]] + [nodes[nxt].id]
+            if color[nxt] == WHITE:
+                color[nxt] = GREY
+                stack.append((nxt, iter(nodes[nxt].succ)))
+                path.append(nxt)
+    return None
+
+
+def compile_scene(scene: Dict[str, Any]) -> DialogueGraph:
+    """
+    Validate and compile a raw scene dict. Compiled graphs are cached per scene object,
+    so calling this again (every run_scene) is free.
+    Raises DialogueGraphError listing every problem found.
+    """
+    cached = _COMPILED.get(id(scene))
+    if cached is not None and cached[0] is scene:
+        return cached[1]
+
+    scene_id = str(scene.get("id", "?"))
+    raw_nodes: Dict[str, Dict[str, Any]] = scene.get("nodes") or {}
+    index_of = {node_id: i for i, node_id in enumerate(raw_nodes)}
+    errors: List[str] = []
+
+    start_id = scene.get("start")
+    if start_id not in index_of:
+        errors.append(f"start node {start_id!r} does not exist")
+
+    nodes: List[Node] = []
+    for i, (node_id, raw) in enumerate(raw_nodes.items()):
+        ntype = raw.get("type")
+        kind = KIND_BY_TYPE.get(ntype)
+        if kind is None:
+            errors.append(f"{node_id}: unsupported node type {ntype!r}")
+            nodes.append(Node(i, node_id, END, ()))
+            continue
+
+        succ = []
+        for key in SUCCESSOR_KEYS[kind]:
+            target = raw.get(key)
+            if target is None:
+                errors.append(f"{node_id}: missing {key!r}")
+                succ.append(i)
+            elif target not in index_of:
+                errors.append(f"{node_id}: {key!r} points to unknown node {target!r}")
+                succ.append(i)
+            else:
+                succ.append(index_of[target])
+
+        fields: Dict[str, Any] = {}
+        if kind == LINE:
+            fields["speaker"] = raw.get("speaker", "")
+            fields["lines"] = _as_lines(raw.get("text"))
+            if not fields["lines"]:
+                errors.append(f"{node_id}: line without text")
+        elif kind == CHOICE:
+            opts = raw.get("options") or []
+            if not opts:
+                errors.append(f"{node_id}: choice without options")
+            fields["prompt"] = raw.get("prompt", "")
+            fields["choice_speaker"] = raw.get("choice_speaker", "Acolyte")
+            fields["options"] = tuple(
+                Option(
+                    label=opt.get("label", opt.get("text", "")),
+                    tag=tag_code(opt.get("correct", False)),
+                    lines=_as_lines(opt.get("lines")),
+                    raw=MappingProxyType(dict(opt)),
+                )
+                for opt in opts
+            )
+        elif kind == EFFECTS:
+            effects = []
+            for k, v in (raw.get("effects") or {}).items():
+                try:
+                    effects.append((k, int(v)))
+                except (TypeError, ValueError):
+                    errors.append(f"{node_id}: effect {k!r} is not an integer ({v!r})")
+            fields["effects"] = tuple(effects)
+        elif kind == WAIT_SCENE:
+            fields["event"] = raw.get("event") or ""
+            if not fields["event"]:
+                errors.append(f"{node_id}: wait_scene without 'event'")
+
+        nodes.append(Node(i, node_id, kind, tuple(succ), **fields))
+
+    if not errors:
+        cycle = _find_silent_cycle(nodes)
+        if cycle:
+            errors.append("cycle never reaches a prompt: " + " -> ".join(cycle))
+
+    if errors:
+        raise DialogueGraphError(f"scene {scene_id!r}:\n  " + "\n  ".join(errors))
+
+    graph = DialogueGraph(scene_id, index_of[start_id], tuple(nodes), MappingProxyType(index_of))
+    _COMPILED[id(scene)] = (scene, graph)
+    return graph
+
+
+def compile_scenes(*scenes: Dict[str, Any]) -> List[DialogueGraph]:
+    """Compile several scenes, reporting the problems of all of them at once."""
+    graphs, errors = [], []
+    for scene in scenes:
+        try:
+            graphs.append(compile_scene(scene))
+        except DialogueGraphError as e:
+            errors.append(str(e))
+    if errors:
+        raise DialogueGraphError("\n".join(errors))
+    return graphs
+
+
+_COMPILED: Dict[int, Tuple[Dict[str, Any], DialogueGraph]] = {}
@@ -0,0 +1,220 @@
+from __future__ import annotations
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import pygame
+
+from core.config import BAKE_MANIFEST_PATH, BAKED_ASSETS_DIR, SPRITE_SHEETS_PATH
+from core.assets import (
+    BAKE_VERSION, AssetManager, asset_name, file_sha1, resolve_asset, variant_name,
+)
+from core.sprite_atlas import ShelfPacker
+from core.sprite_sheet import frame_name, get_sheet, sheet_specs
+
+# ======================================================
+# Offline asset bake
+#
+# Reads the manifest of runtime sizes / flips (assets/bake_manifest.json), builds
+# each variant exactly as the game does (same AssetManager code path: decode,
+# convert, scale, flip) and writes the final pixels raw into .cache/baked, with an
+# index recording each source's sha1. Variants of the manifest's "atlas" sources
+# are shelf-packed into a few sprite atlas pages instead of one file each, along
+# with the sprite-sheet frames of the manifest's "sheets" (sheet -> heights).
+# At runtime core.assets (and core.sprite_atlas) load them with
+# pygame.image.frombuffer instead of decoding and scaling the PNGs, as long as
+# the source hashes still match; anything else falls back silently.
+#
+#   python src/game/bake_assets.py
+#   python src/game/bake_assets.py --check      # exit 1 if the bake is stale
+# ======================================================
+
+INDEX_NAME = "index.json"
+
+
+def load_manifest(path: Path = BAKE_MANIFEST_PATH) -> Tuple[Dict[str, List[Dict[str, Any]]], List[str],
+                                                             Dict[str, List[int]]]:
+    """
+    (images: source -> list of load_image options, atlas: sources packed into the
+    sprite atlas, sheets: sprite sheet -> frame heights packed into the atlas)
+    """
+    data = json.loads(Path(path).read_text(encoding="utf-8"))
+    if data.get("version") != BAKE_VERSION:
+        raise ValueError(f"{path}: unsupported manifest version {data.get('version')!r}")
+    images = data.get("images", {})
+    for name, variants in images.items():
+        for opts in variants:
+            if "size" in opts:
+                opts["size"] = tuple(opts["size"])
+    atlas = list(data.get("atlas", []))
+    unknown = [n for n in atlas if n not in images]
+    if unknown:
+        raise ValueError(f"{path}: atlas sources without variants: {', '.join(unknown)}")
+    sheets = {name: [int(h) for h in heights] for name, heights in data.get("sheets", {}).items()}
+    unknown = [n for n in sheets if n not in sheet_specs()]
+    if unknown:
+        raise ValueError(f"{path}: unknown sprite sheets: {', '.join(unknown)}")
+    return images, atlas, sheets
+
+
+def _raw_format(convert: Optional[str]) -> str:
+    return "RGB" if convert == "opaque" else "RGBA"
+
+
+def _write_atomic(path: Path, data: bytes):
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def bake(images: Dict[str, List[Dict[str, Any]]], atlas: List[str] = (), sheets: Dict[str, List[int]] = None,
+         out_dir: Path = BAKED_ASSETS_DIR, verbose: bool = True) -> Dict[str, Any]:
+    """Bake every manifest variant into out_dir; returns the written index."""
+    out_dir.mkdir(parents=True, exist_ok=True)
+    mgr = AssetManager(budget_bytes=1 << 62)   # no bake lookups, no eviction
+    index: Dict[str, Any] = {"version": BAKE_VERSION, "sources": {}, "entries": {}}
+    packed: List[Tuple[str, pygame.Surface]] = []
+    total = 0
+
+    for name, variants in images.items():
+        fpath = resolve_asset(name)
+        try:
+            size = mgr.source_size(fpath)
+        except Exception as e:
+            print(f"skip {name}: {e}", file=sys.stderr)
+            continue
+        index["sources"][asset_name(fpath)] = {"sha1": file_sha1(fpath), "size": list(size)}
+
+        for opts in variants:
+            key = mgr.key_for(fpath, **opts)
+            surf = mgr.image(fpath, **opts)
+            vname = variant_name(key)
+            if name in atlas:
+                packed.append((vname, surf))
+                continue
+            fmt = _raw_format(key[3])
+            fname = hashlib.sha1(vname.encode()).hexdigest()[:20] + ".raw"
+            data = pygame.image.tobytes(surf, fmt)
+            _write_atomic(out_dir / fname, data)
+            index["entries"][vname] = {"file": fname, "size": list(surf.get_size()), "format": fmt}
+            total += len(data)
+            if verbose:
+                print(f"  {vname:<64} {len(data) / 1024:8.1f} KiB")
+
+    atlas_sources = [n for n in atlas if asset_name(resolve_asset(n)) in index["sources"]]
+    for name, heights in (sheets or {}).items():
+        # Same frames as SpriteSheet.scaled_clip; the sheet image and its metadata
+        # are recorded as sources so editing either invalidates the pages
+        sheet = get_sheet(name)
+        for src in (resolve_asset(sheet.spec.image), str(SPRITE_SHEETS_PATH)):
+            rec = {"sha1": file_sha1(src)}
+            if src != str(SPRITE_SHEETS_PATH):
+                rec["size"] = list(sheet.surface.get_size())
+            index["sources"][asset_name(src)] = rec
+            if asset_name(src) not in atlas_sources:
+                atlas_sources.append(asset_name(src))
+        for clip in sheet.clip_names:
+            for h in heights:
+                for i, surf in enumerate(sheet.render_clip(clip, h)):
+                    packed.append((frame_name(name, clip, i, h), surf))
+
+    if packed:
+        index["atlas"] = _bake_atlas(packed, atlas_sources, out_dir)
+        total += sum(p["size"][0] * p["size"][1] * 4 for p in index["atlas"]["pages"])
+        if verbose:
+            for p in index["atlas"]["pages"]:
+                print(f"  atlas page {p['file']:<53} {p['size'][0]}x{p['size'][1]}")
+
+    # Drop files of variants no longer in the manifest, then write the index last:
+    # its presence marks the bake as complete
+    keep = {e["file"] for e in index["entries"].values()}
+    keep.update(p["file"] for p in index.get("atlas", {}).get("pages", ()))
+    for f in out_dir.glob("*.raw"):
+        if f.name not in keep:
+            f.unlink()
+    _write_atomic(out_dir / INDEX_NAME, json.dumps(index, indent=1).encode("utf-8"))
+    if verbose:
+        print(f"{len(index['entries'])} variants + {len(packed)} atlas sprites of {len(index['sources'])} "
+              f"sources, {total / (1024 * 1024):.1f} MiB -> {out_dir}")
+    return index
+
+
+def _bake_atlas(sprites: List[Tuple[str, pygame.Surface]], sources: List[str], out_dir: Path) -> Dict[str, Any]:
+    """Shelf-pack the sprites tallest-first into pages cropped to their used height."""
+    packer = ShelfPacker()
+    order = sorted(sprites, key=lambda vs: (-vs[1].get_height(), -vs[1].get_width(), vs[0]))
+    placed = [(vname, surf, packer.insert(*surf.get_size())) for vname, surf in order]
+
+    pages = [pygame.Surface(packer.page_size(i), pygame.SRCALPHA, 32) for i in range(len(packer.pages))]
+    for page in pages:
+        page.fill((0, 0, 0, 0))
+    table: Dict[str, List[int]] = {}
+    for vname, surf, (page, x, y) in placed:
+        # MAX onto the cleared page copies the pixels exactly (no alpha blending)
+        pages[page].blit(surf, (x, y), special_flags=pygame.BLEND_RGBA_MAX)
+        table[vname] = [page, x, y, surf.get_width(), surf.get_height()]
+
+    out = []
+    for i, page in enumerate(pages):
+        fname = f"atlas_{i}.raw"
+        _write_atomic(out_dir / fname, pygame.image.tobytes(page, "RGBA"))
+        out.append({"file": fname, "size": list(page.get_size())})
+    return {"sources": sources, "pages": out, "sprites": table}
+
+
+def stale(images: Dict[str, Any], out_dir: Path = BAKED_ASSETS_DIR) -> List[str]:
+    """Manifest sources whose bake is missing or whose file changed since."""
+    try:
+        index = json.loads((out_dir / INDEX_NAME).read_text(encoding="utf-8"))
+    except Exception:
+        return list(images)
+    sources = index.get("sources", {}) if index.get("version") == BAKE_VERSION else {}
+    out = []
+    for name in images:
+        fpath = resolve_asset(name)
+        rec = sources.get(asset_name(fpath))
+        try:
+            if rec is None or rec.get("sha1") != file_sha1(fpath):
+                out.append(name)
+        except OSError:
+            out.append(name)
+    return out
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Bake runtime-ready sprites into the asset cache.")
+    ap.add_argument("--manifest", type=Path, default=BAKE_MANIFEST_PATH)
+    ap.add_argument("--out", type=Path, default=BAKED_ASSETS_DIR)
+    ap.add_argument("--check", action="store_true", help="only report stale sources (exit 1 if any)")
+    ap.add_argument("--quiet", action="store_true")
+    args = ap.parse_args(argv)
+
+    images, atlas, sheets = load_manifest(args.manifest)
+    if args.check:
+        out = stale(images, args.out)
+        if sheets:
+            out += stale({get_sheet(n).spec.image: [] for n in sheets} | {str(SPRITE_SHEETS_PATH): []}, args.out)
+        for name in out:
+            print(f"stale: {name}")
+        return 1 if out else 0
+
+    # Surfaces are converted like in game, so a (hidden) display is needed
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.display.init()
+    pygame.display.set_mode((1, 1))
+    t0 = time.perf_counter()
+    bake(images, atlas, sheets, args.out, verbose=not args.quiet)
+    print(f"baked in {(time.perf_counter() - t0) * 1000:.0f} ms")
+    pygame.display.quit()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
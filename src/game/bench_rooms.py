@@ -0,0 +1,252 @@
+from __future__ import annotations
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+from core.config import (
+    ASSETS_DIR, CACHE_DIR, FONT_PATH, WIDTH, HEIGHT, TILE, FONT_SIZE, LINE_HEIGHT_FACTOR,
+    PADDING_LEFT, PADDING_RIGHT, PADDING_TOP, PADDING_BOTTOM, CORNER_IMG_PATH, EDGE_IMG_PATH,
+    BOX_FILL_COLOR, TYPEWRITER_CPS, PROJECT_ROOT,
+)
+from core.profiler import percentiles
+from dialogue_engine import GameVars
+from game.campaign import (
+    make_room_airport, make_room_scene1, make_room_scene2, make_room_scene2_street, resolve,
+)
+
+# ======================================================
+# Headless room benchmark
+#
+# Builds every room on the SDL dummy driver, plays a scripted start_event
+# sequence at a fixed dt_ms and times update() and draw() over N frames. The
+# events run back to back (the next one starts when the previous calls on_done);
+# once the script is over, the room keeps running idle until N frames.
+#
+# Each room runs twice from the same seed: a timing pass, then a pass under
+# tracemalloc for the Python allocations per frame (pixel buffers allocated by
+# SDL are not seen by tracemalloc). Rooms that fail to build or run are
+# reported with their error instead of stopping the run.
+#
+#   python src/game/bench_rooms.py                          # -> .cache/bench/<commit>.json
+#   python src/game/bench_rooms.py --frames 300 --room vault --room airport
+#   python src/game/bench_rooms.py --baseline .cache/bench/abc1234.json
+# ======================================================
+
+OUT_DIR = CACHE_DIR / "bench"
+
+
+def make_room_street_legacy(win_w, win_h, gvars):
+    return resolve("scenes.street_room:StreetRoomScene")(
+        win_w=win_w, win_h=win_h,
+        street_asset_dir=ASSETS_DIR / "street",
+        hud_font_path=FONT_PATH,
+        game_vars=gvars
+    )
+
+
+# name -> (room factory, scripted events)
+BENCHES: Dict[str, Tuple[Callable[[int, int, GameVars], Any], Tuple[str, ...]]] = {
+    "vault": (make_room_scene1, ("go_to_medkit", "go_to_door", "press_red_wait", "press_green_open")),
+    "street": (make_room_scene2_street, ("go_to_garage", "drive_away")),
+    "country_house": (make_room_scene2, ("arrival_from_top", "tony_exit_car", "martha_exit_house",
+                                         "martha_step_right", "tony_enter_living", "martha_back_home",
+                                         "night_cut_with_sirens")),
+    "airport": (make_room_airport, ("airport_intro", "airport_run")),
+    "street_legacy": (make_room_street_legacy, ("go_to_garage", "drive_away")),
+}
+
+
+# ---------------- One room ----------------
+def _dialog_top(screen_w: int, screen_h: int) -> int:
+    """Top of the campaign's dialogue box (rooms lay themselves out above it)."""
+    from dialog_ui import DialogueBox
+    dialog = DialogueBox(
+        screen_w=screen_w, screen_h=screen_h,
+        font_path=FONT_PATH, font_size=FONT_SIZE, line_height_factor=LINE_HEIGHT_FACTOR,
+        padding_left=PADDING_LEFT, padding_right=PADDING_RIGHT,
+        padding_top=PADDING_TOP, padding_bottom=PADDING_BOTTOM,
+        corner_img_path=CORNER_IMG_PATH, edge_img_path=EDGE_IMG_PATH, tile=TILE,
+        fill_color=BOX_FILL_COLOR, typewriter_cps=TYPEWRITER_CPS
+    )
+    return dialog.box_rect.top
+
+
+def run_room(factory, events: Sequence[str], screen: pygame.Surface, dialog_top: int,
+             frames: int, dt_ms: int, seed: int, trace: bool = False) -> Dict[str, Any]:
+    """
+    Build the room and play its script for `frames` frames. Returns per-frame
+    update / draw ms (or, with trace, per-frame allocated and peak bytes).
+    """
+    random.seed(seed)
+    win_w, win_h = screen.get_size()
+    t0 = time.perf_counter()
+    room = factory(win_w, win_h, GameVars())
+    room.layout_for_dialogue(dialog_top=dialog_top)
+    build_ms = (time.perf_counter() - t0) * 1000.0
+
+    script = list(events)
+    done: List[str] = []
+    waiting: Optional[str] = None
+    event_frames: Dict[str, Optional[int]] = {}
+    update_ms: List[float] = []
+    draw_ms: List[float] = []
+    alloc: List[int] = []
+    peak: List[int] = []
+    perf = time.perf_counter
+
+    if trace:
+        tracemalloc.start()
+    try:
+        for i in range(frames):
+            if waiting is None and script:
+                waiting = script.pop(0)
+                event_frames[waiting] = i
+                room.start_event(waiting, on_done=done.append)
+            if trace:
+                tracemalloc.reset_peak()
+                before = tracemalloc.get_traced_memory()[0]
+                room.update(dt_ms)
+                room.draw(screen)
+                after, top = tracemalloc.get_traced_memory()
+                alloc.append(after - before)
+                peak.append(top - before)
+            else:
+                t = perf()
+                room.update(dt_ms)
+                t1 = perf()
+                room.draw(screen)
+                t2 = perf()
+                update_ms.append((t1 - t) * 1000.0)
+                draw_ms.append((t2 - t1) * 1000.0)
+            if waiting is not None and waiting in done:
+                event_frames[waiting] = i + 1 - event_frames[waiting]
+                waiting = None
+    finally:
+        if trace:
+            tracemalloc.stop()
+
+    if waiting is not None:
+        event_frames[waiting] = None     # still running when the frames ran out
+    return {"build_ms": build_ms, "update_ms": update_ms, "draw_ms": draw_ms,
+            "alloc_bytes": alloc, "peak_bytes": peak, "event_frames": event_frames,
+            "events_done": list(done)}
+
+
+def _stats(values: Sequence[float], digits: int = 3) -> Dict[str, float]:
+    p50, p95, p99 = percentiles(values)
+    return {"p50": round(p50, digits), "p95": round(p95, digits), "p99": round(p99, digits),
+            "mean": round(sum(values) / len(values), digits) if values else 0.0,
+            "max": round(max(values), digits) if values else 0.0}
+
+
+def bench_room(name: str, screen: pygame.Surface, dialog_top: int,
+               frames: int, dt_ms: int, seed: int, alloc: bool = True) -> Dict[str, Any]:
+    factory, events = BENCHES[name]
+    result: Dict[str, Any] = {"room": name, "events": list(events)}
+    try:
+        timed = run_room(factory, events, screen, dialog_top, frames, dt_ms, seed)
+        total = [u + d for u, d in zip(timed["update_ms"], timed["draw_ms"])]
+        result.update({
+            "ok": True,
+            "build_ms": round(timed["build_ms"], 2),
+            "frames": len(total),
+            "event_frames": timed["event_frames"],
+            "update_ms": _stats(timed["update_ms"]),
+            "draw_ms": _stats(timed["draw_ms"]),
+            "frame_ms": _stats(total),
+        })
+        if alloc:
+            traced = run_room(factory, events, screen, dialog_top, frames, dt_ms, seed, trace=True)
+            result["alloc_bytes_per_frame"] = _stats(traced["alloc_bytes"], 1)
+            result["peak_bytes_per_frame"] = _stats(traced["peak_bytes"], 1)
+    except Exception as e:
+        result.update({"ok": False, "error": f"{type(e).__name__}: {e}"})
+    return result
+
+
+# ---------------- Output ----------------
+def git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT,
+                             capture_output=True, text=True, timeout=10)
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def print_results(results: Sequence[Dict[str, Any]], baseline: Optional[Dict[str, Any]] = None):
+    base = {r["room"]: r for r in (baseline or {}).get("rooms", []) if r.get("ok")}
+    print(f"  {'room':<14} {'build':>7} {'p50':>7} {'p95':>7} {'p99':>7} {'alloc/fr':>10}")
+    for r in results:
+        if not r["ok"]:
+            print(f"  {r['room']:<14} error: {r['error']}")
+            continue
+        f = r["frame_ms"]
+        alloc = r.get("alloc_bytes_per_frame", {}).get("mean")
+        line = (f"  {r['room']:<14} {r['build_ms']:7.1f} {f['p50']:7.3f} {f['p95']:7.3f} {f['p99']:7.3f} "
+                f"{'' if alloc is None else f'{alloc:10.0f}'}")
+        old = base.get(r["room"])
+        if old is not None:
+            line += f"   p50 {f['p50'] - old['frame_ms']['p50']:+.3f} p95 {f['p95'] - old['frame_ms']['p95']:+.3f}"
+        print(line)
+
+
+def main(argv: Optional[List[str]] = None):
+    ap = argparse.ArgumentParser(description="Headless update/draw benchmark of every room.")
+    ap.add_argument("--room", action="append", choices=list(BENCHES), default=None,
+                    help="room to run (repeatable; default: all)")
+    ap.add_argument("--frames", type=int, default=1200, help="frames per room")
+    ap.add_argument("--dt", type=int, default=16, help="fixed dt_ms passed to update()")
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--no-alloc", action="store_true", help="skip the tracemalloc pass")
+    ap.add_argument("--out", type=Path, default=None, help="JSON output (default: .cache/bench/<commit>.json)")
+    ap.add_argument("--baseline", type=Path, default=None, help="earlier JSON to print the deltas against")
+    args = ap.parse_args(argv)
+
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    dialog_top = _dialog_top(WIDTH, HEIGHT)
+
+    t0 = time.perf_counter()
+    results = [bench_room(name, screen, dialog_top, args.frames, args.dt, args.seed, not args.no_alloc)
+               for name in (args.room or BENCHES)]
+    elapsed = time.perf_counter() - t0
+
+    commit = git_commit()
+    data = {
+        "meta": {
+            "commit": commit,
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "frames": args.frames, "dt_ms": args.dt, "seed": args.seed,
+            "size": [WIDTH, HEIGHT],
+            "video_driver": pygame.display.get_driver(),
+            "python": sys.version.split()[0],
+            "pygame": pygame.version.ver,
+        },
+        "rooms": results,
+    }
+    out = args.out or OUT_DIR / f"{commit or time.strftime('%Y%m%d-%H%M%S')}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(data, indent=2), encoding="utf-8")
+
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8")) if args.baseline else None
+    print(f"{len(results)} rooms x {args.frames} frames in {elapsed:.1f} s -> {out}")
+    print_results(results, baseline)
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+from __future__ import annotations
+from importlib import import_module
+from typing import Any, Dict, List, Optional, Tuple
+
+from core.config import BANK_ASSET_DIR, FONT_PATH
+
+# ======================================================
+# Campaign entries
+#
+# Scenes and rooms are referenced by "module:attribute" and only imported when the
+# entry is first run or prefetched, so starting the game imports what the menu
+# needs and nothing else. This module doesn't import pygame: the headless tools
+# (campaign_sim) read the dialogue chain from here too.
+#
+#   "scene"        : dialogue dict, or fn(gvars) -> dialogue dict (picked at run time)
+#   "room"         : room class (its PRELOAD feeds the ScenePreloader)
+#   "room_factory" : fn(win_w, win_h, gvars) -> room, importing the room on call
+# ======================================================
+
+
+def resolve(ref: str) -> Any:
+    """Object named by "package.module:attr" (imported on first use)."""
+    module, _, attr = ref.partition(":")
+    obj = import_module(module)
+    for part in attr.split(".") if attr else ():
+        obj = getattr(obj, part)
+    return obj
+
+
+# ---------- Room factories ----------
+def make_room_scene1(win_w, win_h, gvars):
+    return resolve("scenes.vault_room:VaultRoomScene")(
+        win_w=win_w, win_h=win_h,
+        bank_asset_dir=BANK_ASSET_DIR,
+        hud_font_path=FONT_PATH,
+        game_vars=gvars
+    )
+
+# Kept as-is for the country house (Martha) scene
+def make_room_scene2(win_w, win_h, gvars):
+    return resolve("scenes.country_house_scene:CountryHouseScene")(win_w, win_h, gvars)
+
+
+def make_room_scene2_street(win_w, win_h, gvars):
+    return resolve("scenes.street_scene2_static:StreetScene2Static")(win_w, win_h, gvars)
+
+
+def make_room_airport(win_w, win_h, gvars):
+    return resolve("scenes.airport_room:AirportRoomScene")(
+        win_w=win_w,
+        win_h=win_h,
+        gvars=gvars,
+        hud_font_path=FONT_PATH
+    )
+
+
+CAMPAIGN: List[Dict[str, Any]] = [
+    {"id": "scene1_vault", "scene": "scenes.scene1_vault:SCENE1_VAULT",
+     "room": "scenes.vault_room:VaultRoomScene", "room_factory": make_room_scene1},
+    {"id": "scene2_street", "scene": "scenes.scene2_street:SCENE2_STREET",
+     "room": "scenes.street_scene2_static:StreetScene2Static", "room_factory": make_room_scene2_street,
+     "bgm": "scene2.mp3", "bgm_volume": 0.6},
+    {"id": "martha_scene", "scene": "scenes.scene3_country_house:SCENE3_MARTHA",
+     "room": "scenes.country_house_scene:CountryHouseScene", "room_factory": make_room_scene2,
+     "bgm": "scene3.mp3", "bgm_volume": 0.6},
+    {"id": "scene4_airport", "scene": "core.scene_helpers:select_airport_scene",
+     "room": "scenes.airport_room:AirportRoomScene", "room_factory": make_room_airport,
+     "bgm": "scene4.mp3", "bgm_volume": 0.5},
+]
+
+# Dialogues only reachable through a "scene" function (validated with the rest)
+EXTRA_SCENES: Tuple[str, ...] = (
+    "scenes.scene_airport_dialogue:SCENE_AIRPORT_CAUGHT",
+    "scenes.scene_airport_dialogue:SCENE_AIRPORT_ESCAPED",
+)
+
+
+# ---------- Entry helpers ----------
+def entry_scene(entry: Dict[str, Any], gvars) -> Dict[str, Any]:
+    scene = resolve(entry["scene"])
+    return scene(gvars) if callable(scene) else scene
+
+
+def entry_preload(entry: Dict[str, Any]) -> Optional[Any]:
+    """The room's PRELOAD (imports the room module)."""
+    return getattr(resolve(entry["room"]), "PRELOAD", None) if entry.get("room") else None
+
+
+def campaign_scenes() -> Tuple[Dict[str, Any], ...]:
+    """Fixed dialogues of the campaign, in order (entries picking theirs at run time excluded)."""
+    scenes = (resolve(e["scene"]) for e in CAMPAIGN)
+    return tuple(s for s in scenes if not callable(s))
+
+
+def all_scenes() -> Tuple[Dict[str, Any], ...]:
+    """Every dialogue the campaign can play (for up-front validation)."""
+    return campaign_scenes() + tuple(resolve(ref) for ref in EXTRA_SCENES)
@@ -0,0 +1,377 @@
+from __future__ import annotations
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+import argparse
+import json
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import numpy as np
+
+from core.config import (
+    INITIAL_TRUST, INITIAL_POLICE_GAP,
+    FOLLOW_THRESHOLD, FOLLOW_SIGMOID_K, FOLLOW_PROB_FLOOR, FOLLOW_PROB_CEIL,
+)
+from core.scene_helpers import is_caught
+from dialogue_engine import follow_probability
+from dialogue_graph import (
+    DialogueGraph, compile_scene, two_way_index, three_way_index,
+    TAG_CORRECT, TAG_WRONG, TAG_NEUTRAL, TAG_TRUTHY, NO_SELECTION,
+    CHOICE, BRANCH_CORRECT, BRANCH_3WAY, DECISION_FOLLOW, DECISION_FOLLOW_3WAY, EFFECTS, END,
+)
+from scenes.scene_airport_dialogue import SCENE_AIRPORT_CAUGHT, SCENE_AIRPORT_ESCAPED
+from game.campaign import campaign_scenes
+
+# ======================================================
+# Headless campaign simulator (no pygame)
+#
+# Plays the campaign's dialogue chain for a whole batch of playthroughs at once:
+# every playthrough is one row of NumPy state (node, last choice tag, trust, gap)
+# and all rows advance one node per step. wait_scene events resolve immediately,
+# choices follow a policy (fixed or uniformly random), and Tony's follow/ignore
+# draws use the same clamped logistic as DialogueRunner.
+#
+#   python src/game/campaign_sim.py -n 1000000 --policy random
+#   python src/game/campaign_sim.py --policy correct --choose vault_room:q_button=1 --k 0.2
+# ======================================================
+
+# Dialogue chain played before the airport (the fixed dialogues of game/campaign.py)
+CAMPAIGN_SCENES = campaign_scenes()
+ENDINGS = ("caught", "escaped")
+ENDING_SCENES = {"caught": SCENE_AIRPORT_CAUGHT, "escaped": SCENE_AIRPORT_ESCAPED}
+
+MAX_STEPS_PER_SCENE = 10_000   # choice loops are allowed, but a run must end eventually
+DEFAULT_BATCH = 250_000
+
+# Tag -> branch offset lookups (indexed by the option tag codes)
+_TWO_WAY = np.array([two_way_index(t) for t in range(4)], dtype=np.int8)
+_THREE_WAY = np.array([three_way_index(t) for t in range(4)], dtype=np.int8)
+
+
+@dataclass(frozen=True)
+class FollowParams:
+    """Knobs of Tony's follow decision (defaults = core.config)."""
+    threshold: float = FOLLOW_THRESHOLD
+    k: float = FOLLOW_SIGMOID_K
+    floor: float = FOLLOW_PROB_FLOOR
+    ceil: float = FOLLOW_PROB_CEIL
+
+    def probability(self, trust: int) -> float:
+        return follow_probability(trust, self.threshold, self.k, self.floor, self.ceil)
+
+    def table(self) -> np.ndarray:
+        """P(follow) for every integer trust 0..100 (trust is always an int in game)."""
+        return np.array([self.probability(t) for t in range(101)], dtype=np.float64)
+
+
+# ---------------- Graph arrays ----------------
+@dataclass(frozen=True)
+class GraphArrays:
+    """Column view of a compiled graph, for gathering with node-index arrays."""
+    graph: DialogueGraph
+    kind: np.ndarray       # [n] int8
+    succ: np.ndarray       # [n, 6] int32, padded with the node's own index
+    n_opts: np.ndarray     # [n] int32 (0 for non-choice nodes)
+    opt_tag: np.ndarray    # [n, max_opts] int8
+    d_trust: np.ndarray    # [n] int32
+    d_gap: np.ndarray      # [n] int32
+
+
+_ARRAYS: Dict[int, GraphArrays] = {}
+
+
+def graph_arrays(graph: DialogueGraph) -> GraphArrays:
+    cached = _ARRAYS.get(id(graph))
+    if cached is not None and cached.graph is graph:
+        return cached
+
+    n = len(graph.nodes)
+    max_opts = max([len(node.options) for node in graph.nodes] + [1])
+    kind = np.zeros(n, dtype=np.int8)
+    succ = np.repeat(np.arange(n, dtype=np.int32)[:, None], 6, axis=1)
+    n_opts = np.zeros(n, dtype=np.int32)
+    opt_tag = np.full((n, max_opts), TAG_WRONG, dtype=np.int8)
+    d_trust = np.zeros(n, dtype=np.int32)
+    d_gap = np.zeros(n, dtype=np.int32)
+
+    for node in graph.nodes:
+        i = node.index
+        kind[i] = node.kind
+        succ[i, :len(node.succ)] = node.succ
+        n_opts[i] = len(node.options)
+        for j, opt in enumerate(node.options):
+            opt_tag[i, j] = opt.tag
+        effects = dict(node.effects)
+        d_trust[i] = effects.get("trust", 0)
+        d_gap[i] = effects.get("police_gap", 0)
+
+    arrays = GraphArrays(graph, kind, succ, n_opts, opt_tag, d_trust, d_gap)
+    _ARRAYS[id(graph)] = arrays
+    return arrays
+
+
+# ---------------- Choice policies ----------------
+# A policy is a named base ("random", "correct", "wrong") plus optional overrides
+# {"scene_id:node_id": option_index}. It resolves to one int per node: the option
+# to pick, or -1 for a uniform random pick.
+POLICIES = ("random", "correct", "wrong")
+
+_PREFERENCE = {
+    "correct": (TAG_CORRECT, TAG_TRUTHY, TAG_NEUTRAL, TAG_WRONG),
+    "wrong": (TAG_WRONG, TAG_NEUTRAL, TAG_TRUTHY, TAG_CORRECT),
+}
+
+
+def parse_choice(spec: str) -> Tuple[str, int]:
+    """'scene_id:node_id=2' -> ('scene_id:node_id', 2)"""
+    key, sep, idx = spec.partition("=")
+    if not sep or ":" not in key:
+        raise ValueError(f"bad choice override {spec!r} (expected scene_id:node_id=index)")
+    return key.strip(), int(idx)
+
+
+def resolve_policy(graph: DialogueGraph, policy: str = "random",
+                   overrides: Optional[Mapping[str, int]] = None) -> np.ndarray:
+    if policy not in POLICIES:
+        raise ValueError(f"unknown policy {policy!r} (expected one of {', '.join(POLICIES)})")
+
+    table = np.full(len(graph.nodes), -1, dtype=np.int32)
+    for node in graph.nodes:
+        if node.kind != CHOICE:
+            continue
+        key = f"{graph.scene_id}:{node.id}"
+        if overrides and key in overrides:
+            idx = int(overrides[key])
+            if not 0 <= idx < len(node.options):
+                raise ValueError(f"{key}: option {idx} out of range (0..{len(node.options) - 1})")
+            table[node.index] = idx
+        elif policy in _PREFERENCE:
+            tags = [opt.tag for opt in node.options]
+            table[node.index] = next(tags.index(t) for t in _PREFERENCE[policy] if t in tags)
+    return table
+
+
+# ---------------- Batched scene run ----------------
+def run_scene_batch(arrays: GraphArrays, trust: np.ndarray, gap: np.ndarray,
+                    choices: np.ndarray, follow_table: np.ndarray,
+                    rng: np.random.Generator) -> np.ndarray:
+    """
+    Play one scene for every row, updating trust/gap in place.
+    Returns a bool mask of rows that reached an `end` node.
+    """
+    rows = len(trust)
+    node = np.full(rows, arrays.graph.start, dtype=np.int32)
+    tag = np.full(rows, NO_SELECTION, dtype=np.int8)
+    active = np.arange(rows)
+
+    for _ in range(MAX_STEPS_PER_SCENE):
+        if active.size == 0:
+            break
+        nd = node[active]
+        kind = arrays.kind[nd]
+        branch = np.zeros(active.size, dtype=np.int32)
+
+        m = kind == CHOICE
+        if m.any():
+            cn = nd[m]
+            pick = choices[cn]
+            free = pick < 0
+            if free.any():
+                pick[free] = (rng.random(int(free.sum())) * arrays.n_opts[cn[free]]).astype(np.int32)
+            tag[active[m]] = arrays.opt_tag[cn, pick]
+
+        m = kind == EFFECTS
+        if m.any():
+            r, en = active[m], nd[m]
+            trust[r] = np.clip(trust[r] + arrays.d_trust[en], 0, 100)
+            gap[r] += arrays.d_gap[en]
+
+        t = tag[active]
+        m = kind == BRANCH_CORRECT
+        branch[m] = _TWO_WAY[t[m]]
+        m = kind == BRANCH_3WAY
+        branch[m] = _THREE_WAY[t[m]]
+
+        m = (kind == DECISION_FOLLOW) | (kind == DECISION_FOLLOW_3WAY)
+        if m.any():
+            follows = rng.random(int(m.sum())) < follow_table[trust[active[m]]]
+            three = kind[m] == DECISION_FOLLOW_3WAY
+            tm = t[m]
+            branch[m] = np.where(
+                three,
+                np.where(follows, 0, 3) + _THREE_WAY[tm],
+                np.where(follows, 0, 2) + _TWO_WAY[tm],
+            )
+
+        node[active] = arrays.succ[nd, branch]
+        active = active[kind != END]
+
+    finished = np.ones(rows, dtype=bool)
+    finished[active] = False
+    return finished
+
+
+# ---------------- Campaign ----------------
+@dataclass
+class SimResult:
+    runs: int = 0
+    unfinished: int = 0
+    counts: Dict[str, int] = field(default_factory=lambda: {e: 0 for e in ENDINGS})
+    # State at the airport selection, per ending
+    trust_hist: Dict[str, np.ndarray] = field(
+        default_factory=lambda: {e: np.zeros(101, dtype=np.int64) for e in ENDINGS})
+    gap_hist: Dict[str, Dict[int, int]] = field(default_factory=lambda: {e: {} for e in ENDINGS})
+
+    def probability(self, ending: str) -> float:
+        done = self.runs - self.unfinished
+        return self.counts[ending] / done if done else 0.0
+
+    def stderr(self, ending: str) -> float:
+        done = self.runs - self.unfinished
+        p = self.probability(ending)
+        return float(np.sqrt(p * (1.0 - p) / done)) if done else 0.0
+
+    def mean_trust(self, ending: str) -> float:
+        h = self.trust_hist[ending]
+        return float((h * np.arange(101)).sum() / h.sum()) if h.sum() else float("nan")
+
+    def mean_gap(self, ending: str) -> float:
+        h = self.gap_hist[ending]
+        total = sum(h.values())
+        return sum(g * c for g, c in h.items()) / total if total else float("nan")
+
+    def _add(self, ending: str, trust: np.ndarray, gap: np.ndarray):
+        self.counts[ending] += int(trust.size)
+        self.trust_hist[ending] += np.bincount(trust, minlength=101)[:101]
+        values, counts = np.unique(gap, return_counts=True)
+        h = self.gap_hist[ending]
+        for v, c in zip(values.tolist(), counts.tolist()):
+            h[v] = h.get(v, 0) + c
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "runs": self.runs,
+            "unfinished": self.unfinished,
+            "endings": {
+                e: {
+                    "count": self.counts[e],
+                    "probability": self.probability(e),
+                    "stderr": self.stderr(e),
+                    "mean_trust": self.mean_trust(e),
+                    "mean_police_gap": self.mean_gap(e),
+                    "trust_hist": self.trust_hist[e].tolist(),
+                    "police_gap_hist": {str(g): c for g, c in sorted(self.gap_hist[e].items())},
+                }
+                for e in ENDINGS
+            },
+        }
+
+
+def simulate(runs: int,
+             policy: str = "random",
+             overrides: Optional[Mapping[str, int]] = None,
+             follow: FollowParams = FollowParams(),
+             initial_trust: int = INITIAL_TRUST,
+             initial_gap: int = INITIAL_POLICE_GAP,
+             seed: Optional[int] = None,
+             batch: int = DEFAULT_BATCH,
+             scenes=CAMPAIGN_SCENES) -> SimResult:
+    """Run `runs` playthroughs of the dialogue chain and tally the airport endings."""
+    graphs = [compile_scene(s) for s in scenes]
+    chain = [(graph_arrays(g), resolve_policy(g, policy, overrides)) for g in graphs]
+    finals = {}
+    for ending, scene in ENDING_SCENES.items():
+        g = compile_scene(scene)
+        finals[ending] = (graph_arrays(g), resolve_policy(g, policy, overrides))
+
+    follow_table = follow.table()
+    rng = np.random.default_rng(seed)
+    result = SimResult(runs=int(runs))
+
+    left = int(runs)
+    while left > 0:
+        n = min(batch, left)
+        left -= n
+        trust = np.full(n, max(0, min(100, int(initial_trust))), dtype=np.int32)
+        gap = np.full(n, int(initial_gap), dtype=np.int32)
+        alive = np.ones(n, dtype=bool)
+
+        for arrays, choices in chain:
+            alive &= run_scene_batch(arrays, trust, gap, choices, follow_table, rng)
+        result.unfinished += int((~alive).sum())
+        trust, gap = trust[alive], gap[alive]
+
+        caught = np.asarray(is_caught(trust, gap), dtype=bool)
+        for ending, mask in (("caught", caught), ("escaped", ~caught)):
+            t, g = trust[mask], gap[mask]
+            result._add(ending, t, g)
+            # Play the ending scene too, so the whole chain is exercised
+            arrays, choices = finals[ending]
+            run_scene_batch(arrays, t.copy(), g.copy(), choices, follow_table, rng)
+
+    return result
+
+
+# ---------------- Report ----------------
+def _bar(count: int, top: int, width: int = 40) -> str:
+    return "#" * (int(round(width * count / top)) if top else 0)
+
+
+def format_report(res: SimResult) -> str:
+    out = [f"runs: {res.runs:,}  (unfinished: {res.unfinished:,})", ""]
+    for e in ENDINGS:
+        out.append(f"{e:<8} {res.probability(e):7.3%}  ± {1.96 * res.stderr(e):.3%}"
+                   f"   mean trust {res.mean_trust(e):6.2f}   mean gap {res.mean_gap(e):6.2f}")
+
+    trust = sum(res.trust_hist.values())
+    bins = [int(trust[i:i + 10].sum()) for i in range(0, 100, 10)]
+    bins[-1] += int(trust[100])
+    out += ["", "trust at the airport"]
+    top = max(bins)
+    for i, c in enumerate(bins):
+        hi = 100 if i == 9 else i * 10 + 9
+        out.append(f"  {i * 10:3d}-{hi:<3d} {c:>10,} {_bar(c, top)}")
+
+    gaps: Dict[int, int] = {}
+    for h in res.gap_hist.values():
+        for g, c in h.items():
+            gaps[g] = gaps.get(g, 0) + c
+    out += ["", "police_gap at the airport"]
+    top = max(gaps.values(), default=0)
+    for g in sorted(gaps):
+        out.append(f"  {g:7d} {gaps[g]:>10,} {_bar(gaps[g], top)}")
+    return "\n".join(out)
+
+
+def main(argv: Optional[List[str]] = None):
+    ap = argparse.ArgumentParser(description="Monte Carlo ending distribution of the campaign dialogue.")
+    ap.add_argument("-n", "--runs", type=int, default=100_000)
+    ap.add_argument("--policy", choices=POLICIES, default="random")
+    ap.add_argument("--choose", action="append", default=[], metavar="SCENE:NODE=IDX",
+                    help="force an option at a choice node (repeatable)")
+    ap.add_argument("--threshold", type=float, default=FOLLOW_THRESHOLD)
+    ap.add_argument("--k", type=float, default=FOLLOW_SIGMOID_K)
+    ap.add_argument("--floor", type=float, default=FOLLOW_PROB_FLOOR)
+    ap.add_argument("--ceil", type=float, default=FOLLOW_PROB_CEIL)
+    ap.add_argument("--trust", type=int, default=INITIAL_TRUST, help="initial trust")
+    ap.add_argument("--gap", type=int, default=INITIAL_POLICE_GAP, help="initial police_gap")
+    ap.add_argument("--seed", type=int, default=None)
+    ap.add_argument("--batch", type=int, default=DEFAULT_BATCH)
+    ap.add_argument("--json", type=Path, default=None, help="also write the full result as JSON")
+    args = ap.parse_args(argv)
+
+    overrides = dict(parse_choice(s) for s in args.choose)
+    res = simulate(
+        args.runs, policy=args.policy, overrides=overrides,
+        follow=FollowParams(args.threshold, args.k, args.floor, args.ceil),
+        initial_trust=args.trust, initial_gap=args.gap, seed=args.seed, batch=args.batch,
+    )
+    print(format_report(res))
+    if args.json:
+        args.json.write_text(json.dumps(res.to_dict(), indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
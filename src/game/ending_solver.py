@@ -0,0 +1,375 @@
+from __future__ import annotations
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+import argparse
+import json
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from core.config import (
+    INITIAL_TRUST, INITIAL_POLICE_GAP,
+    FOLLOW_THRESHOLD, FOLLOW_SIGMOID_K, FOLLOW_PROB_FLOOR, FOLLOW_PROB_CEIL,
+)
+from core.scene_helpers import is_caught
+from dialogue_graph import (
+    DialogueGraph, compile_scene, two_way_index, three_way_index, NO_SELECTION,
+    CHOICE, BRANCH_CORRECT, BRANCH_3WAY, DECISION_FOLLOW, DECISION_FOLLOW_3WAY, EFFECTS, END,
+)
+from game.campaign_sim import (
+    CAMPAIGN_SCENES, ENDINGS, ENDING_SCENES, POLICIES, FollowParams, parse_choice, resolve_policy,
+)
+
+# ======================================================
+# Exact ending solver
+#
+# The only state that matters to the outcome is (node, last choice tag, trust, gap).
+# Probability mass is pushed through each compiled graph in topological order, with
+# equal states merged, so the result is exact (no sampling noise, rare branches
+# included) and takes a few milliseconds for the whole campaign.
+#
+#   - evaluate(): ending and node-visit probabilities under a choice policy
+#   - optimize(): the choice at every reachable state that maximizes P(escaped)
+#
+#   python src/game/ending_solver.py --policy random
+#   python src/game/ending_solver.py --optimize --strict      # non-zero exit if flagged
+# ======================================================
+
+RARE_ENDING = 0.01   # flag an ending below this probability (or above 1 - this)
+
+State = Tuple[int, int, int]            # (tag, trust, gap) at a node
+Dist = Dict[Tuple[int, int], float]     # (trust, gap) -> probability
+
+
+def topo_order(graph: DialogueGraph) -> List[int]:
+    """Nodes reachable from start, in topological order. Raises on loops (the DP needs a DAG)."""
+    WHITE, GREY, BLACK = 0, 1, 2
+    color = [WHITE] * len(graph.nodes)
+    order: List[int] = []
+    stack = [(graph.start, iter(graph.nodes[graph.start].succ))]
+    color[graph.start] = GREY
+    while stack:
+        i, it = stack[-1]
+        nxt = next(it, None)
+        if nxt is None:
+            color[i] = BLACK
+            order.append(i)
+            stack.pop()
+        elif color[nxt] == GREY:
+            raise ValueError(f"scene {graph.scene_id!r}: loop through {graph.nodes[nxt].id!r}; "
+                             "the exact solver needs acyclic scenes (use campaign_sim instead)")
+        elif color[nxt] == WHITE:
+            color[nxt] = GREY
+            stack.append((nxt, iter(graph.nodes[nxt].succ)))
+    order.reverse()
+    return order
+
+
+def _apply_effects(node, trust: int, gap: int) -> Tuple[int, int]:
+    effects = dict(node.effects)
+    if "trust" in effects:
+        trust = max(0, min(100, trust + effects["trust"]))
+    return trust, gap + effects.get("police_gap", 0)
+
+
+def _transitions(node, state: State, follow: FollowParams):
+    """
+    Successor states of a non-choice, non-end node: yields (succ_index, state, prob).
+    Mirrors DialogueRunner's handlers.
+    """
+    tag, trust, gap = state
+    kind = node.kind
+    if kind == EFFECTS:
+        trust, gap = _apply_effects(node, trust, gap)
+        yield node.succ[0], (tag, trust, gap), 1.0
+    elif kind == BRANCH_CORRECT:
+        yield node.succ[two_way_index(tag)], state, 1.0
+    elif kind == BRANCH_3WAY:
+        yield node.succ[three_way_index(tag)], state, 1.0
+    elif kind in (DECISION_FOLLOW, DECISION_FOLLOW_3WAY):
+        p = follow.probability(trust)
+        if kind == DECISION_FOLLOW:
+            width, offset = 2, two_way_index(tag)
+        else:
+            width, offset = 3, three_way_index(tag)
+        if p > 0.0:
+            yield node.succ[offset], state, p
+        if p < 1.0:
+            yield node.succ[width + offset], state, 1.0 - p
+    else:  # line / goto / wait_scene
+        yield node.succ[0], state, 1.0
+
+
+# ---------------- Policy evaluation ----------------
+@dataclass
+class Evaluation:
+    endings: Dict[str, float]
+    visits: Dict[str, Dict[str, float]]             # scene_id -> node_id -> P(visited)
+    airport: Dist                                   # (trust, gap) at the airport selection
+    unreachable: Dict[str, List[str]] = field(default_factory=dict)   # never visited under this policy
+
+
+def _push_scene(graph: DialogueGraph, entry: Dist, follow: FollowParams,
+                choose, visits: Dict[str, float]) -> Dist:
+    """
+    Push an entry distribution through one scene. `choose(node, state)` returns a list
+    of (option_index, prob). Returns the exit distribution over (trust, gap).
+    """
+    mass: Dict[int, Dict[State, float]] = {graph.start: {}}
+    start = mass[graph.start]
+    for (trust, gap), p in entry.items():
+        key = (NO_SELECTION, trust, gap)
+        start[key] = start.get(key, 0.0) + p
+
+    out: Dist = {}
+    for i in topo_order(graph):
+        states = mass.pop(i, None)
+        if not states:
+            continue
+        node = graph.nodes[i]
+        visits[node.id] = sum(states.values())
+
+        if node.kind == END:
+            for (_, trust, gap), p in states.items():
+                out[(trust, gap)] = out.get((trust, gap), 0.0) + p
+            continue
+
+        for state, p in states.items():
+            if node.kind == CHOICE:
+                succ = node.succ[0]
+                for idx, q in choose(node, state):
+                    nxt = (node.options[idx].tag, state[1], state[2])
+                    bucket = mass.setdefault(succ, {})
+                    bucket[nxt] = bucket.get(nxt, 0.0) + p * q
+            else:
+                for succ, nxt, q in _transitions(node, state, follow):
+                    bucket = mass.setdefault(succ, {})
+                    bucket[nxt] = bucket.get(nxt, 0.0) + p * q
+    return out
+
+
+def _run_chain(choose_for, follow: FollowParams, initial_trust: int, initial_gap: int,
+               scenes=CAMPAIGN_SCENES) -> Evaluation:
+    dist: Dist = {(max(0, min(100, int(initial_trust))), int(initial_gap)): 1.0}
+    visits: Dict[str, Dict[str, float]] = {}
+    for scene in scenes:
+        graph = compile_scene(scene)
+        visits[graph.scene_id] = v = {}
+        dist = _push_scene(graph, dist, follow, choose_for(graph), v)
+
+    airport = dict(dist)
+    endings = {e: 0.0 for e in ENDINGS}
+    split: Dict[str, Dist] = {e: {} for e in ENDINGS}
+    for (trust, gap), p in dist.items():
+        e = "caught" if is_caught(trust, gap) else "escaped"
+        endings[e] += p
+        split[e][(trust, gap)] = p
+    for e, scene in ENDING_SCENES.items():
+        graph = compile_scene(scene)
+        visits[graph.scene_id] = v = {}
+        if split[e]:
+            _push_scene(graph, split[e], follow, choose_for(graph), v)
+
+    unreachable = {}
+    for scene in list(scenes) + list(ENDING_SCENES.values()):
+        graph = compile_scene(scene)
+        seen = visits[graph.scene_id]
+        unreachable[graph.scene_id] = [n.id for n in graph.nodes if seen.get(n.id, 0.0) <= 0.0]
+    return Evaluation(endings, visits, airport, unreachable)
+
+
+def evaluate(policy: str = "random",
+             overrides: Optional[Mapping[str, int]] = None,
+             follow: FollowParams = FollowParams(),
+             initial_trust: int = INITIAL_TRUST,
+             initial_gap: int = INITIAL_POLICE_GAP,
+             scenes=CAMPAIGN_SCENES) -> Evaluation:
+    """Exact ending / node-visit probabilities under a (possibly random) choice policy."""
+    def choose_for(graph):
+        table = resolve_policy(graph, policy, overrides)
+
+        def choose(node, state):
+            idx = int(table[node.index])
+            if idx >= 0:
+                return [(idx, 1.0)]
+            n = len(node.options)
+            return [(j, 1.0 / n) for j in range(n)]
+        return choose
+
+    return _run_chain(choose_for, follow, initial_trust, initial_gap, scenes)
+
+
+# ---------------- Escape-maximizing policy ----------------
+@dataclass
+class Optimum:
+    p_escape: float
+    evaluation: Evaluation                                  # the optimal policy, evaluated
+    decisions: Dict[str, Dict[str, Dict[State, int]]]       # scene -> node -> state -> option
+
+
+def optimize(follow: FollowParams = FollowParams(),
+             initial_trust: int = INITIAL_TRUST,
+             initial_gap: int = INITIAL_POLICE_GAP,
+             scenes=CAMPAIGN_SCENES) -> Optimum:
+    """
+    Backward DP, memoized on (scene, node, tag, trust, gap): the value of a state is
+    P(escaped) when every later choice is made optimally.
+    """
+    graphs = [compile_scene(s) for s in scenes]
+    for g in graphs:
+        topo_order(g)   # reject loops up front
+    memo: Dict[Tuple[int, int, int, int, int], float] = {}
+    best: Dict[Tuple[int, int, int, int, int], int] = {}
+
+    def value(si: int, i: int, tag: int, trust: int, gap: int) -> float:
+        key = (si, i, tag, trust, gap)
+        v = memo.get(key)
+        if v is not None:
+            return v
+        graph = graphs[si]
+        node = graph.nodes[i]
+        if node.kind == END:
+            if si + 1 < len(graphs):
+                v = value(si + 1, graphs[si + 1].start, NO_SELECTION, trust, gap)
+            else:
+                v = 0.0 if is_caught(trust, gap) else 1.0
+        elif node.kind == CHOICE:
+            v, arg = -1.0, 0
+            for j, opt in enumerate(node.options):
+                w = value(si, node.succ[0], opt.tag, trust, gap)
+                if w > v + 1e-12:
+                    v, arg = w, j
+            best[key] = arg
+        else:
+            v = sum(q * value(si, succ, *nxt)
+                    for succ, nxt, q in _transitions(node, (tag, trust, gap), follow))
+        memo[key] = v
+        return v
+
+    limit = sys.getrecursionlimit()
+    sys.setrecursionlimit(max(limit, 20_000))
+    try:
+        t0 = max(0, min(100, int(initial_trust)))
+        p_escape = value(0, graphs[0].start, NO_SELECTION, t0, int(initial_gap))
+    finally:
+        sys.setrecursionlimit(limit)
+
+    index_of_graph = {id(g): si for si, g in enumerate(graphs)}
+    decisions: Dict[str, Dict[str, Dict[State, int]]] = {g.scene_id: {} for g in graphs}
+
+    def choose_for(graph):
+        si = index_of_graph.get(id(graph))
+
+        def choose(node, state):
+            if si is None:   # ending scenes: choices don't change the ending
+                return [(0, 1.0)]
+            idx = best[(si, node.index) + state]
+            decisions[graph.scene_id].setdefault(node.id, {})[state] = idx
+            return [(idx, 1.0)]
+        return choose
+
+    evaluation = _run_chain(choose_for, follow, initial_trust, initial_gap, scenes)
+    return Optimum(p_escape, evaluation, decisions)
+
+
+# ---------------- Report ----------------
+def flags(endings: Mapping[str, float], rare: float = RARE_ENDING) -> List[str]:
+    out = []
+    for e, p in endings.items():
+        if p <= 0.0:
+            out.append(f"ending {e!r} is unreachable")
+        elif p < rare:
+            out.append(f"ending {e!r} is nearly impossible ({p:.4%})")
+        elif p > 1.0 - rare:
+            out.append(f"ending {e!r} is nearly certain ({p:.4%})")
+    return out
+
+
+def format_evaluation(ev: Evaluation, title: str) -> str:
+    out = [title]
+    for e in ENDINGS:
+        out.append(f"  {e:<8} {ev.endings[e]:.6%}")
+    for scene_id, nodes in ev.unreachable.items():
+        if nodes:
+            out.append(f"  never visited in {scene_id}: {', '.join(nodes)}")
+    return "\n".join(out)
+
+
+def format_decisions(opt: Optimum) -> str:
+    out = [f"escape-maximizing policy (P(escaped) = {opt.p_escape:.6%})"]
+    for scene in CAMPAIGN_SCENES:
+        graph = compile_scene(scene)
+        for node_id, by_state in opt.decisions.get(graph.scene_id, {}).items():
+            node = graph.node(node_id)
+            picks = sorted(set(by_state.values()))
+            if len(picks) == 1:
+                out.append(f"  {graph.scene_id}:{node_id} -> [{picks[0]}] {node.options[picks[0]].label}")
+            else:
+                out.append(f"  {graph.scene_id}:{node_id} -> depends on state:")
+                for (tag, trust, gap), idx in sorted(by_state.items()):
+                    out.append(f"      trust={trust:3d} gap={gap:3d} -> [{idx}] {node.options[idx].label}")
+    return "\n".join(out)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Exact ending probabilities of the campaign dialogue.")
+    ap.add_argument("--policy", choices=POLICIES, default="random")
+    ap.add_argument("--choose", action="append", default=[], metavar="SCENE:NODE=IDX",
+                    help="force an option at a choice node (repeatable)")
+    ap.add_argument("--optimize", action="store_true", help="also solve for the escape-maximizing policy")
+    ap.add_argument("--threshold", type=float, default=FOLLOW_THRESHOLD)
+    ap.add_argument("--k", type=float, default=FOLLOW_SIGMOID_K)
+    ap.add_argument("--floor", type=float, default=FOLLOW_PROB_FLOOR)
+    ap.add_argument("--ceil", type=float, default=FOLLOW_PROB_CEIL)
+    ap.add_argument("--trust", type=int, default=INITIAL_TRUST, help="initial trust")
+    ap.add_argument("--gap", type=int, default=INITIAL_POLICE_GAP, help="initial police_gap")
+    ap.add_argument("--rare", type=float, default=RARE_ENDING, help="flag endings below / above this margin")
+    ap.add_argument("--strict", action="store_true", help="exit with status 1 if anything is flagged")
+    ap.add_argument("--json", type=Path, default=None, help="also write the result as JSON")
+    args = ap.parse_args(argv)
+
+    follow = FollowParams(args.threshold, args.k, args.floor, args.ceil)
+    overrides = dict(parse_choice(s) for s in args.choose)
+
+    t0 = time.perf_counter()
+    ev = evaluate(args.policy, overrides, follow, args.trust, args.gap)
+    opt = optimize(follow, args.trust, args.gap) if args.optimize else None
+    elapsed_ms = (time.perf_counter() - t0) * 1000.0
+
+    print(format_evaluation(ev, f"policy {args.policy!r}"))
+    if opt is not None:
+        print()
+        print(format_decisions(opt))
+    warnings = flags(ev.endings, args.rare)
+    if opt is not None and opt.p_escape <= 0.0:
+        warnings.append("no policy can reach 'escaped'")
+    print()
+    for w in warnings:
+        print(f"WARNING: {w}")
+    print(f"solved in {elapsed_ms:.1f} ms")
+
+    if args.json:
+        data: Dict[str, Any] = {
+            "policy": args.policy,
+            "endings": ev.endings,
+            "visits": ev.visits,
+            "unreachable": ev.unreachable,
+            "flags": warnings,
+        }
+        if opt is not None:
+            data["optimal"] = {
+                "p_escape": opt.p_escape,
+                "decisions": {
+                    f"{s}:{n}": {f"trust={t},gap={g},tag={tag}": idx for (tag, t, g), idx in by.items()}
+                    for s, nodes in opt.decisions.items() for n, by in nodes.items()
+                },
+            }
+        args.json.write_text(json.dumps(data, indent=2), encoding="utf-8")
+
+    return 1 if (args.strict and warnings) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
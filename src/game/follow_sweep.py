@@ -0,0 +1,270 @@
+from __future__ import annotations
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import argparse
+import csv
+import itertools
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import numpy as np
+
+from core.config import (
+    CACHE_DIR, INITIAL_TRUST, INITIAL_POLICE_GAP,
+    FOLLOW_THRESHOLD, FOLLOW_SIGMOID_K, FOLLOW_PROB_FLOOR, FOLLOW_PROB_CEIL,
+)
+from game.campaign_sim import POLICIES, FollowParams
+from game.ending_solver import evaluate, optimize
+
+# ======================================================
+# Follow-model parameter sweep
+#
+# Evaluates the exact campaign outcome (ending_solver) over a grid or a Latin
+# hypercube of follow-model / starting parameters, spread over all cores, and
+# writes a compact CSV + JSON table and matplotlib heatmaps.
+#
+#   python src/game/follow_sweep.py                                   # threshold x k grid
+#   python src/game/follow_sweep.py --k 0.05:0.6:12 --floor 0:0.2:5 --x k --y floor
+#   python src/game/follow_sweep.py --lhs 2000 --threshold 30:80 --k 0.05:0.6 --trust 20:80
+#
+# Each parameter is either a fixed value ("60"), a grid ("lo:hi:count") or, with
+# --lhs, a range ("lo:hi") sampled by Latin hypercube.
+# ======================================================
+
+PARAMS = ("threshold", "k", "floor", "ceil", "trust", "gap")
+INT_PARAMS = frozenset({"trust", "gap"})   # game state is integral
+
+DEFAULTS = {
+    "threshold": FOLLOW_THRESHOLD,
+    "k": FOLLOW_SIGMOID_K,
+    "floor": FOLLOW_PROB_FLOOR,
+    "ceil": FOLLOW_PROB_CEIL,
+    "trust": INITIAL_TRUST,
+    "gap": INITIAL_POLICE_GAP,
+}
+DEFAULT_SWEEP = {"threshold": "30:80:11", "k": "0.05:0.55:11"}
+
+OUT_DIR = CACHE_DIR / "follow_sweep"
+
+
+# ---------------- Parameter space ----------------
+def parse_axis(name: str, spec: str) -> Tuple[float, float, int]:
+    """'60' -> (60, 60, 1); '30:80:11' -> (30, 80, 11); '30:80' -> (30, 80, 0) (range for LHS)."""
+    parts = [p.strip() for p in str(spec).split(":")]
+    try:
+        if len(parts) == 1:
+            v = float(parts[0])
+            return v, v, 1
+        if len(parts) == 2:
+            return float(parts[0]), float(parts[1]), 0
+        if len(parts) == 3:
+            return float(parts[0]), float(parts[1]), int(parts[2])
+    except ValueError:
+        pass
+    raise ValueError(f"--{name}: expected VALUE, LO:HI or LO:HI:COUNT, got {spec!r}")
+
+
+def _cast(name: str, value: float):
+    return int(round(value)) if name in INT_PARAMS else float(value)
+
+
+def grid_points(axes: Dict[str, Tuple[float, float, int]]) -> List[Dict[str, Any]]:
+    values = []
+    for name in PARAMS:
+        lo, hi, count = axes[name]
+        count = max(1, count)
+        vals = np.linspace(lo, hi, count) if count > 1 else np.array([lo])
+        # integral params may collapse to duplicates once rounded
+        values.append(list(dict.fromkeys(_cast(name, v) for v in vals)))
+    return [dict(zip(PARAMS, combo)) for combo in itertools.product(*values)]
+
+
+def lhs_points(axes: Dict[str, Tuple[float, float, int]], n: int, seed: Optional[int]) -> List[Dict[str, Any]]:
+    """Latin hypercube: every varying axis is cut into n strata, each used exactly once."""
+    rng = np.random.default_rng(seed)
+    cols = {}
+    for name in PARAMS:
+        lo, hi, _ = axes[name]
+        if lo == hi:
+            cols[name] = np.full(n, lo)
+        else:
+            u = (rng.permutation(n) + rng.random(n)) / n
+            cols[name] = lo + u * (hi - lo)
+    return [{name: _cast(name, cols[name][i]) for name in PARAMS} for i in range(n)]
+
+
+# ---------------- Evaluation ----------------
+def evaluate_point(job: Tuple[Dict[str, Any], Tuple[str, ...], bool]) -> Dict[str, Any]:
+    """Worker: exact outcome at one parameter point (runs in a pool process)."""
+    point, policies, with_optimum = job
+    follow = FollowParams(point["threshold"], point["k"], point["floor"], point["ceil"])
+    row = dict(point)
+    for policy in policies:
+        ev = evaluate(policy, None, follow, point["trust"], point["gap"])
+        row[f"escaped_{policy}"] = ev.endings["escaped"]
+    if with_optimum:
+        row["escaped_optimal"] = optimize(follow, point["trust"], point["gap"]).p_escape
+    return row
+
+
+def run_sweep(points: Sequence[Dict[str, Any]], policies: Sequence[str] = ("random", "correct"),
+              with_optimum: bool = False, jobs: Optional[int] = None) -> List[Dict[str, Any]]:
+    jobs = jobs or os.cpu_count() or 1
+    work = [(p, tuple(policies), with_optimum) for p in points]
+    if jobs <= 1 or len(work) < 2:
+        return [evaluate_point(w) for w in work]
+    chunk = max(1, len(work) // (jobs * 8))
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        return list(pool.map(evaluate_point, work, chunksize=chunk))
+
+
+def metric_names(rows: Sequence[Dict[str, Any]]) -> List[str]:
+    return [k for k in rows[0] if k not in PARAMS] if rows else []
+
+
+# ---------------- Output ----------------
+def write_table(rows: Sequence[Dict[str, Any]], out_dir: Path, meta: Dict[str, Any]) -> Tuple[Path, Path]:
+    out_dir.mkdir(parents=True, exist_ok=True)
+    csv_path = out_dir / "sweep.csv"
+    json_path = out_dir / "sweep.json"
+    columns = list(PARAMS) + metric_names(rows)
+
+    with open(csv_path, "w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        w.writerow(columns)
+        for r in rows:
+            w.writerow([r[c] if isinstance(r[c], int) else f"{r[c]:.6g}" for c in columns])
+
+    # JSON keeps it columnar: one list per column
+    data = dict(meta)
+    data["columns"] = {c: [r[c] for r in rows] for c in columns}
+    json_path.write_text(json.dumps(data), encoding="utf-8")
+    return csv_path, json_path
+
+
+def _heat_grid(rows, x: str, y: str, metric: str, bins: int):
+    """Mean metric per (x, y) cell; exact values for grids, `bins` buckets otherwise."""
+    xs = np.array([r[x] for r in rows], dtype=float)
+    ys = np.array([r[y] for r in rows], dtype=float)
+    vs = np.array([r[metric] for r in rows], dtype=float)
+
+    def edges(v):
+        uniq = np.unique(v)
+        if len(uniq) <= bins:
+            return uniq, np.searchsorted(uniq, v)
+        e = np.linspace(v.min(), v.max(), bins + 1)
+        centers = (e[:-1] + e[1:]) * 0.5
+        return centers, np.clip(np.searchsorted(e, v, side="right") - 1, 0, bins - 1)
+
+    xc, xi = edges(xs)
+    yc, yi = edges(ys)
+    total = np.zeros((len(yc), len(xc)))
+    count = np.zeros((len(yc), len(xc)))
+    np.add.at(total, (yi, xi), vs)
+    np.add.at(count, (yi, xi), 1)
+    with np.errstate(invalid="ignore"):
+        return xc, yc, total / count
+
+
+def write_heatmaps(rows: Sequence[Dict[str, Any]], x: str, y: str, out_dir: Path, bins: int = 20) -> List[Path]:
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    paths = []
+    for metric in metric_names(rows):
+        xc, yc, grid = _heat_grid(rows, x, y, metric, bins)
+        fig, ax = plt.subplots(figsize=(7, 5.5))
+        im = ax.imshow(grid, origin="lower", aspect="auto", cmap="viridis", vmin=0.0, vmax=1.0,
+                       extent=_extent(xc, yc))
+        fig.colorbar(im, ax=ax, label=f"P({metric.replace('_', ' | ')})")
+        if grid.size <= 400:
+            for (j, i), v in np.ndenumerate(grid):
+                if np.isfinite(v):
+                    ax.text(xc[i], yc[j], f"{v:.2f}", ha="center", va="center", fontsize=6,
+                            color="white" if v < 0.6 else "black")
+        ax.set_xlabel(x)
+        ax.set_ylabel(y)
+        ax.set_title(f"{metric} (mean over other parameters)")
+        path = out_dir / f"heatmap_{metric}_{x}_{y}.png"
+        fig.tight_layout()
+        fig.savefig(path, dpi=120)
+        plt.close(fig)
+        paths.append(path)
+    return paths
+
+
+def _extent(xc, yc):
+    def span(c):
+        if len(c) == 1:
+            return c[0] - 0.5, c[0] + 0.5
+        step = (c[-1] - c[0]) / (len(c) - 1)
+        return c[0] - step / 2, c[-1] + step / 2
+    (x0, x1), (y0, y1) = span(xc), span(yc)
+    return (x0, x1, y0, y1)
+
+
+def main(argv: Optional[List[str]] = None):
+    ap = argparse.ArgumentParser(description="Sweep follow-model parameters over the exact campaign outcome.")
+    for name in PARAMS:
+        ap.add_argument(f"--{name}", default=None, metavar="SPEC",
+                        help=f"VALUE, LO:HI:COUNT (grid) or LO:HI (with --lhs); default {DEFAULTS[name]}")
+    ap.add_argument("--lhs", type=int, default=0, metavar="N", help="Latin-hypercube sample of N points instead of a grid")
+    ap.add_argument("--seed", type=int, default=None)
+    ap.add_argument("--policy", action="append", choices=POLICIES, default=None,
+                    help="choice policies to evaluate (repeatable; default random + correct)")
+    ap.add_argument("--optimal", action="store_true", help="also compute the escape-maximizing policy's P(escaped)")
+    ap.add_argument("--x", choices=PARAMS, default="threshold", help="heatmap x axis")
+    ap.add_argument("--y", choices=PARAMS, default="k", help="heatmap y axis")
+    ap.add_argument("--bins", type=int, default=20, help="heatmap cells per axis for sampled points")
+    ap.add_argument("--jobs", type=int, default=None, help="worker processes (default: all cores)")
+    ap.add_argument("--out", type=Path, default=OUT_DIR)
+    ap.add_argument("--no-plots", action="store_true")
+    args = ap.parse_args(argv)
+
+    specs = {}
+    for name in PARAMS:
+        spec = getattr(args, name)
+        if spec is None:
+            spec = DEFAULT_SWEEP.get(name, str(DEFAULTS[name])) if not args.lhs else str(DEFAULTS[name])
+        specs[name] = spec
+    axes = {name: parse_axis(name, spec) for name, spec in specs.items()}
+
+    if args.lhs:
+        points = lhs_points(axes, args.lhs, args.seed)
+        mode = "lhs"
+    else:
+        for name, (lo, hi, count) in axes.items():
+            if count == 0:
+                raise SystemExit(f"--{name}: a grid needs LO:HI:COUNT (or use --lhs)")
+        points = grid_points(axes)
+        mode = "grid"
+
+    policies = tuple(args.policy or ("random", "correct"))
+    t0 = time.perf_counter()
+    rows = run_sweep(points, policies, args.optimal, args.jobs)
+    elapsed = time.perf_counter() - t0
+
+    meta = {"mode": mode, "points": len(rows), "specs": specs, "seed": args.seed, "seconds": round(elapsed, 3)}
+    csv_path, json_path = write_table(rows, args.out, meta)
+    print(f"{len(rows)} points ({mode}) in {elapsed:.2f} s -> {csv_path}, {json_path}")
+
+    for metric in metric_names(rows):
+        vals = np.array([r[metric] for r in rows])
+        print(f"  {metric:<18} min {vals.min():.3f}  mean {vals.mean():.3f}  max {vals.max():.3f}")
+
+    if not args.no_plots and rows:
+        try:
+            for path in write_heatmaps(rows, args.x, args.y, args.out, args.bins):
+                print(f"  heatmap -> {path}")
+        except ImportError:
+            print("  (matplotlib not installed: heatmaps skipped)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,7 @@
 from __future__ import annotations
+import time
+_T0 = time.perf_counter()   # startup report: imports are timed from here
+
 from pathlib import Path
 import sys
 
@@ -7,59 +10,122 @@ sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 sys.path.append(str(Path(__file__).resolve().parents[1]))
 
 import pygame
-from audio.bgm import play_bgm
+from audio.bgm import init_mixer, play_bgm
 
 
 from core.config import (
     ASSETS_DIR, WIDTH, HEIGHT, FPS, TILE,
     FONT_PATH, CORNER_IMG_PATH, EDGE_IMG_PATH,
-    FONT_SIZE, LINE_HEIGHT_FACTOR, PADDING_LEFT, PADDING_RIGHT, PADDING_TOP, PADDING_BOTTOM,
-    BOX_FILL_COLOR, BANK_ASSET_DIR, INITIAL_TRUST, INITIAL_POLICE_GAP, RNG_SEED, SCENE_INTRO_BLACK_MS
+    FONT_SIZE, LINE_HEIGHT_FACTOR, TYPEWRITER_CPS, PADDING_LEFT, PADDING_RIGHT, PADDING_TOP, PADDING_BOTTOM,
+    BOX_FILL_COLOR, INITIAL_TRUST, INITIAL_POLICE_GAP, RNG_SEED, SCENE_INTRO_BLACK_MS,
+    SCENE_INTRO_MIN_BLACK_MS,
 )
 
-from scenes.scene_airport_dialogue import SCENE_AIRPORT_CAUGHT, SCENE_AIRPORT_ESCAPED
-from scenes.airport_room import AirportRoomScene
-from core.scene_helpers import select_airport_scene
-
 from dialog_ui import DialogueBox
 from dialogue_engine import GameVars
+from dialogue_graph import compile_scenes
 from core.scene_runner import run_scene
-
-# --- import your scene content & room(s) ---
-from scenes.scene1_vault import SCENE1_VAULT
-from scenes.vault_room import VaultRoomScene
-from scenes.scene3_country_house import SCENE3_MARTHA
-from scenes.country_house_scene import CountryHouseScene
-
-# NEW: Scene 2 (street) dialogue + minimal static room
-from scenes.scene2_street import SCENE2_STREET
-from scenes.street_scene2_static import StreetScene2Static
-
-
-def show_start_screen(screen, WIDTH, HEIGHT, fade_in_ms: int = 0):
+from core.text_cache import render_text
+from core.assets import load_image
+from core.sprite_atlas import load_sprite
+from core.preload import Preload, ScenePreloader
+from core.profiler import PROFILER
+from core.startup import StartupReport
+
+# Scenes and rooms are imported lazily, per campaign entry (see game/campaign.py)
+from game.campaign import CAMPAIGN, all_scenes, entry_preload, entry_scene
+
+
+class MenuAssets:
+    """
+    Start-screen art and title music, streamed in after the first frame: a
+    ScenePreloader reads / decodes them off the main thread, then one stage is
+    installed per frame (background, then Tony and the plane, then the music).
+    Everything stays in the asset caches, so later menu visits are instant.
+    """
+    BG = "general/bg_city_start.png"
+    PLANE = "general/plane.png"
+    TONY = ("general/walk_to_his_right_1.png", "general/walk_to_his_right_2.png")
+    PRELOAD = Preload(images=(PLANE, *TONY), opaque=(BG,))
+
+    def __init__(self, width: int, height: int, bgm: tuple[str, float] | None = None,
+                 report: StartupReport | None = None):
+        self.size = (width, height)
+        self.bgm = bgm
+        self.report = report
+        self.bg_img: pygame.Surface | None = None
+        self.plane_img: pygame.Surface | None = None
+        self.tony_frames: list[pygame.Surface] = []
+        self._stages = [self._load_bg, self._load_sprites] + ([self._start_music] if bgm else [])
+        self._total = len(self._stages)
+        self._loader = ScenePreloader()
+        self._loader.start(self.PRELOAD, bgm=bgm[0] if bgm else None)
+        self._adopted = False
+
+    @property
+    def done(self) -> bool:
+        return not self._stages
+
+    @property
+    def progress(self) -> float:
+        """0..1: half for the background loader, half for the installed stages."""
+        loaded = 1.0 if self._loader.ready else 0.0
+        return 0.5 * loaded + 0.5 * (1.0 - len(self._stages) / max(1, self._total))
+
+    def step(self):
+        """Install the next stage once the loader is done (call once per frame)."""
+        if not self._stages or not self._loader.ready:
+            return
+        if not self._adopted:
+            self._loader.finish()     # convert to the display format, into the cache
+            self._adopted = True
+        self._stages.pop(0)()
+        if not self._stages and self.report:
+            self.report.done()
+
+    def _load_bg(self):
+        self.bg_img = load_image(self.BG, size=self.size, convert="opaque")
+        if self.report:
+            self.report.mark("menu background")
+
+    def _load_sprites(self):
+        self.plane_img = load_sprite(self.PLANE, factor=1 / 6)
+        self.tony_frames = [load_sprite(p) for p in self.TONY]
+        if self.report:
+            self.report.mark("menu sprites")
+
+    def _start_music(self):
+        # Audio (and the rest of pygame.init) is opened here, after the menu is up
+        try:
+            init_mixer()
+        except pygame.error:
+            pass
+        pygame.init()
+        try:
+            play_bgm(self.bgm[0], volume=self.bgm[1])
+        except pygame.error:
+            pass
+        if self.report:
+            self.report.mark("title music")
+
+
+def show_start_screen(screen, WIDTH, HEIGHT, fade_in_ms: int = 0, bgm: tuple[str, float] | None = None,
+                      report: StartupReport | None = None):
     clock = pygame.time.Clock()
 
     # --- Fonts ---
     font = pygame.font.Font(FONT_PATH, 48)
     small_font = pygame.font.Font(FONT_PATH, 28)
     tiny_font = pygame.font.Font(FONT_PATH, 20)
+    if report:
+        report.mark("fonts")
 
-    # --- Images ---
-    bg_img = pygame.image.load("./assets/general/bg_city_start.png").convert()
-    bg_img = pygame.transform.scale(bg_img, (WIDTH, HEIGHT))
-
-    plane_img = pygame.image.load("./assets/general/plane.png").convert_alpha()
-    plane_img = pygame.transform.scale(
-        plane_img, (plane_img.get_width() // 6, plane_img.get_height() // 6)
-    )
-    plane_rect = plane_img.get_rect(midright=(WIDTH + 50, 50))
-
-    tony_img1 = pygame.image.load("./assets/general/walk_to_his_right_1.png").convert_alpha()
-    tony_img2 = pygame.image.load("./assets/general/walk_to_his_right_2.png").convert_alpha()
-    tony_frames = [tony_img1, tony_img2]
+    # --- Images & music: streamed in after the first frame (see MenuAssets) ---
+    assets = MenuAssets(WIDTH, HEIGHT, bgm=bgm, report=report)
+    plane_rect: pygame.Rect | None = None
+    tony_rect: pygame.Rect | None = None
     tony_frame_index = 0
     tony_anim_timer = 0
-    tony_rect = tony_img1.get_rect(midbottom=(0, HEIGHT - 20))
 
     # --- Static layout for texts & button ---
     title_y = HEIGHT // 2 - 200
@@ -72,6 +138,7 @@ def show_start_screen(screen, WIDTH, HEIGHT, fade_in_ms: int = 0):
     start_rect = pygame.Rect(btn_x, btn_y, btn_w, btn_h)
 
     quit_y = btn_y + btn_h + 50
+    progress_rect = pygame.Rect(btn_x, btn_y + btn_h + 14, btn_w, 8)
 
     # --- Motion params (frame-based like your original) ---
     plane_speed = 3   # px/frame
@@ -83,53 +150,76 @@ def show_start_screen(screen, WIDTH, HEIGHT, fade_in_ms: int = 0):
     fade_elapsed = 0
     fading = fade_in_ms > 0
 
+    PROFILER.begin_scene("menu")
+    first_frame = True
+    start_requested = False   # Start pressed before the menu finished loading
     running = True
     while running:
         dt = clock.tick(60)
+        PROFILER.begin_frame()
 
         # --- Input ---
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 pygame.quit()
                 sys.exit(0)
+            elif PROFILER.handle_event(event):
+                continue
             elif event.type == pygame.KEYDOWN:
                 if event.key in (pygame.K_RETURN, pygame.K_SPACE):
-                    return
+                    start_requested = True
                 elif event.key == pygame.K_q:
                     pygame.quit()
                     sys.exit(0)
             elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
                 if start_rect.collidepoint(event.pos):
-                    return
+                    start_requested = True
+        PROFILER.mark("events")
 
-        # --- Update animations ---
-        plane_rect.x -= plane_speed
-        if plane_rect.right < 0:
-            plane_rect.left = WIDTH + 100
-
-        tony_rect.x += tony_speed
-        if tony_rect.left > WIDTH:
-            tony_rect.right = 0
+        # --- Stream in the next asset stage ---
+        if not first_frame:
+            assets.step()
+        if start_requested and assets.done:
+            return
 
-        tony_anim_timer += 1
-        if tony_anim_timer >= 10:
-            tony_anim_timer = 0
-            tony_frame_index = (tony_frame_index + 1) % len(tony_frames)
-        current_tony = tony_frames[tony_frame_index]
+        # --- Update animations ---
+        if assets.plane_img is not None:
+            if plane_rect is None:
+                plane_rect = assets.plane_img.get_rect(midright=(WIDTH + 50, 50))
+            plane_rect.x -= plane_speed
+            if plane_rect.right < 0:
+                plane_rect.left = WIDTH + 100
+
+        if assets.tony_frames:
+            if tony_rect is None:
+                tony_rect = assets.tony_frames[0].get_rect(midbottom=(0, HEIGHT - 20))
+            tony_rect.x += tony_speed
+            if tony_rect.left > WIDTH:
+                tony_rect.right = 0
+
+            tony_anim_timer += 1
+            if tony_anim_timer >= 10:
+                tony_anim_timer = 0
+                tony_frame_index = (tony_frame_index + 1) % len(assets.tony_frames)
+
+        PROFILER.mark("update")
 
         # --- Draw ---
         screen.fill((10, 15, 35))
-        screen.blit(bg_img, (0, 0))
+        if assets.bg_img is not None:
+            screen.blit(assets.bg_img, (0, 0))
 
         # moving bits
-        screen.blit(plane_img, plane_rect)
-        screen.blit(current_tony, tony_rect)
+        if plane_rect is not None:
+            screen.blit(assets.plane_img, plane_rect)
+        if tony_rect is not None:
+            screen.blit(assets.tony_frames[tony_frame_index], tony_rect)
 
         # texts
-        title = font.render("SHADOW TONY", True, (255, 255, 255))
-        subtitle = small_font.render("Can he get out ?", True, (200, 200, 200))
-        group_text = tiny_font.render("GROUPE 16", True, (120, 120, 255))
-        quit_text = tiny_font.render("Appuie sur Q pour quitter", True, (200, 180, 180))
+        title = render_text(font, "SHADOW TONY", True, (255, 255, 255))
+        subtitle = render_text(small_font, "Can he get out ?", True, (200, 200, 200))
+        group_text = render_text(tiny_font, "GROUPE 16", True, (120, 120, 255))
+        quit_text = render_text(tiny_font, "Appuie sur Q pour quitter", True, (200, 180, 180))
 
         screen.blit(title, ((WIDTH - title.get_width()) // 2, title_y))
         screen.blit(subtitle, ((WIDTH - subtitle.get_width()) // 2, subtitle_y))
@@ -140,12 +230,21 @@ def show_start_screen(screen, WIDTH, HEIGHT, fade_in_ms: int = 0):
         btn_color = (80, 200, 100) if hover else (60, 180, 80)
         pygame.draw.rect(screen, btn_color, start_rect, border_radius=12)
         pygame.draw.rect(screen, (0, 0, 0), start_rect, width=2, border_radius=12)
-        btn_text = small_font.render("START GAME", True, (0, 0, 0))
+        btn_text = render_text(small_font, "START GAME", True, (0, 0, 0))
         text_rect = btn_text.get_rect(center=start_rect.center)
         screen.blit(btn_text, text_rect)
 
+        # loading progress, only if Start was pressed before everything was in
+        if start_requested:
+            fill = progress_rect.copy()
+            fill.width = max(1, int(progress_rect.width * assets.progress))
+            pygame.draw.rect(screen, (20, 20, 20), progress_rect, border_radius=4)
+            pygame.draw.rect(screen, (230, 230, 230), fill, border_radius=4)
+            loading = render_text(tiny_font, "Chargement...", True, (230, 230, 230))
+            screen.blit(loading, loading.get_rect(midtop=(WIDTH // 2, progress_rect.bottom + 6)))
+
         # quit hint
-        quit_rect = quit_text.get_rect(center=(WIDTH // 2, quit_y))
+        quit_rect = quit_text.get_rect(center=(WIDTH // 2, quit_y + (30 if start_requested else 0)))
         screen.blit(quit_text, quit_rect)
 
         # fade-in overlay on top
@@ -157,8 +256,16 @@ def show_start_screen(screen, WIDTH, HEIGHT, fade_in_ms: int = 0):
             screen.blit(overlay, (0, 0))
             if fade_elapsed >= fade_in_ms:
                 fading = False
+        PROFILER.mark("draw")
+        PROFILER.draw(screen)
 
         pygame.display.flip()
+        PROFILER.mark("flip")
+        PROFILER.end_frame()
+        if first_frame:
+            first_frame = False
+            if report:
+                report.mark("first frame")
 
 def _run_country_house_debug(screen, gvars):
     import pygame
@@ -201,44 +308,21 @@ def _run_country_house_debug(screen, gvars):
         pygame.display.flip()
 
 
-def make_room_scene1(win_w, win_h, gvars):
-    return VaultRoomScene(
-        win_w=win_w, win_h=win_h,
-        bank_asset_dir=BANK_ASSET_DIR,
-        hud_font_path=FONT_PATH,
-        game_vars=gvars
-    )
-
-# Kept as-is for the country house (Martha) scene
-def make_room_scene2(win_w, win_h, gvars):
-    return CountryHouseScene(win_w, win_h, gvars)
-
-
-def make_room_scene2_street(win_w, win_h, gvars):
-    return StreetScene2Static(win_w, win_h, gvars)
-
+def _start_preload(preloader: ScenePreloader, entry, gvars):
+    # the room module is imported on the worker, with the rest of the preload
+    preloader.start(lambda: entry_preload(entry), scene_def=entry_scene(entry, gvars),
+                    bgm=entry.get("bgm"), win_size=(WIDTH, HEIGHT))
 
-def make_room_airport(win_w, win_h, gvars):
-    return AirportRoomScene(
-        win_w=win_w,
-        win_h=win_h,
-        gvars=gvars,
-        hud_font_path=FONT_PATH
-    )
 
-CAMPAIGN = [
-    {"id": "scene1_vault", "scene": SCENE1_VAULT, "room_factory": make_room_scene1},
-    {"id": "scene2_street", "scene": SCENE2_STREET, "room_factory": make_room_scene2_street, "bgm": "scene2.mp3", "bgm_volume": 0.6},
-    {"id": "martha_scene",  "scene": SCENE3_MARTHA, "room_factory": make_room_scene2, "bgm": "scene3.mp3", "bgm_volume": 0.6},
-    {"id": "scene4_airport","scene": select_airport_scene, "room_factory": make_room_airport, "bgm": "scene4.mp3", "bgm_volume": 0.5},
-]
 
-
-
-def _black_pause(screen: pygame.Surface, ms: int):
+def _black_pause(screen: pygame.Surface, ms: int, preloader: ScenePreloader | None = None,
+                 min_ms: int = 0):
+    """Black frames for `ms`, or only until the preload is ready (but at least `min_ms`)."""
     clock = pygame.time.Clock()
     elapsed = 0
     while elapsed < ms:
+        if preloader is not None and preloader.ready and elapsed >= min_ms:
+            break
         for ev in pygame.event.get():
             if ev.type == pygame.QUIT:
                 pygame.quit()
@@ -287,6 +371,10 @@ def run_end_sequence(screen: pygame.Surface, dialog: DialogueBox, outcome: str):
                     pygame.quit()
                     sys.exit(0)
                 elif ev.key in (pygame.K_SPACE, pygame.K_RETURN):
+                    # Typewriter still running: show the rest of the page first
+                    if dialog.is_revealing():
+                        dialog.skip_reveal()
+                        continue
                     # First paginate within the same bubble
                     done_page = dialog.advance()
                     if done_page:
@@ -297,6 +385,8 @@ def run_end_sequence(screen: pygame.Surface, dialog: DialogueBox, outcome: str):
                             break
                         dialog.set_text(messages[idx])
 
+        dialog.update(dt)
+
         # Draw: black + dialogue box
         screen.fill((0, 0, 0))
         dialog.draw(screen, color=(255, 255, 255))
@@ -306,16 +396,31 @@ def run_end_sequence(screen: pygame.Surface, dialog: DialogueBox, outcome: str):
     show_start_screen(screen, WIDTH, HEIGHT, fade_in_ms=1200)
 
 def main():
-    pygame.init()
+    report = StartupReport(_T0, echo="--startup-report" in sys.argv)
+    report.mark("imports")
+    if "--profile" in sys.argv:
+        PROFILER.enable()
+
+    # Show-first boot: only what the first menu frame needs (window + fonts); audio
+    # and the rest of pygame.init() come with the title music (MenuAssets)
+    pygame.display.init()
+    pygame.font.init()
+    report.mark("pygame.init")
     screen = pygame.display.set_mode((WIDTH, HEIGHT))
     pygame.display.set_caption("Tony – Campaign")
+    report.mark("window")
 
     first_cycle = True  # first time we show the menu without our manual fade
 
     while True:
-        # --- Show the start menu and play the title music ---
-        play_bgm("scene1.mp3", volume=0.5)
-        show_start_screen(screen, WIDTH, HEIGHT, fade_in_ms=0 if first_cycle else 1200)
+        # --- Show the start menu; its art and the title music stream in ---
+        show_start_screen(screen, WIDTH, HEIGHT, fade_in_ms=0 if first_cycle else 1200,
+                          bgm=("scene1.mp3", 0.5), report=report if first_cycle else None)
+
+        # Validate every dialogue graph before the run (a broken scene fails here, not
+        # mid-playthrough); done after the menu is up to keep it off the time-to-menu
+        if first_cycle:
+            compile_scenes(*all_scenes())
 
         # Fresh dialogue box & game variables for a new run
         dialog = DialogueBox(
@@ -324,7 +429,7 @@ def main():
             padding_left=PADDING_LEFT, padding_right=PADDING_RIGHT,
             padding_top=PADDING_TOP, padding_bottom=PADDING_BOTTOM,
             corner_img_path=CORNER_IMG_PATH, edge_img_path=EDGE_IMG_PATH, tile=TILE,
-            fill_color=BOX_FILL_COLOR
+            fill_color=BOX_FILL_COLOR, typewriter_cps=TYPEWRITER_CPS
         )
         gvars = GameVars(trust=INITIAL_TRUST, police_gap=INITIAL_POLICE_GAP)
 
@@ -335,20 +440,27 @@ def main():
             return
 
         # --- Run the campaign once ---
-        for entry in CAMPAIGN:
-            _black_pause(screen, SCENE_INTRO_BLACK_MS)
-
-            scene_def_or_fn = entry["scene"]
-            scene_def = scene_def_or_fn(gvars) if callable(scene_def_or_fn) else scene_def_or_fn
+        # Each entry's assets are decoded during the previous scene's ending and the
+        # black pause, which lasts until they are ready (or SCENE_INTRO_BLACK_MS)
+        preloader = ScenePreloader()
+        _start_preload(preloader, CAMPAIGN[0], gvars)
+        for i, entry in enumerate(CAMPAIGN):
+            _black_pause(screen, SCENE_INTRO_BLACK_MS, preloader, min_ms=SCENE_INTRO_MIN_BLACK_MS)
+            preloader.finish()      # convert on this thread, into the asset cache
+
+            scene_def = entry_scene(entry, gvars)
             factory = entry["room_factory"]
+            nxt = CAMPAIGN[i + 1] if i + 1 < len(CAMPAIGN) else None
 
             bgm_name = entry.get("bgm")
             if bgm_name:
                 play_bgm(bgm_name, volume=float(entry.get("bgm_volume", 0.7)))
 
-            run_scene(screen, dialog, scene_def, factory, gvars, fps=FPS, rng_seed=None)
+            run_scene(screen, dialog, scene_def, factory, gvars, fps=FPS, rng_seed=None,
+                      on_finishing=(lambda nxt=nxt: _start_preload(preloader, nxt, gvars)) if nxt else None)
 
             for ev in pygame.event.get(pygame.QUIT):
+                preloader.cancel()
                 pygame.quit()
                 return
 
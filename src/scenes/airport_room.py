@@ -2,7 +2,10 @@
 import os
 import random
 import pygame
-from core.config import WIDTH, HEIGHT
+from core.config import WIDTH
+from core.assets import resolve_asset
+from core.sprite_atlas import load_sprite
+from core.preload import Preload
 
 # =========================
 # Tunables
@@ -36,7 +39,7 @@ PLANE_CLIMB_SPEED = 140.0            # px/s upward while climbing
 GROUND_Y_FROM_BOTTOM = 100
 
 # --- Police cars (spawn when the plane starts climbing) ---
-POLICE_IMG_PATH = ("assets/general/police_side.png")  # faces LEFT
+POLICE_IMG_PATH = "general/police_side.png"  # faces LEFT (relative to ASSETS_DIR)
 POLICE_SCALE_FACTOR = 1.0 / 2.5                        # match the hero car scale
 
 # Left-side police (moves LEFT)
@@ -57,9 +60,65 @@ POLICE3_Y = 600
 POLICE3_END_X = WIDTH - 450
 POLICE3_SPEED = 520.0
 
-# ------------ Tiny helpers ------------
-def _load(path):
-    return pygame.image.load(path).convert_alpha()
+# Skyline parallax while the plane climbs (px of skyline drift per px climbed; 0 disables)
+SKYLINE_PARALLAX = 0.12
+
+# ------------ Baked backdrop ------------
+# The procedural skyline is deterministic, so it is rendered once per window size
+# and shared by every AirportRoomScene instance (replays included).
+_BACKDROP_CACHE: dict[tuple[int, int], dict[str, pygame.Surface]] = {}
+
+def _render_backdrop(w: int, h: int) -> dict[str, pygame.Surface]:
+    """Layers: 'sky' (gradient), 'skyline' (buildings + hills), 'ground' (grass, road, trees), 'full'."""
+    sky = pygame.Surface((w, h))
+    for y in range(0, h, 8):
+        shade = 20 + (y // 8) * 2
+        pygame.draw.rect(sky, (15, 15, 40 + shade), (0, y, w, 8))
+
+    skyline = pygame.Surface((w, h), pygame.SRCALPHA)
+    rng = random.Random(1)  # local RNG: never touches the global random state
+    for bx in range(0, w, 120):
+        bw = 80
+        bh = rng.randint(120, 220)
+        bx_pos = bx + 20
+        by_pos = 380 - bh
+        pygame.draw.rect(skyline, (30, 30, 50), (bx_pos, by_pos, bw, bh))
+        for wx in range(bx_pos + 5, bx_pos + bw - 5, 12):
+            for wy in range(by_pos + 5, by_pos + bh - 5, 14):
+                if rng.random() < 0.4:
+                    pygame.draw.rect(skyline, (255, 240, 150), (wx, wy, 6, 8))
+
+    pygame.draw.polygon(skyline, (40, 20, 60),
+                        [(0, 380), (150, 300), (300, 380), (450, 280),
+                         (650, 360), (800, 300), (960, 370),
+                         (960, h), (0, h)])
+
+    ground = pygame.Surface((w, h), pygame.SRCALPHA)
+    pygame.draw.rect(ground, (30, 80, 40), (0, h - 200, w, 200))
+    pygame.draw.rect(ground, (60, 60, 60), (0, h - 120, w, 120))
+    for x in range(0, w, 80):
+        pygame.draw.rect(ground, (200, 200, 200), (x + 20, h - 80, 40, 6))
+    for x in [120, 300, 500, 720, 880]:
+        pygame.draw.rect(ground, (100, 60, 30), (x, h - 200, 16, 40))
+        pygame.draw.circle(ground, (20, 100, 40), (x + 8, h - 210), 30)
+
+    full = sky.copy()
+    full.blit(skyline, (0, 0))
+    full.blit(ground, (0, 0))
+
+    return {
+        "sky": sky.convert(),
+        "skyline": skyline.convert_alpha(),
+        "ground": ground.convert_alpha(),
+        "full": full.convert(),
+    }
+
+def _get_backdrop(w: int, h: int) -> dict[str, pygame.Surface]:
+    layers = _BACKDROP_CACHE.get((w, h))
+    if layers is None:
+        layers = _render_backdrop(w, h)
+        _BACKDROP_CACHE[(w, h)] = layers
+    return layers
 
 class Entity:
     def __init__(self, x, y, surf: pygame.Surface):
@@ -110,64 +169,46 @@ class AirportRoomScene:
       - police spawn ~1s earlier than the climb trigger
       - plane does NOT climb; it stops exactly at the trigger point
     """
+    # Sources loaded by __init__ (for the campaign's scene preloader)
+    PRELOAD = Preload(images=(
+        "general/plane.png", "airport/car_side.png", "general/walk_upfront_1.png",
+        "general/walk_to_his_right_1.png", "general/walk_to_his_right_2.png", POLICE_IMG_PATH,
+    ))
+
     def __init__(self, win_w, win_h, gvars, hud_font_path=None):
         self.win_w, self.win_h = win_w, win_h
         self.gvars = gvars
 
-        # --- Art assets ---
-        base = os.path.dirname(__file__)
-
+        # --- Art assets (sprite atlas subsurfaces, paths from ASSETS_DIR) ---
         # Plane
-        plane_path_1 = os.path.join(base, "..", "..", "assets", "general", "avion.png")
-        plane_path_2 = os.path.join(base, "..", "..", "assets", "general", "plane.png")
-        plane_path = plane_path_1 if os.path.exists(plane_path_1) else plane_path_2
-        plane = _load(plane_path)
-        plane = pygame.transform.scale(plane, (win_w // 4, win_h // 3))
+        plane_path = "general/avion.png" if os.path.exists(resolve_asset("general/avion.png")) else "general/plane.png"
+        plane = load_sprite(plane_path, size=(win_w // 4, win_h // 3))
         self.plane = Entity(0, 0, plane)
 
         # Default plane anchor before overrides
         plane_rect = plane.get_rect(midbottom=(win_w - 200, win_h - 100))
         self.plane.x, self.plane.y = float(plane_rect.x), float(plane_rect.y)
 
-        # Car
-        car_path = os.path.join(base, "..", "..", "assets", "airport", "car_side.png")
-        car_img = _load(car_path)
-        car_img = pygame.transform.flip(car_img, True, False)
-        car_img = pygame.transform.smoothscale(
-            car_img,
-            (max(1, int(car_img.get_width() * POLICE_SCALE_FACTOR)),
-             max(1, int(car_img.get_height() * POLICE_SCALE_FACTOR)))
-        )
+        # Car (asset faces left; mirrored to drive right)
+        car_img = load_sprite("airport/car_side.png", factor=POLICE_SCALE_FACTOR, flip_x=True, smooth=True)
         self.car = Entity(-car_img.get_width(), 0, car_img)
 
         # Tony sprites
-        gen = os.path.join(base, "..", "..", "assets", "general")
-        self.tony_front    = _load(os.path.join(gen, "walk_upfront_1.png"))
-        self.tony_walk_r_1 = _load(os.path.join(gen, "walk_to_his_right_1.png"))
-        self.tony_walk_r_2 = _load(os.path.join(gen, "walk_to_his_right_2.png"))
-
-        def _scale_h(img, h=48):
-            w0, h0 = img.get_size()
-            if h0 == 0: return img
-            w = max(1, int(round(w0 * (h / h0))))
-            return pygame.transform.scale(img, (w, h))
-
-        self.tony_front     = _scale_h(self.tony_front,   48)
-        self.tony_walk_r_1  = _scale_h(self.tony_walk_r_1,48)
-        self.tony_walk_r_2  = _scale_h(self.tony_walk_r_2,48)
+        self.tony_front    = load_sprite("general/walk_upfront_1.png", height=48)
+        self.tony_walk_r_1 = load_sprite("general/walk_to_his_right_1.png", height=48)
+        self.tony_walk_r_2 = load_sprite("general/walk_to_his_right_2.png", height=48)
 
         self.tony = Entity(0, 0, self.tony_front)
         self.tony_visible = False
 
         # Police art (base faces LEFT; flip for right-going)
-        police_raw = _load(POLICE_IMG_PATH)
-        police_raw = pygame.transform.smoothscale(
-            police_raw,
-            (max(1, int(police_raw.get_width() * POLICE_SCALE_FACTOR)),
-             max(1, int(police_raw.get_height() * POLICE_SCALE_FACTOR)))
-        )
-        self._police_left_img = police_raw
-        self._police_right_img = pygame.transform.flip(police_raw, True, False)
+        self._police_left_img = load_sprite(POLICE_IMG_PATH, factor=POLICE_SCALE_FACTOR, smooth=True)
+        self._police_right_img = load_sprite(POLICE_IMG_PATH, factor=POLICE_SCALE_FACTOR, smooth=True,
+                                            flip_x=True)
+
+        # Static backdrop (baked once per window size)
+        self._backdrop = _get_backdrop(win_w, win_h)
+        self._plane_climb_start_y: float | None = None
 
         # Active police cars list (spawned at climb/alt trigger)
         self.police: list[PoliceCar] = []
@@ -416,6 +457,7 @@ class AirportRoomScene:
                     # Trigger climb + spawn police at trigger
                     if not self._plane_started_climb and (self.plane.x + self.plane.w * 0.5) <= trigger_cx:
                         self._plane_started_climb = True
+                        self._plane_climb_start_y = self.plane.y
                         self._spawn_police_if_needed()
 
                     if self._plane_started_climb:
@@ -471,35 +513,15 @@ class AirportRoomScene:
                 p.update(dt)
 
     def draw(self, screen):
-        # Background
-        for y in range(0, HEIGHT, 8):
-            shade = 20 + (y // 8) * 2
-            pygame.draw.rect(screen, (15, 15, 40 + shade), (0, y, WIDTH, 8))
-
-        random.seed(1)
-        for bx in range(0, WIDTH, 120):
-            bw = 80
-            bh = random.randint(120, 220)
-            bx_pos = bx + 20
-            by_pos = 380 - bh
-            pygame.draw.rect(screen, (30, 30, 50), (bx_pos, by_pos, bw, bh))
-            for wx in range(bx_pos + 5, bx_pos + bw - 5, 12):
-                for wy in range(by_pos + 5, by_pos + bh - 5, 14):
-                    if random.random() < 0.4:
-                        pygame.draw.rect(screen, (255, 240, 150), (wx, wy, 6, 8))
-
-        pygame.draw.polygon(screen, (40, 20, 60),
-                            [(0, 380), (150, 300), (300, 380), (450, 280),
-                             (650, 360), (800, 300), (960, 370),
-                             (960, HEIGHT), (0, HEIGHT)])
-
-        pygame.draw.rect(screen, (30, 80, 40), (0, HEIGHT - 200, WIDTH, 200))
-        pygame.draw.rect(screen, (60, 60, 60), (0, HEIGHT - 120, WIDTH, 120))
-        for x in range(0, WIDTH, 80):
-            pygame.draw.rect(screen, (200, 200, 200), (x + 20, HEIGHT - 80, 40, 6))
-        for x in [120, 300, 500, 720, 880]:
-            pygame.draw.rect(screen, (100, 60, 30), (x, HEIGHT - 200, 16, 40))
-            pygame.draw.circle(screen, (20, 100, 40), (x + 8, HEIGHT - 210), 30)
+        # Background: one blit of the baked backdrop, or 3 layers while the skyline scrolls
+        layers = self._backdrop
+        skyline_dy = self._skyline_offset()
+        if skyline_dy == 0:
+            screen.blit(layers["full"], (0, 0))
+        else:
+            screen.blit(layers["sky"], (0, 0))
+            screen.blit(layers["skyline"], (0, skyline_dy))
+            screen.blit(layers["ground"], (0, 0))
 
         # Draw order: plane (back), car, Tony, then police
         screen.blit(self.plane.surf, (int(self.plane.x), int(self.plane.y)))
@@ -507,4 +529,10 @@ class AirportRoomScene:
         if self.tony_visible:
             self.tony.draw(screen)
         for p in self.police:
-            p.draw(screen)
\ No newline at end of file
+            p.draw(screen)
+
+    def _skyline_offset(self) -> int:
+        if not SKYLINE_PARALLAX or self._plane_climb_start_y is None:
+            return 0
+        climbed = max(0.0, self._plane_climb_start_y - self.plane.y)
+        return int(climbed * SKYLINE_PARALLAX)
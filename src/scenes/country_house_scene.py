@@ -2,11 +2,17 @@
 from __future__ import annotations
 from pathlib import Path
 from typing import Optional, Callable
+import hashlib
+import json
+import os
+import xml.etree.ElementTree as ET
 import pygame
-from core.config import ASSETS_DIR, GENERAL_ASSET_DIR, FONT_PATH
+from core.config import ASSETS_DIR, GENERAL_ASSET_DIR, FONT_PATH, CACHE_DIR
 from core.actor_sprite import (
+    CAR_FRAME_FILES, TONY_FRAME_FILES,
     create_car_animator, create_grandma_animator, create_police_animator, create_tony_animator
 )
+from core.preload import Preload
 
 # --- TMX optional ---
 try:
@@ -45,6 +51,16 @@ TONY_STEP_TO_STAND = ( -8, 0)
 
 MARTHA_STEP_PX = 24  # one “step” in screen pixels (we’ll take 2 steps → 48 px)
 
+VILLAGE_TMX_PATH = ASSETS_DIR / "village" / "Village.tmx"
+
+# Rendered map cache (raw RGBA + transform metadata), keyed by source mtimes + window size
+MAP_CACHE_DIR     = CACHE_DIR / "village_map"
+MAP_CACHE_VERSION = 2
+
+# Day/night map variants (the tileset ships matching "- DAY" / "- NIGHT" tiles)
+NIGHT_REVEAL_MS     = 1500   # after the night cut, black → night map
+NIGHT_CROSSFADE_MS  = 900    # night ↔ day crossfade when the night ends
+
 # ======================================================
 # Helpers
 # ======================================================
@@ -57,7 +73,26 @@ def _blit_tile(surface, img, x, y, tile_h, tileset_off):
     y += (tile_h - img.get_height())
     surface.blit(img, (x + tox, y + toy))
 
-def _render_tmx_raw(tmx) -> pygame.Surface:
+def _variant_gid_map(tmx, variant: str) -> dict[int, int]:
+    """
+    gid → gid remap that swaps every '- DAY' tile for its '- NIGHT' twin (variant='night').
+    'day' keeps the map as authored (it mixes a few night tiles on purpose).
+    """
+    if variant != "night":
+        return {}
+    props = getattr(tmx, "tile_properties", {}) or {}
+    by_source = {p.get("source"): gid for gid, p in props.items() if p.get("source")}
+    remap = {}
+    for gid, p in props.items():
+        src = p.get("source") or ""
+        if " - DAY." in src:
+            night_gid = by_source.get(src.replace(" - DAY.", " - NIGHT."))
+            if night_gid:
+                remap[gid] = night_gid
+    return remap
+
+def _render_tmx_raw(tmx, gid_map: Optional[dict[int, int]] = None) -> pygame.Surface:
+    gid_map = gid_map or {}
     tw, th = tmx.tilewidth, tmx.tileheight
     map_w = tmx.width * tw
     map_h = tmx.height * th
@@ -73,6 +108,7 @@ def _render_tmx_raw(tmx) -> pygame.Surface:
             for x, y, gid in layer:
                 if not gid:
                     continue
+                gid = gid_map.get(gid, gid)
                 img = tmx.get_tile_image_by_gid(gid)
                 if not img:
                     continue
@@ -85,10 +121,11 @@ def _render_tmx_raw(tmx) -> pygame.Surface:
         elif isinstance(layer, pytmx.TiledObjectGroup):
             for obj in layer:
                 if hasattr(obj, "gid") and obj.gid:
-                    img = tmx.get_tile_image_by_gid(obj.gid)
+                    gid = gid_map.get(obj.gid, obj.gid)
+                    img = tmx.get_tile_image_by_gid(gid)
                     if not img:
                         continue
-                    ts = tmx.get_tileset_from_gid(obj.gid)
+                    ts = tmx.get_tileset_from_gid(gid)
                     tileset_off = getattr(ts, "tileoffset", (0, 0)) or (0, 0)
                     x = int(obj.x + ox)
                     y = int(obj.y + oy)
@@ -98,6 +135,87 @@ def _render_tmx_raw(tmx) -> pygame.Surface:
 
     return raw
 
+# ---------- Rendered map disk cache ----------
+def _tmx_dependencies(tmx_path: Path) -> list[Path]:
+    """TMX file + external TSX files + every tileset image they reference."""
+    deps = [tmx_path]
+    try:
+        root = ET.parse(tmx_path).getroot()
+    except Exception:
+        return deps
+    for ts in root.iter("tileset"):
+        base = tmx_path.parent
+        src = ts.get("source")
+        if src:
+            tsx_path = base / src
+            deps.append(tsx_path)
+            try:
+                ts = ET.parse(tsx_path).getroot()
+                base = tsx_path.parent
+            except Exception:
+                continue
+        for image in ts.iter("image"):
+            if image.get("source"):
+                deps.append(base / image.get("source"))
+    for image in root.iter("image"):
+        if image.get("source"):
+            deps.append(tmx_path.parent / image.get("source"))
+    return deps
+
+def _map_cache_key(tmx_path: Path, size: tuple[int, int], variant: str = "day") -> str:
+    h = hashlib.sha1(f"v{MAP_CACHE_VERSION}:{variant}:{size[0]}x{size[1]}".encode())
+    for dep in _tmx_dependencies(tmx_path):
+        try:
+            st = dep.stat()
+            h.update(f"{dep.name}:{st.st_mtime_ns}:{st.st_size};".encode())
+        except OSError:
+            h.update(f"{dep.name}:missing;".encode())
+    return h.hexdigest()[:20]
+
+# key -> (meta, bytes) read ahead by prefetch_map_cache() on the preloader thread
+_PREFETCHED_MAPS: dict[str, tuple[dict, bytes]] = {}
+
+def _read_cached_map(key: str) -> tuple[dict, bytes]:
+    meta = json.loads((MAP_CACHE_DIR / f"{key}.json").read_text(encoding="utf-8"))
+    return meta, (MAP_CACHE_DIR / f"{key}.rgba").read_bytes()
+
+def prefetch_map_cache(win_w: int, win_h: int) -> int:
+    """Reads the cached day/night maps for this window size (no display access)."""
+    n = 0
+    for variant in ("day", "night"):
+        key = _map_cache_key(VILLAGE_TMX_PATH, (win_w, win_h), variant)
+        if key in _PREFETCHED_MAPS:
+            continue
+        try:
+            _PREFETCHED_MAPS[key] = _read_cached_map(key)
+            n += 1
+        except Exception:
+            pass
+    return n
+
+def _load_cached_map(key: str):
+    """Returns (surface, meta) or None when there is no valid cache entry."""
+    try:
+        meta, data = _PREFETCHED_MAPS.pop(key, None) or _read_cached_map(key)
+        size = tuple(meta["size"])
+        surf = pygame.image.frombuffer(data, size, "RGBA").convert()
+        return surf, meta
+    except Exception:
+        return None
+
+def _store_cached_map(key: str, surf: pygame.Surface, meta: dict):
+    try:
+        MAP_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        meta = dict(meta, size=list(surf.get_size()))
+        data_path = MAP_CACHE_DIR / f"{key}.rgba"
+        tmp = data_path.with_suffix(".rgba.tmp")
+        tmp.write_bytes(pygame.image.tobytes(surf, "RGBA"))
+        os.replace(tmp, data_path)
+        # metadata last: its presence marks the entry as complete
+        (MAP_CACHE_DIR / f"{key}.json").write_text(json.dumps(meta), encoding="utf-8")
+    except Exception:
+        pass
+
 def _facing_from_vec(vx: float, vy: float) -> str:
     # Prefer horizontal when equal/similar
     if abs(vx) >= abs(vy):
@@ -109,6 +227,11 @@ def _facing_from_vec(vx: float, vy: float) -> str:
 # Scene
 # ======================================================
 class CountryHouseScene:
+    # Loaded by __init__ (for the campaign's scene preloader); the TMX map comes
+    # from the rendered map cache once it exists
+    PRELOAD = Preload(images=TONY_FRAME_FILES + CAR_FRAME_FILES, sheets=("granny", "police"),
+                      warm=prefetch_map_cache)
+
     def __init__(self, win_w: int, win_h: int, gvars):
         self.win_w, self.win_h = win_w, win_h
         self.gvars = gvars
@@ -130,8 +253,13 @@ class CountryHouseScene:
         self._bg_dur_ms   = 0
 
 
-        # TMX to fullscreen
-        self.map_surface = self._render_tmx_fullscreen(ASSETS_DIR / "village" / "Village.tmx")
+        # TMX to fullscreen (day as authored + baked night variant)
+        tmx_path = VILLAGE_TMX_PATH
+        self.map_surface = self._render_tmx_fullscreen(tmx_path)
+        self.night_map_surface = self._render_tmx_fullscreen(tmx_path, variant="night")
+        self._night_mix = 0.0      # 0 = day map, 1 = night map
+        self._night_target = 0.0
+        self._night_fade_ms = NIGHT_CROSSFADE_MS
 
         # Convert legacy anchors → map coords
         self.DRIVE_IN_START_MAP   = self._screen_to_map_using_fit(DRIVE_IN_START)
@@ -194,22 +322,29 @@ class CountryHouseScene:
         self._siren_sound: Optional[pygame.mixer.Sound] = None
         self._siren_channel: Optional[pygame.mixer.Channel] = None
 
-        # Fades / overlay
+        # Fades / overlay (one opaque surface, tinted + set_alpha per frame)
+        self._overlay = pygame.Surface((self.win_w, self.win_h)).convert()
         self._fade_ms = 0
         self._fade_dir = 0
         self._fade_alpha = 0
-        self._dark_hold = False
 
         # Dialogue layout guard
         self.safe_bottom = self.win_h
 
     # ---------- TMX fullscreen ----------
-    def _render_tmx_fullscreen(self, tmx_path: Path) -> pygame.Surface:
+    def _render_tmx_fullscreen(self, tmx_path: Path, variant: str = "day") -> pygame.Surface:
         W, H = self.win_w, self.win_h
 
         if _PYTMX_OK and tmx_path.suffix.lower() == ".tmx" and tmx_path.exists():
-            tmx = _tmx_load_pygame(str(tmx_path))
-            raw = _render_tmx_raw(tmx)
+            key = _map_cache_key(tmx_path, (W, H), variant)
+            cached = _load_cached_map(key)
+            if cached is not None:
+                surf, meta = cached
+                self._apply_map_meta(meta)
+                return surf
+
+            tmx = self._load_tmx(tmx_path)
+            raw = _render_tmx_raw(tmx, _variant_gid_map(tmx, variant))
             rw, rh = raw.get_size()
             self._raw_map_size = (rw, rh)
 
@@ -222,22 +357,25 @@ class CountryHouseScene:
             fit_ox, fit_oy = ((W - fit_w) // 2, (H - fit_h) // 2)
 
             new = pygame.transform.smoothscale(raw, (new_w, new_h))
-            surf = pygame.Surface((W, H), pygame.SRCALPHA)
-            surf.fill((0, 0, 0, 255))
+            surf = pygame.Surface((W, H)).convert()
+            surf.fill((0, 0, 0))
             surf.blit(new, (ox, oy))
 
             self._map_scale   = scale_cover
             self._map_offset  = (ox, oy)
             self._fit_scale   = scale_fit
             self._fit_offset  = (fit_ox, fit_oy)
+            _store_cached_map(key, surf, self._map_meta())
             return surf
 
         # fallback
-        surf = pygame.Surface((W, H), pygame.SRCALPHA)
-        surf.fill((22, 24, 28, 255))
+        surf = pygame.Surface((W, H)).convert()
+        surf.fill((22, 24, 28))
         pygame.draw.rect(surf, (72, 88, 96), (520, 340, 280, 180))
         pygame.draw.rect(surf, (180, 190, 210), (635, 360, 50, 50))
         pygame.draw.rect(surf, (150, 120, 90), (675, 440, 60, 80))
+        if variant == "night":
+            surf.fill((60, 60, 110), special_flags=pygame.BLEND_MULT)
         self._map_scale = 1.0
         self._map_offset = (0, 0)
         self._raw_map_size = (W, H)
@@ -245,6 +383,29 @@ class CountryHouseScene:
         self._fit_offset = (0, 0)
         return surf
 
+    def _load_tmx(self, tmx_path: Path):
+        # both variants share one parse per scene build
+        tmx = getattr(self, "_tmx", None)
+        if tmx is None:
+            tmx = self._tmx = _tmx_load_pygame(str(tmx_path))
+        return tmx
+
+    def _map_meta(self) -> dict:
+        return {
+            "raw_map_size": list(self._raw_map_size),
+            "map_scale": self._map_scale,
+            "map_offset": list(self._map_offset),
+            "fit_scale": self._fit_scale,
+            "fit_offset": list(self._fit_offset),
+        }
+
+    def _apply_map_meta(self, meta: dict):
+        self._raw_map_size = tuple(meta["raw_map_size"])
+        self._map_scale    = float(meta["map_scale"])
+        self._map_offset   = tuple(meta["map_offset"])
+        self._fit_scale    = float(meta["fit_scale"])
+        self._fit_offset   = tuple(meta["fit_offset"])
+
     # ---------- Coord transforms ----------
     def _screen_to_map_using_fit(self, p):
         x, y = p
@@ -286,7 +447,7 @@ class CountryHouseScene:
             self.car_animator.update(self._car_facing_dir, True, 0)
 
         elif event_name in ("depart", "harold_arrives_chase"):
-            self._dark_hold = False
+            self._set_night(False, NIGHT_CROSSFADE_MS)
             self._stop_sirens()
 
             self._use_police_car = True
@@ -377,7 +538,6 @@ class CountryHouseScene:
         elif event_name == "night_cut_with_sirens":
             self._begin_fade_out(500)
             self._event_phase = "darken"
-            self._dark_hold = False
             self._timer_ms = 0
 
         elif event_name == "stop_sirens":
@@ -432,11 +592,22 @@ class CountryHouseScene:
                         self._fade_dir = 0
                         self._finish_event()
                 elif self._event_name == "night_cut_with_sirens" and self._event_phase == "darken":
-                    self._dark_hold = True
-                    self._fade_dir = 0
-                    self._fade_alpha = 255
+                    # Behind the black: swap to the night map, then reveal it while sirens wait
+                    self._set_night(True, 0)
+                    self._begin_fade_in(NIGHT_REVEAL_MS)
                     self._event_phase = "wait_sirens"
                     self._timer_ms = 2000
+                elif self._event_name == "night_cut_with_sirens" and self._fade_dir < 0:
+                    self._fade_dir = 0
+                    self._fade_alpha = 0
+
+        # Day/night crossfade
+        if self._night_mix != self._night_target:
+            step = dt_ms / max(1, self._night_fade_ms)
+            if self._night_mix < self._night_target:
+                self._night_mix = min(self._night_target, self._night_mix + step)
+            else:
+                self._night_mix = max(self._night_target, self._night_mix - step)
 
         # Timers
         if self._timer_ms > 0:
@@ -616,7 +787,15 @@ class CountryHouseScene:
 
     # ---------- Draw ----------
     def draw(self, screen: pygame.Surface):
-        screen.blit(self.map_surface, (0, 0))
+        if self._night_mix <= 0.0:
+            screen.blit(self.map_surface, (0, 0))
+        elif self._night_mix >= 1.0:
+            screen.blit(self.night_map_surface, (0, 0))
+        else:
+            screen.blit(self.map_surface, (0, 0))
+            self.night_map_surface.set_alpha(int(255 * self._night_mix))
+            screen.blit(self.night_map_surface, (0, 0))
+            self.night_map_surface.set_alpha(None)
 
         # car
         car_frame = (self.police_animator.current_frame() if self._use_police_car
@@ -633,22 +812,22 @@ class CountryHouseScene:
             tony_frame = self.tony_walker.current_frame()
             screen.blit(tony_frame, self.tony_rect.topleft)
 
-        # Fades and night hold
-        if self._fade_dir != 0 or self._dark_hold or (
+        # Fades (the night itself is the night map, not an overlay)
+        if self._fade_dir != 0 or (
             self._event_name in ("rest_living_room", "rest_cellar", "rest_car",
                                  "hide_in_cellar_safe", "force_cellar_stay",
                                  "tony_sleeps_car", "avoid_livingroom_sleep_car", "reject_cellar_sleep_car")
             and self._timer_ms > 0
         ):
-            overlay = pygame.Surface((self.win_w, self.win_h), pygame.SRCALPHA)
             tint = (0, 0, 0)
             if self._event_name in ("rest_cellar", "hide_in_cellar_safe", "force_cellar_stay"):
                 tint = (5, 5, 12)
             elif self._event_name == "rest_living_room":
                 tint = (12, 8, 4)
-            alpha = self._fade_alpha if self._fade_dir != 0 else (255 if self._dark_hold else 200)
-            overlay.fill((*tint, max(0, min(255, int(alpha)))))
-            screen.blit(overlay, (0, 0))
+            alpha = self._fade_alpha if self._fade_dir != 0 else 200
+            self._overlay.fill(tint)
+            self._overlay.set_alpha(max(0, min(255, int(alpha))))
+            screen.blit(self._overlay, (0, 0))
 
     # ---------- Helpers ----------
     def _set_move(self, rect: pygame.Rect, start_xy, end_xy, pixels_per_sec=200):
@@ -660,6 +839,12 @@ class CountryHouseScene:
         self._move_dur_ms = dur
         rect.center = start_xy
 
+    def _set_night(self, on: bool, fade_ms: int):
+        self._night_target = 1.0 if on else 0.0
+        self._night_fade_ms = max(0, int(fade_ms))
+        if self._night_fade_ms == 0:
+            self._night_mix = self._night_target
+
     def _begin_fade_out(self, ms: int):
         self._fade_dir = +1
         self._fade_ms = ms
@@ -5,7 +5,9 @@ import random
 import pygame
 from typing import Optional, Callable
 from core.config import GENERAL_ASSET_DIR
+from core.assets import load_image
 from core.actor_sprite import create_tony_animator
+from core.text_cache import render_text
 
 # ----------------- Room Config -----------------
 BUILDING_H = 120
@@ -33,7 +35,7 @@ FEATHER_STEPS = 6
 
 # ----------------- Utilities -----------------
 def _load_image(path: Path) -> pygame.Surface:
-    return pygame.image.load(str(path)).convert_alpha()
+    return load_image(path)     # shared: scaled copies below, never drawn onto
 
 def _scale_to_width(img: pygame.Surface, width: int) -> pygame.Surface:
     w, h = img.get_size()
@@ -215,17 +217,17 @@ class StreetRoomScene:
             screen.blit(frame, img_rect.topleft)
 
         # HUD
-        hud = self.hud_font.render(
-            f"Trust: {self.gvars.trust}   PoliceGap: {self.gvars.police_gap}",
+        hud = render_text(
+            self.hud_font, f"Trust: {self.gvars.trust}   PoliceGap: {self.gvars.police_gap}",
             True, (230, 230, 230)
         )
         screen.blit(hud, (12, 8))
 
         # Street labels for clarity
-        garage_label = self.hud_font.render("GARAGE", True, (100, 200, 100))
+        garage_label = render_text(self.hud_font, "GARAGE", True, (100, 200, 100))
         screen.blit(garage_label, (self.win_w - 140, self.win_h - 120))
         
-        police_label = self.hud_font.render("DANGER", True, (200, 100, 100))
+        police_label = render_text(self.hud_font, "DANGER", True, (200, 100, 100))
         screen.blit(police_label, (20, self.win_h - 180))
 
     def layout_for_dialogue(self, dialog_top: int):
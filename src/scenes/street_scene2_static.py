@@ -1,11 +1,16 @@
 from __future__ import annotations
 from pathlib import Path
-from typing import Optional, Callable
+from typing import Any, Optional, Callable
 import math
+import numpy as np
 import pygame
 
 from core.config import ASSETS_DIR, GENERAL_ASSET_DIR
-from core.actor_sprite import create_tony_animator
+from core.assets import load_image
+from core.sprite_atlas import load_sprite
+from core.actor_sprite import TONY_FRAME_FILES, create_tony_animator
+from core.preload import Preload
+from core.lighting import spill_profile
 
 
 def _scale_to_height(img: pygame.Surface, target_h: int) -> pygame.Surface:
@@ -40,6 +45,12 @@ class StreetScene2Static:
       Escape
         * drive_away                  : Tony hides 2s, car appears there, car drives down off-screen
     """
+    # Sources loaded by __init__ (for the campaign's scene preloader)
+    PRELOAD = Preload(images=(
+        "street/scene2.png", "general/stranger_walk_facing_back_1.png", "general/car_front.png",
+        *TONY_FRAME_FILES,
+    ))
+
     # Requested placements
     STRANGER_POS = (416, 289)  # midbottom anchor (feet planted)
     TONY_POS     = (605,  16)  # topleft anchor (explicit pixel)
@@ -63,21 +74,15 @@ class StreetScene2Static:
         self._police_intensity  = 0.9   # 0..1
         self._police_falloff_px = 24.0  # gaussian sigma along X
         self._police_noise_amp  = 0.22  # 0..1 small shimmer
-        self._light_cache: dict[tuple[int, int, int], list[list[float]]] = {}
+        self._light_cache: dict[tuple[int, int, int], dict[str, Any]] = {}
 
         # ---- Load and scale background ----
         img_path = ASSETS_DIR / "street" / "scene2.png"
         try:
-            raw = pygame.image.load(str(img_path)).convert_alpha()
+            self.bg = load_image(img_path, width=self.win_w, smooth=True)
         except Exception:
-            raw = pygame.Surface((1536, 102), pygame.SRCALPHA)
-            raw.fill((20, 20, 20, 255))
-
-        rw, rh = raw.get_size()
-        scale = (self.win_w / rw) if rw else 1.0
-        new_w = max(1, int(round(rw * scale)))
-        new_h = max(1, int(round(rh * scale)))
-        self.bg = pygame.transform.smoothscale(raw, (new_w, new_h))
+            self.bg = pygame.Surface((self.win_w, max(1, int(round(102 * self.win_w / 1536)))), pygame.SRCALPHA)
+            self.bg.fill((20, 20, 20, 255))
         self.bg_rect = self.bg.get_rect(center=(win_w // 2, win_h // 2))
 
         # ---- Tony sprite (idle on first DOWN frame) – now 2x size ----
@@ -90,22 +95,20 @@ class StreetScene2Static:
 
         # ---- Stranger (John) – back-facing, 2x ----
         try:
-            stranger_raw = pygame.image.load(
-                str(GENERAL_ASSET_DIR / "stranger_walk_facing_back_1.png")
-            ).convert_alpha()
+            self.stranger_img = load_sprite(GENERAL_ASSET_DIR / "stranger_walk_facing_back_1.png",
+                                            height=self.BIG_H, smooth=True)
         except Exception:
-            stranger_raw = self.walker.current_frame().copy()
-        self.stranger_img = _scale_to_height(stranger_raw, self.BIG_H)
+            self.stranger_img = _scale_to_height(self.walker.current_frame().copy(), self.BIG_H)
         self.stranger_rect = self.stranger_img.get_rect(midbottom=self.STRANGER_POS)
         self.stranger_visible = True
 
         # ---- Car (front) for escape ----
         try:
-            car_raw = pygame.image.load(str(GENERAL_ASSET_DIR / "car_front.png")).convert_alpha()
+            self.car_img = load_sprite(GENERAL_ASSET_DIR / "car_front.png", height=self.BIG_H, smooth=True)
         except Exception:
             car_raw = pygame.Surface((80, 56), pygame.SRCALPHA)
             pygame.draw.rect(car_raw, (120, 120, 120, 255), car_raw.get_rect(), border_radius=8)
-        self.car_img = _scale_to_height(car_raw, self.BIG_H)
+            self.car_img = _scale_to_height(car_raw, self.BIG_H)
         self.car_rect = self.car_img.get_rect()
         self.car_visible = False
 
@@ -429,38 +432,42 @@ class StreetScene2Static:
         amp = max(0.0, min(1.0, intensity)) * (0.75 + 0.25 * pulse)
 
         key = (spill_w, band_h, int(falloff_px * 1000))
-        base = self._light_cache.get(key)
-        if base is None:
-            gx = [math.exp(- (x / max(1e-3, float(falloff_px))) ** 2) for x in range(spill_w)]
-            cy = (band_h - 1) * 0.5
-            sigma_y = band_h * 0.6
-            gy = [math.exp(- (((y - cy) / max(1e-3, sigma_y)) ** 2)) for y in range(band_h)]
-            base = [[gx[x] * gy[y] for x in range(spill_w)] for y in range(band_h)]
-            self._light_cache[key] = base
-
-        surf = pygame.Surface((spill_w, band_h), pygame.SRCALPHA)
-
-        def _noise(xf: float, yf: float, tf: float) -> float:
-            v = math.sin((xf * 12.9898 + yf * 78.233 + tf * 3.113) * 43758.5453)
-            return v - math.floor(v)
-
+        cache = self._light_cache.get(key)
+        if cache is None:
+            xs = np.arange(spill_w)[:, None]
+            ys = np.arange(band_h)[None, :]
+            cache = {
+                "base":  spill_profile(spill_w, band_h, falloff_px),   # [x, y]
+                "xs":    xs,
+                "rows":  np.arange(band_h, dtype=np.float64),
+                "phase": xs * 12.9898 + ys * 78.233,                   # noise seed per pixel
+                "surf":  pygame.Surface((spill_w, band_h), pygame.SRCALPHA),
+            }
+            self._light_cache[key] = cache
+
+        base = cache["base"]
+        surf = cache["surf"]
+
+        # Per-row horizontal wobble, then sample the cached falloff shifted by it
         wobble_mag = 1
-        for y in range(band_h):
-            wobble = int(round(math.sin(0.8 * t + y * 0.05) * wobble_mag))
-            row = base[y]
-            for x in range(spill_w):
-                sx = x + wobble
-                if sx < 0 or sx >= spill_w:
-                    continue
-                b = row[sx]
-                if b <= 0.002:
-                    continue
-                n = _noise(x, y, t)
-                mod = 1.0 + noise_amp * (n - 0.5)
-                a = int(max(0, min(255, 255.0 * amp * b * mod)))
-                if a <= 0:
-                    continue
-                surf.set_at((x, y), (col[0], col[1], col[2], a))
+        wobble = np.rint(np.sin(0.8 * t + cache["rows"] * 0.05) * wobble_mag).astype(np.intp)
+        sx = cache["xs"] + wobble[None, :]
+        inside = (sx >= 0) & (sx < spill_w)
+        b = np.take_along_axis(base, np.clip(sx, 0, spill_w - 1), axis=0)
+        b = np.where(inside & (b > 0.002), b, 0.0)
+
+        # Cheap hash noise for the shimmer
+        v = np.sin((cache["phase"] + t * 3.113) * 43758.5453)
+        mod = 1.0 + noise_amp * ((v - np.floor(v)) - 0.5)
+        a = np.clip(255.0 * amp * b * mod, 0, 255).astype(np.uint8)
+
+        # BLEND_ADD ignores the source alpha: the full color is added wherever a > 0
+        rgb = pygame.surfarray.pixels3d(surf)
+        rgb[...] = np.where(a[:, :, None] > 0, np.asarray(col, dtype=np.uint8), 0)
+        del rgb
+        pa = pygame.surfarray.pixels_alpha(surf)
+        pa[...] = a
+        del pa  # unlock before blitting
 
         screen.blit(surf, (0, band_top), special_flags=pygame.BLEND_ADD)
 
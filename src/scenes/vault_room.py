@@ -1,11 +1,13 @@
 from __future__ import annotations
 from pathlib import Path
-import math
 import random
 import pygame
 from typing import Optional, Callable
 from core.config import GENERAL_ASSET_DIR
-from core.actor_sprite import create_tony_animator
+from core.assets import load_image
+from core.actor_sprite import TONY_FRAME_FILES, create_tony_animator
+from core.preload import Preload
+from core.lighting import ConeLight, make_light_patch
 
 # ----------------- Room Config -----------------
 WALL_H = 128
@@ -24,22 +26,13 @@ DARK_ALPHA = 200
 VISION_LENGTH = 240
 FOV_DEG = 65
 SOFT_EDGE = True
-FEATHER_STEPS = 8
 
 # ----------------- Utilities -----------------
-def _load_image(path: Path) -> pygame.Surface:
-    return pygame.image.load(str(path)).convert_alpha()
-
 def _scale_to_width(img: pygame.Surface, width: int) -> pygame.Surface:
     w, h = img.get_size()
     new_h = int(round(h * (width / w)))
     return pygame.transform.scale(img, (width, new_h))
 
-def _scale_to_height(img: pygame.Surface, height: int) -> pygame.Surface:
-    w, h = img.get_size()
-    new_w = int(round(w * (height / h)))
-    return pygame.transform.scale(img, (new_w, height))
-
 def _crop_center(img: pygame.Surface, crop_w: int, crop_h: int) -> pygame.Surface:
     w, h = img.get_size()
     x = max(0, (w - crop_w) // 2)
@@ -47,47 +40,20 @@ def _crop_center(img: pygame.Surface, crop_w: int, crop_h: int) -> pygame.Surfac
     rect = pygame.Rect(x, y, crop_w, crop_h)
     return img.subsurface(rect).copy()
 
-def _angle_to_vec(angle_deg: float):
-    rad = math.radians(angle_deg)
-    return math.cos(rad), math.sin(rad)
-
-def _cone_polygon(origin, angle_deg, fov_deg, length, arc_segments=18):
-    ox, oy = origin
-    half = fov_deg / 2.0
-    start = angle_deg - half
-    end = angle_deg + half
-    pts = [origin]
-    for i in range(arc_segments + 1):
-        t = i / arc_segments
-        a = start + t * (end - start)
-        dx, dy = _angle_to_vec(a)
-        pts.append((ox + dx * length, oy + dy * length))
-    return pts
-
-def _subtract_polygon_alpha(base_surf: pygame.Surface, poly_points, subtract_amount: int):
-    if subtract_amount <= 0: return
-    temp = pygame.Surface(base_surf.get_size(), pygame.SRCALPHA)
-    pygame.draw.polygon(temp, (255, 255, 255, subtract_amount), poly_points)
-    base_surf.blit(temp, (0, 0), special_flags=pygame.BLEND_RGBA_SUB)
-
-def _make_darkness_cone(size, alpha, origin, angle_deg, fov_deg, length,
-                        soft=True, feather_steps=8) -> pygame.Surface:
-    w, h = size
-    darkness = pygame.Surface((w, h), pygame.SRCALPHA)
-    darkness.fill((0, 0, 0, alpha))
-    inner_fov = fov_deg * 0.7
-    inner_len = length * 0.85
-    inner_poly = _cone_polygon(origin, angle_deg, inner_fov, inner_len)
-    _subtract_polygon_alpha(darkness, inner_poly, 255)
-    for i in range(feather_steps):
-        t = (i + 1) / feather_steps
-        fov_i = inner_fov + t * (fov_deg - inner_fov)
-        len_i = inner_len + t * (length - inner_len)
-        amt = int((1.0 - t) * 200)
-        if amt <= 0: continue
-        poly_i = _cone_polygon(origin, angle_deg, fov_i, len_i)
-        _subtract_polygon_alpha(darkness, poly_i, amt)
-    return darkness
+def _cone_light(angle_deg: float):
+    return lambda origin: ConeLight(origin, angle_deg, FOV_DEG, VISION_LENGTH, soft=SOFT_EDGE)
+
+_LIGHT_MASKS: Optional[dict] = None
+
+def _light_masks(*_win_size) -> dict:
+    """One cone mask per facing angle; they never change, so built once per process."""
+    global _LIGHT_MASKS
+    if _LIGHT_MASKS is None:
+        _LIGHT_MASKS = {
+            angle: make_light_patch(DARK_ALPHA, _cone_light(angle), VISION_LENGTH)
+            for angle in (0.0, 90.0, 180.0, -90.0)
+        }
+    return _LIGHT_MASKS
 
 # ----------------- Scene -----------------
 class VaultRoomScene:
@@ -103,6 +69,13 @@ class VaultRoomScene:
       - 'press_green_open'     : walk to green, press, open door, finish
       - 'go_near_medkit_pause' : walk toward medkit but stop well before it, finish
     """
+    # Sources loaded by __init__ (for the campaign's scene preloader)
+    PRELOAD = Preload(images=(
+        "bank/floor_tile_1.png", "bank/wall.png", "bank/door_closed.png", "bank/door_opened.png",
+        "bank/red_btn_pressed.png", "bank/green_btn_not_pressed.png", "bank/green_btn_pressed.png",
+        "bank/health_kit.png", *TONY_FRAME_FILES,
+    ), warm=_light_masks)
+
     def __init__(self, win_w: int, win_h: int, bank_asset_dir: Path, hud_font_path: Optional[Path], game_vars):
         self.win_w = win_w
         self.win_h = win_h
@@ -110,25 +83,17 @@ class VaultRoomScene:
         self.gvars = game_vars
 
         # ----- Load assets -----
-        floor_raw = _load_image(bank_asset_dir / "floor_tile_1.png")
-        wall_raw  = _load_image(bank_asset_dir / "wall.png")
-        self.door_closed_raw = _load_image(bank_asset_dir / "door_closed.png")
-        self.door_opened_raw = _load_image(bank_asset_dir / "door_opened.png")
-        self.red_btn_up_raw   = _load_image(bank_asset_dir / "red_btn_not_pressed.png")
-        self.red_btn_down_raw = _load_image(bank_asset_dir / "red_btn_pressed.png")
-        self.green_btn_up_raw    = _load_image(bank_asset_dir / "green_btn_not_pressed.png")
-        self.green_btn_down_raw  = _load_image(bank_asset_dir / "green_btn_pressed.png")
-        self.medkit_raw = _load_image(bank_asset_dir / "health_kit.png")
-
+        # Decoded / scaled once per process through the shared asset cache
+        floor_raw = load_image(bank_asset_dir / "floor_tile_1.png")
         self.floor_tile = _crop_center(floor_raw, FLOOR_TILE_TARGET, FLOOR_TILE_TARGET)
-        self.wall_img = pygame.transform.scale(wall_raw, (win_w, WALL_H))
+        self.wall_img = load_image(bank_asset_dir / "wall.png", size=(win_w, WALL_H))
 
         # Door
         max_door_h = max(1, WALL_H - DOOR_MARGIN * 2)
-        door_closed_img = _scale_to_height(self.door_closed_raw, max_door_h)
+        door_closed_img = load_image(bank_asset_dir / "door_closed.png", height=max_door_h)
         if door_closed_img.get_width() > win_w - DOOR_MARGIN * 2:
             door_closed_img = _scale_to_width(door_closed_img, win_w - DOOR_MARGIN * 2)
-        door_opened_img = _scale_to_height(self.door_opened_raw, max_door_h)
+        door_opened_img = load_image(bank_asset_dir / "door_opened.png", height=max_door_h)
         if door_opened_img.get_width() > win_w - DOOR_MARGIN * 2:
             door_opened_img = _scale_to_width(door_opened_img, win_w - DOOR_MARGIN * 2)
         self.door_closed_img = door_closed_img
@@ -138,10 +103,10 @@ class VaultRoomScene:
         self.door_rect.centery = WALL_H // 2
 
         # Buttons
-        self.red_btn_up   = _scale_to_height(self.red_btn_down_raw, BUTTON_TARGET_H)     # down/up scale same size
-        self.red_btn_down = _scale_to_height(self.red_btn_down_raw, BUTTON_TARGET_H)
-        self.green_btn_up   = _scale_to_height(self.green_btn_up_raw, BUTTON_TARGET_H)
-        self.green_btn_down = _scale_to_height(self.green_btn_down_raw, BUTTON_TARGET_H)
+        self.red_btn_up   = load_image(bank_asset_dir / "red_btn_pressed.png", height=BUTTON_TARGET_H)     # down/up scale same size
+        self.red_btn_down = load_image(bank_asset_dir / "red_btn_pressed.png", height=BUTTON_TARGET_H)
+        self.green_btn_up   = load_image(bank_asset_dir / "green_btn_not_pressed.png", height=BUTTON_TARGET_H)
+        self.green_btn_down = load_image(bank_asset_dir / "green_btn_pressed.png", height=BUTTON_TARGET_H)
         self.red_btn_img = self.red_btn_up
         self.green_btn_img = self.green_btn_up
         self.red_btn_rect = self.red_btn_img.get_rect()
@@ -153,7 +118,7 @@ class VaultRoomScene:
         self.green_collide = self.green_btn_rect.inflate(6, 6)
 
         # Medkit
-        self.medkit_img = _scale_to_height(self.medkit_raw, 28)
+        self.medkit_img = load_image(bank_asset_dir / "health_kit.png", height=28)
         self.medkit_rect = self.medkit_img.get_rect()
         self.medkit_visible = True
 
@@ -174,6 +139,13 @@ class VaultRoomScene:
 
         self.dark_enabled = DEFAULT_DARK_ENABLED
 
+        # Lighting: one cone mask per facing angle (shared, read-only), plus a
+        # persistent darkness layer we only patch around the player each frame
+        self._light_masks = _light_masks()
+        self._dark_layer = pygame.Surface((win_w, win_h), pygame.SRCALPHA)
+        self._dark_layer.fill((0, 0, 0, DARK_ALPHA))
+        self._dark_patch_rect: Optional[pygame.Rect] = None
+
         # Cinematic event state
         self._event_name: Optional[str] = None
         self._event_phase: Optional[str] = None
@@ -444,10 +416,14 @@ class VaultRoomScene:
 
         # Lighting (soft cone)
         if DEFAULT_DARK_ENABLED:
-            origin = self.player.center
-            cone_overlay = _make_darkness_cone(
-                (self.win_w, self.win_h), DARK_ALPHA, origin,
-                self.facing_angle, FOV_DEG, VISION_LENGTH,
-                SOFT_EDGE, FEATHER_STEPS
-            )
-            screen.blit(cone_overlay, (0, 0))
\ No newline at end of file
+            self._update_dark_layer()
+            screen.blit(self._dark_layer, (0, 0))
+
+    def _update_dark_layer(self):
+        """Restore the previous cone area to plain darkness, then stamp the current facing's mask."""
+        mask = self._light_masks[self.facing_angle]
+        rect = mask.get_rect(center=self.player.center)
+        if self._dark_patch_rect is not None:
+            self._dark_layer.fill((0, 0, 0, DARK_ALPHA), self._dark_patch_rect)
+        self._dark_layer.blit(mask, rect.topleft, special_flags=pygame.BLEND_RGBA_MIN)
+        self._dark_patch_rect = rect
\ No newline at end of file